@@ -0,0 +1,76 @@
+"""
+This script benchmarks salary file parsing engines on a synthetic dataset.
+
+It generates a temporary salary file with the given number of lines (a small share of them
+malformed), runs `total_salary` with each engine and prints the elapsed time and speedup.
+
+Usage:
+    python src/task_1/benchmark.py [lines_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from salary_calculator import total_salary
+
+DEFAULT_LINES_COUNT = 2_000_000
+MALFORMED_LINES = ("2700", "Kim Yuna,  ", "Tommy Nguyen,abc", "", "Max Patel,2900.43", "Rick Moralez,-2000")
+
+def generate_salary_file(path: Path, lines_count: int, malformed_ratio: float = 0.0001) -> None:
+    """
+    Writes a synthetic salary file with mostly valid lines.
+
+    Args:
+        path (Path): Path of the file to write.
+        lines_count (int): Number of lines to generate.
+        malformed_ratio (float): Share of malformed lines.
+    """
+    rnd = random.Random(42)
+    with open(path, "w", encoding="utf-8") as file:
+        for idx in range(lines_count):
+            if rnd.random() < malformed_ratio:
+                file.write(f"{rnd.choice(MALFORMED_LINES)}\n")
+            else:
+                file.write(f"Developer {idx},{rnd.randint(1000, 9000)}\n")
+
+def measure(label: str, func, *args, **kwargs):
+    """
+    Runs the function once, prints the elapsed time and returns it with the function result.
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label.ljust(30)} {elapsed:8.3f} s")
+    return elapsed, result
+
+def main():
+    """
+    Main entry point of the script.
+    """
+    lines_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES_COUNT
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file_path = Path(tmp_dir) / "salary_file.txt"
+        generate_salary_file(data_file_path, lines_count)
+        print(f"Dataset: {lines_count} lines, {data_file_path.stat().st_size / 2**20:.1f} MiB")
+
+        baseline_time, baseline = measure("lines (per-line loop)", total_salary, data_file_path, engine="lines")
+        chunked_time, chunked = measure("chunked (batch fast path)", total_salary, data_file_path)
+
+        assert chunked == baseline, "Engines returned different results"
+        print(f"Speedup: x{baseline_time / chunked_time:.1f}")
+
+        workers = os.cpu_count() or 1
+        if workers > 1:
+            parallel_time, parallel = measure(
+                f"chunked, {workers} workers", total_salary, data_file_path, workers=workers
+            )
+            assert parallel == baseline, "Parallel mode returned different results"
+            print(f"Speedup: x{baseline_time / parallel_time:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 """
-This script calculates the total and average salary from a given dataset file.
+This script calculates the total and average salary from a given dataset file (or many files).
 
 It initializes logging, reads a salary file, processes the data,
 logs any issues found in the content, and prints out the results.
@@ -11,9 +11,37 @@ John Doe,5500
 Jane Smith,4900
 
 If any line is invalid, the issue will be logged.
+
+Command-line arguments:
+    sources (str): Optional. Salary file paths, directories or glob patterns (relative to the current
+                   directory). Files with ".gz", ".bz2" or ".xz" suffix are decompressed on the fly.
+                   Defaults to "dataset/salary_file.txt" next to this script.
+    --workers N (option): Optional. Number of processes to parse large files (or many files) with (default: 1).
+    --checkpoint PATH (option): Optional. Checkpoint file for append-only salary files - only lines
+                                appended since the previous run are parsed (content errors of the
+                                processed lines are kept in the PATH.errors log).
+    --cache-dir DIR (option): Optional. Directory of the parsed salary cache - salaries of an unchanged
+                              file are aggregated from its cache entry without parsing (files are
+                              compared by size, modification time and their first and last blocks,
+                              use --rebuild-cache after an in-place edit that keeps them).
+    --rebuild-cache (flag): Optional. Parses the file and rebuilds its parsed salary cache entry (with --cache-dir).
+    --stats (flag): Optional. Also prints salary distribution statistics (min, max, mean,
+                    standard deviation and approximate median, p90 and p99).
+    --by-name (flag): Optional. Also prints salary totals per name.
+    --top N (option): Optional. Also prints N names with the highest salary totals.
+    --max-names-in-memory N (option): Optional. Number of distinct names kept in memory
+                                      before spilling per-name totals to disk.
+    --error-samples N (option): Optional. Number of example lines per cause of content issues
+                                to print in the content issues summary (default: 3).
+    Options --checkpoint, --by-name, --top and cache options are supported for a single uncompressed file only.
+    Options --workers, --checkpoint and cache options are not used together with --by-name or --top.
+    Parsed salary cache is not used together with --checkpoint. A cache entry is built by serial parsing,
+    with --workers a large file missing from the cache is parsed in parallel without building its entry.
 """
 
+import argparse
 from pathlib import Path
+from typing import Optional
 
 # import os
 # import sys
@@ -22,9 +50,126 @@ from pathlib import Path
 # sys.path.insert(1, modules_root_dir)
 # sys.path.append("../..") # optional simpler relative way
 
-from salary_calculator import total_salary
+from salary_calculator import analyze_salary
+from salary_sources import analyze_salary_sources, COMPRESSED_FILE_OPENERS
+from salary_grouping import group_salary_by_name, SalaryGroups, DEFAULT_MAX_NAMES_IN_MEMORY
+from utils.math_operations import calculate_average_from_total, StreamingStatistics
 from utils.logging_handler import init_logging, print_and_log
-from utils.error_handler import report_content_errors
+from utils.error_handler import ContentErrorSink
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments of the script.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Calculate the total and average salary from a dataset file.")
+    parser.add_argument(
+        "sources",
+        nargs="*",
+        help="salary file paths, directories or glob patterns (plain, .gz, .bz2 or .xz files)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes to parse large files with (default: 1, serial)"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="checkpoint file to parse only lines appended since the previous run"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="directory of the parsed salary cache to reuse parsed salaries of unchanged files from"
+    )
+    parser.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="rebuild the parsed salary cache entry of the file (with --cache-dir)"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print salary distribution statistics"
+    )
+    parser.add_argument(
+        "--by-name",
+        action="store_true",
+        help="print salary totals per name"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        metavar="N",
+        help="print N names with the highest salary totals"
+    )
+    parser.add_argument(
+        "--max-names-in-memory",
+        type=int,
+        metavar="N",
+        default=DEFAULT_MAX_NAMES_IN_MEMORY,
+        help=f"distinct names kept in memory before spilling to disk (default: {DEFAULT_MAX_NAMES_IN_MEMORY})"
+    )
+    parser.add_argument(
+        "--error-samples",
+        type=int,
+        metavar="N",
+        default=3,
+        help="example lines per cause in the content issues summary (default: 3)"
+    )
+    args = parser.parse_args()
+    if args.rebuild_cache and not args.cache_dir:
+        parser.error("--rebuild-cache requires --cache-dir")
+    return args
+
+def display_salary_statistics(salary_stats: StreamingStatistics):
+    """
+    Prints salary distribution statistics.
+
+    Args:
+        salary_stats (StreamingStatistics): Statistics collected over valid salaries.
+    """
+    if not salary_stats.count:
+        return
+
+    print(
+        f"Salaries count: {salary_stats.count}, "
+        f"Min: {salary_stats.minimum}, Max: {salary_stats.maximum}, "
+        f"Mean: {salary_stats.mean:.2f}, Standard deviation: {salary_stats.standard_deviation:.2f}"
+    )
+    print(
+        f"Median: ~{salary_stats.median:.0f}, "
+        f"90th percentile: ~{salary_stats.quantile(0.9):.0f}, "
+        f"99th percentile: ~{salary_stats.quantile(0.99):.0f}"
+    )
+
+def display_salary_groups(salary_groups: SalaryGroups, by_name: bool, top: Optional[int]):
+    """
+    Prints salary totals per name and/or the top earners.
+
+    Args:
+        salary_groups (SalaryGroups): Salary totals per name.
+        by_name (bool): Whether to print totals for all names.
+        top (int, optional): Number of top earners to print, if any.
+    """
+    if by_name:
+        print("Salary totals per name:")
+        for name, total, count in salary_groups.iter_totals():
+            print(f"  {name} : {total} ({count} line{'s' if count != 1 else ''})")
+
+    if top:
+        top_earners = salary_groups.top(top)
+        if not top_earners:
+            return
+        # Find length of the longest name for alignment
+        max_len = max(len(name) for name, _, _ in top_earners)
+        print(f"Top {len(top_earners)} earner{'s' if len(top_earners) != 1 else ''}:")
+        for name, total, count in top_earners:
+            print(f"  {name.ljust(max_len)} : {total} ({count} line{'s' if count != 1 else ''})")
 
 def main():
     """
@@ -33,6 +178,8 @@ def main():
     Initializes logging, reads salary data from a file, calculates the total and average salary,
     reports any content errors, and prints the results to the console.
     """
+    args = parse_args()
+
     data_file_rel_path = "dataset/salary_file.txt"
     log_file_rel_path = "task_1.log"
 
@@ -41,13 +188,50 @@ def main():
     # Initialize the environment (e.g., logging)
     init_logging(current_folder_path / log_file_rel_path)
 
+    group_by_name = args.by_name or args.top
+    salary_groups = None
+
+    # Content lines issues are logged as soon as they are found and summarized at the end
+    content_err = ContentErrorSink(log_file_rel_path, samples_per_cause=args.error_samples)
+
+    # Determine salary data source(s)
+    sources = args.sources or [str(current_folder_path / data_file_rel_path)]
+    is_single_file = (
+        len(sources) == 1
+        and Path(sources[0]).is_file()
+        and Path(sources[0]).suffix.lower() not in COMPRESSED_FILE_OPENERS
+    )
+
     try:
-        # Retrieve calculated total and average salary data with potential content lines issues
-        (total, average), content_err = total_salary(current_folder_path / data_file_rel_path)
+        if not is_single_file:
+            if group_by_name or args.checkpoint:
+                raise ValueError("Options --by-name, --top and --checkpoint support a single uncompressed file only.")
+            # Retrieve combined salary statistics of all files with potential content lines issues
+            salary_stats, _ = analyze_salary_sources(sources, workers=args.workers, line_errors=content_err)
+        elif group_by_name:
+            # Retrieve salary totals per name and salary statistics with potential content lines issues
+            salary_groups, salary_stats, _ = group_salary_by_name(
+                sources[0],
+                max_names_in_memory=args.max_names_in_memory,
+                line_errors=content_err
+            )
+        else:
+            # Retrieve salary statistics with potential content lines issues
+            salary_stats, _ = analyze_salary(
+                sources[0],
+                workers=args.workers,
+                checkpoint_path=args.checkpoint,
+                cache_dir=args.cache_dir,
+                rebuild_cache=args.rebuild_cache,
+                line_errors=content_err
+            )
+
+        # Calculate total and average salary
+        total = salary_stats.total
+        average = calculate_average_from_total(salary_stats.total, salary_stats.count)
 
-        # Report potential file content lines issues
-        if content_err:
-            report_content_errors(content_err, log_file_rel_path)
+        # Summarize potential file content lines issues
+        content_err.report_summary()
 
         # Display results
         if total == 0 or average == 0:
@@ -55,10 +239,19 @@ def main():
             print(f"Total salary: {total}, Average salary: {average}")
         else:
             print(f"Total salary: {total}, Average salary: {average}")
+
+        if args.stats:
+            display_salary_statistics(salary_stats)
+
+        if salary_groups is not None:
+            display_salary_groups(salary_groups, args.by_name, args.top)
     except (FileNotFoundError, PermissionError, IsADirectoryError, OSError, ValueError) as exc:
         print_and_log(str(exc), level="ERROR")
     except Exception as exc:
         print_and_log(f"An unexpected error occurred: {exc}", level="ERROR")
+    finally:
+        if salary_groups is not None:
+            salary_groups.close()
 
 if __name__ == "__main__":
     main()
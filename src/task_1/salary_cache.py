@@ -0,0 +1,307 @@
+"""
+Binary sidecar cache of parsed salary data.
+
+When a salary file is parsed, valid salaries are also written as a compact int64 column
+(`array('q')` layout) into a cache directory, with a JSON metadata file holding the content
+errors and the source file identity: resolved path, size, modification time and a content
+fingerprint of the first and the last blocks of the file. Later runs over an unchanged file
+memory-map the column and aggregate it without any text parsing. The fingerprint does not cover
+the middle of the file, so an in-place rewrite there that keeps the size and the modification
+time is not detected - rebuild the entry after such edits.
+
+Only the first MAX_CACHED_LINE_ERRORS content errors are kept in the metadata, with the number
+of errors per cause, so the metadata stays small for files with many invalid lines.
+
+The cache directory is bounded in size - least recently used entries are evicted.
+"""
+
+import hashlib
+import json
+from collections import Counter
+import mmap
+import os
+from array import array
+from pathlib import Path
+from typing import Iterable, Optional
+
+from utils.math_operations import StreamingStatistics
+
+CACHE_VERSION = 2
+MAX_CACHED_LINE_ERRORS = 1000  # content errors kept in a cache entry, others are only counted per cause
+DEFAULT_MAX_CACHE_SIZE = 512 * 1024 * 1024  # 512 MiB for all cache entries
+AGGREGATE_BATCH_SIZE = 1024 * 1024  # values converted from the memory-mapped column at once
+FINGERPRINT_BLOCK_SIZE = 64 * 1024  # bytes hashed at the start and at the end of the file
+
+def get_cache_entry_paths(cache_dir: Path, path: Path) -> tuple[Path, Path]:
+    """
+    Returns the metadata and column file paths of the cache entry for a salary file.
+
+    Args:
+        cache_dir (Path): Cache directory.
+        path (Path): Path to the salary data file.
+
+    Returns:
+        tuple[Path, Path]: (metadata_path, column_path).
+    """
+    key = hashlib.sha256(str(Path(path).resolve()).encode()).hexdigest()[:32]
+    return cache_dir / f"{key}.json", cache_dir / f"{key}.q"
+
+def get_sampled_fingerprint(file, size: int) -> str:
+    """
+    Calculates a fingerprint of a file from its first and last blocks only, so the cost does not
+    grow with the file size.
+
+    Args:
+        file: File object opened in binary mode.
+        size (int): File size in bytes.
+
+    Returns:
+        str: Hex digest of the fingerprint.
+    """
+    digest = hashlib.sha256(str(size).encode())
+
+    file.seek(0)
+    digest.update(file.read(min(size, FINGERPRINT_BLOCK_SIZE)))
+
+    tail_start = max(size - FINGERPRINT_BLOCK_SIZE, FINGERPRINT_BLOCK_SIZE)
+    if tail_start < size:
+        file.seek(tail_start)
+        digest.update(file.read(size - tail_start))
+
+    return digest.hexdigest()
+
+def get_file_identity(path: Path, file, file_stat: os.stat_result) -> dict:
+    """
+    Returns the identity of a salary file the cache entry is valid for.
+
+    Args:
+        path (Path): Path to the salary data file.
+        file: The same file opened in binary mode.
+        file_stat (os.stat_result): Status of the file.
+
+    Returns:
+        dict: Resolved path, size, modification time and content fingerprint (see `get_sampled_fingerprint`).
+    """
+    return {
+        "path": str(Path(path).resolve()),
+        "size": file_stat.st_size,
+        "mtime_ns": file_stat.st_mtime_ns,
+        "fingerprint": get_sampled_fingerprint(file, file_stat.st_size),
+    }
+
+def load_salary_cache(
+        cache_dir: Path,
+        path: Path,
+        file,
+        file_stat: os.stat_result
+    ) -> Optional[tuple[StreamingStatistics, list[tuple[int, str, str]], dict[str, int]]]:
+    """
+    Aggregates salaries from a valid cache entry of the salary file.
+
+    Args:
+        cache_dir (Path): Cache directory.
+        path (Path): Path to the salary data file.
+        file: The same file opened in binary mode.
+        file_stat (os.stat_result): Status of the file.
+
+    Returns:
+        Optional[tuple]: (salary_stats, line_errors, uncached_error_counts), or None if there is
+                         no valid cache entry. `line_errors` holds the kept content errors,
+                         `uncached_error_counts` the number of the other ones per cause.
+    """
+    metadata_path, column_path = get_cache_entry_paths(Path(cache_dir), path)
+    try:
+        with open(metadata_path, encoding="utf-8") as metadata_file:
+            metadata = json.load(metadata_file)
+    except (OSError, ValueError):
+        return None
+
+    if metadata.get("version") != CACHE_VERSION or metadata.get("source") != get_file_identity(path, file, file_stat):
+        return None
+
+    salary_stats = StreamingStatistics()
+    try:
+        with open(column_path, "rb") as column_file:
+            if os.fstat(column_file.fileno()).st_size != metadata["count"] * array("q").itemsize:
+                return None
+            if metadata["count"]:
+                with mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ) as column_map:
+                    with memoryview(column_map) as column_bytes, column_bytes.cast("q") as column:
+                        for start in range(0, len(column), AGGREGATE_BATCH_SIZE):
+                            salary_stats.add_batch(column[start:start + AGGREGATE_BATCH_SIZE].tolist())
+    except OSError:
+        return None
+
+    # Mark entry as recently used (not possible on read-only media, where nothing is evicted either)
+    try:
+        os.utime(metadata_path)
+    except OSError:
+        pass
+
+    line_errors = [tuple(line_error) for line_error in metadata["line_errors"]]
+    uncached_error_counts = Counter(metadata["error_counts"])
+    uncached_error_counts.subtract(cause for _, _, cause in line_errors)
+    return salary_stats, line_errors, {cause: count for cause, count in uncached_error_counts.items() if count > 0}
+
+class CachedLineErrors:
+    """
+    Content errors container for building a cache entry: passes every error on to another container
+    and keeps only what the cache entry needs - the first MAX_CACHED_LINE_ERRORS errors and
+    the number of errors per cause.
+
+    Supports `append`/`extend`, so it can be used as the "line_errors" container of the salary parser.
+
+    Args:
+        forward (list): Container to add every error to (a list or another object with `append`/`extend`,
+                        e.g. `utils.error_handler.ContentErrorSink`).
+    """
+
+    def __init__(self, forward: list):
+        self.forward = forward
+        self.line_errors: list[tuple[int, str, str]] = []
+        self.error_counts = Counter()
+
+    def append(self, error: tuple[int, str, str]) -> None:
+        """Counts and passes on a content error (line_number, original_line, explanation)."""
+        self.forward.append(error)
+        self.error_counts[error[2]] += 1
+        if len(self.line_errors) < MAX_CACHED_LINE_ERRORS:
+            self.line_errors.append(error)
+
+    def extend(self, errors: Iterable[tuple[int, str, str]]) -> None:
+        """Counts and passes on many content errors."""
+        for error in errors:
+            self.append(error)
+
+class SalaryCacheWriter:
+    """
+    Salary accumulator that collects statistics and writes every salary to a new cache entry column.
+
+    Has the same `add`/`add_batch` interface as `StreamingStatistics`, so it can be used
+    as the "stats" accumulator of the salary parser.
+    """
+
+    def __init__(self, cache_dir: Path, path: Path):
+        self.cache_dir = Path(cache_dir)
+        self.path = Path(path)
+        self.stats = StreamingStatistics()
+        # Error of writing the column, raised by `commit` (parsing goes on without the cache)
+        self.write_error: Optional[OSError] = None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        _, column_path = get_cache_entry_paths(self.cache_dir, self.path)
+        self._tmp_column_path = column_path.with_name(f"{column_path.name}.tmp")
+        self._column_file = open(self._tmp_column_path, "wb")
+        self._count = 0
+
+    def add(self, value: int) -> None:
+        """Adds a single salary."""
+        self.add_batch([value])
+
+    def add_batch(self, values: list[int]) -> None:
+        """Adds many salaries at once."""
+        self.stats.add_batch(values)
+        if self._column_file is None:
+            return
+        try:
+            array("q", values).tofile(self._column_file)
+            self._count += len(values)
+        except OverflowError:
+            # Salary doesn't fit into int64 - the file won't be cached
+            self.discard()
+        except OSError as exc:
+            self.write_error = exc
+            self.discard()
+
+    def commit(
+            self,
+            file,
+            file_stat: os.stat_result,
+            line_errors: list[tuple[int, str, str]],
+            error_counts: dict[str, int],
+            max_cache_size: int = DEFAULT_MAX_CACHE_SIZE
+        ) -> None:
+        """
+        Finishes the cache entry and evicts old entries if the cache grew over its size limit.
+
+        Args:
+            file: Salary file opened in binary mode.
+            file_stat (os.stat_result): Status of the salary file when parsing started.
+            line_errors (list): The first content errors found in the file (only the first
+                                MAX_CACHED_LINE_ERRORS are kept), see `CachedLineErrors`.
+            error_counts (dict[str, int]): Number of all content errors found in the file per cause.
+            max_cache_size (int): Size limit of the cache directory in bytes.
+
+        Raises:
+            OSError: If the cache entry can't be written.
+        """
+        if self.write_error is not None:
+            raise self.write_error
+        if self._column_file is None:
+            return
+        self._column_file.close()
+        self._column_file = None
+
+        metadata_path, column_path = get_cache_entry_paths(self.cache_dir, self.path)
+        metadata = {
+            "version": CACHE_VERSION,
+            "source": get_file_identity(self.path, file, file_stat),
+            "count": self._count,
+            "error_counts": dict(error_counts),
+            "line_errors": line_errors[:MAX_CACHED_LINE_ERRORS],
+        }
+        tmp_metadata_path = metadata_path.with_name(f"{metadata_path.name}.tmp")
+        try:
+            with open(tmp_metadata_path, "w", encoding="utf-8") as metadata_file:
+                json.dump(metadata, metadata_file)
+            os.replace(self._tmp_column_path, column_path)
+            os.replace(tmp_metadata_path, metadata_path)
+        except OSError:
+            tmp_metadata_path.unlink(missing_ok=True)
+            raise
+
+        evict_salary_cache(self.cache_dir, max_cache_size, keep=metadata_path)
+
+    def discard(self) -> None:
+        """Drops the unfinished cache entry (errors of dropping it are ignored, it is never used)."""
+        if self._column_file is not None:
+            column_file, self._column_file = self._column_file, None
+            try:
+                column_file.close()
+            except OSError:
+                pass
+        try:
+            self._tmp_column_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+def evict_salary_cache(cache_dir: Path, max_cache_size: int, keep: Optional[Path] = None) -> None:
+    """
+    Removes least recently used cache entries until the cache directory fits the size limit.
+
+    Args:
+        cache_dir (Path): Cache directory.
+        max_cache_size (int): Size limit of the cache directory in bytes.
+        keep (Path, optional): Metadata path of an entry that must not be evicted.
+    """
+    entries = []
+    for metadata_path in Path(cache_dir).glob("*.json"):
+        column_path = metadata_path.with_suffix(".q")
+        try:
+            metadata_stat = metadata_path.stat()
+            entry_size = metadata_stat.st_size + (column_path.stat().st_size if column_path.exists() else 0)
+        except OSError:
+            continue
+        entries.append((metadata_stat.st_mtime_ns, entry_size, metadata_path, column_path))
+
+    cache_size = sum(entry_size for _, entry_size, _, _ in entries)
+    for _, entry_size, metadata_path, column_path in sorted(entries):
+        if cache_size <= max_cache_size:
+            break
+        if metadata_path == keep:
+            continue
+        try:
+            metadata_path.unlink(missing_ok=True)
+            column_path.unlink(missing_ok=True)
+        except OSError:
+            continue
+        cache_size -= entry_size
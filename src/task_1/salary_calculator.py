@@ -4,6 +4,10 @@ Reads salary data from a file and calculates the total and average salary.
 Each line of the file is expected to contain a name and a numeric salary, separated by a comma.
 Lines that are empty, malformed, or contain invalid salary values are logged and ignored in calculations.
 
+The file is read in large binary chunks. Chunks where every line is a plain "name,digits" record
+are parsed as a batch (fast path); chunks containing anything else are re-parsed line by line
+(slow path), so malformed lines get exactly the same diagnostics as before.
+
 Args:
     path (str): Path to the salary data file.
 
@@ -13,8 +17,41 @@ Returns:
         - The second element is a list of content error tuples: (line_number, line_text, cause).
 """
 
-from utils.file_handler import retrieve_line_data
-from utils.math_operations import calculate_total, calculate_average
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from salary_cache import CachedLineErrors, load_salary_cache, SalaryCacheWriter
+from salary_checkpoint import (
+    build_checkpoint,
+    ErrorsLogWriter,
+    get_errors_log_path,
+    iter_logged_line_errors,
+    load_checkpoint,
+    open_errors_log,
+    restore_checkpoint,
+    save_checkpoint,
+)
+from utils.file_handler import find_shard_bounds, retrieve_line_data
+from utils.logging_handler import print_and_log
+from utils.math_operations import calculate_average_from_total, StreamingStatistics
+
+CHUNK_SIZE = 8 * 1024 * 1024  # 8 MiB per read
+BATCH_SIZE = 16 * 1024  # 16 KiB per batch check
+PARALLEL_MIN_FILE_SIZE = 16 * 1024 * 1024  # smaller files are parsed serially
+
+# Salary at the end of a line - a batch is clean if every line ends like that and has a single comma
+SALARY_LINE_END_PATTERN = re.compile(rb",([0-9]+)\r?\n")
+# A "clean" line: anything without a comma as a name, a comma and a positive integer salary
+CLEAN_SALARY_LINE_PATTERN = re.compile(rb"^[^,\n]*,0*([1-9][0-9]*)\r?$", re.MULTILINE)
+# The same "clean" line and a batch of them, keeping the name as well (for grouping by name)
+CLEAN_NAME_SALARY_LINE_PATTERN = re.compile(rb"^([^,\n]*),0*([1-9][0-9]*)\r?$", re.MULTILINE)
+NAME_SALARY_LINE_PATTERN = re.compile(rb"^([^,\n]*),([0-9]+)\r?$", re.MULTILINE)
+# Any other line - needs to be parsed by the slow path to get diagnostics
+OTHER_SALARY_LINE_PATTERN = re.compile(rb"^(?![^,\n]*,0*[1-9][0-9]*\r?$).*$", re.MULTILINE)
 
 def explain_salary_line_error(line: str, salary_str: str) -> str:
     """
@@ -36,57 +73,546 @@ def explain_salary_line_error(line: str, salary_str: str) -> str:
         return "Salary should be a numeric integer"
     return "Invalid format"
 
-def total_salary(path: str) -> tuple[tuple[int, int], list[tuple[int, str, str]]]:
+def parse_salary_line(line_idx: int, line: str, result: dict) -> None:
     """
-    Reads salary data from a file, validates and parses it, then calculates total and average salary.
+    Parses a single salary line (slow path) and stores the outcome in the result accumulator.
 
-    Each valid line in the file should contain a developer's name and a numeric salary,
-    separated by a comma (e.g., "John Doe,3000").
+    Args:
+        line_idx (int): Line number (1-based) of the line in the file.
+        line (str): The line text without the trailing newline.
+        result (dict): Accumulator with "stats" (StreamingStatistics) and "line_errors" list,
+                       and optionally "groups" (salary totals per name, see `salary_grouping.SalaryGroups`).
+    """
+    salary_str = ""
+    try:
+        # Retrieve salary data from the line
+        line_data = retrieve_line_data(line)
+        salary_str = line_data[-1]
+        name, salary_str = line_data
+        salary = int(salary_str)
 
-    Invalid lines (e.g., missing salary, incorrect format) are ignored in the calculation and
-    returned as part of the content error log.
+        # Add salary to the salary statistics
+        result["stats"].add(salary)
+        if "groups" in result:
+            result["groups"].add(name.strip(), salary)
+
+        # Log valid edge cases (item still will be added to the salary statistics as valid)
+        if salary <= 0:
+            reason = "zero" if salary == 0 else "negative"
+            cause = f"Please check if {reason} salary is a valid salary value"
+            result["line_errors"].append((line_idx, line, f"(Valid) {cause}"))
+    except ValueError:
+        # Judge and log invalid edge cases (item won't be added to the salary statistics as invalid)
+        cause = explain_salary_line_error(line, salary_str)
+        result["line_errors"].append((line_idx, line, f"(Invalid) {cause}"))
+
+def split_text_lines(chunk: bytes) -> list[str]:
+    """
+    Decodes a chunk and splits it into lines the same way a text-mode file would (universal newlines).
+
+    Args:
+        chunk (bytes): Raw file data consisting of whole lines.
+
+    Returns:
+        list[str]: Lines without line terminators.
+    """
+    text = chunk.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    if text.endswith("\n"):
+        text = text[:-1]
+    return text.split("\n")
+
+def parse_salary_batch(batch: bytes, first_line_idx: int, result: dict) -> int:
+    """
+    Parses a batch of whole lines (each terminated by a newline) without line-level Python code
+    when possible.
+
+    If every line of the batch is a clean "name,salary" record, all salaries are converted at once.
+    Otherwise, clean lines are still matched and converted at once, and all the other lines
+    are located in the batch and passed to `parse_salary_line` one by one (slow path).
+
+    Args:
+        batch (bytes): Raw file data consisting of whole lines.
+        first_line_idx (int): Line number (1-based) of the first line in the batch.
+        result (dict): Accumulator, see `parse_salary_line`.
+
+    Returns:
+        int: Number of lines found in the batch.
+    """
+    lines_count = batch.count(b"\n")
+    # Search without the last line end, so no phantom empty line is found after it
+    end_pos = len(batch) - 1
+    groups = result.get("groups")
+
+    if groups is None:
+        # Fast path - every line ends with a salary and has a single comma
+        salary_strs = SALARY_LINE_END_PATTERN.findall(batch)
+        if len(salary_strs) == lines_count and batch.count(b",") == lines_count:
+            salaries = list(map(int, salary_strs))
+            if 0 not in salaries:
+                result["stats"].add_batch(salaries)
+                return lines_count
+
+        # Mixed path - convert all clean salaries at once
+        result["stats"].add_batch(list(map(int, CLEAN_SALARY_LINE_PATTERN.findall(batch, 0, end_pos))))
+    else:
+        # Fast path - every line is a name and a salary
+        records = NAME_SALARY_LINE_PATTERN.findall(batch, 0, end_pos)
+        if len(records) == lines_count:
+            names, salary_strs = zip(*records)
+            salaries = list(map(int, salary_strs))
+            if 0 not in salaries:
+                result["stats"].add_batch(salaries)
+                groups.add_batch([name.decode("utf-8").strip() for name in names], salaries)
+                return lines_count
+
+        # Mixed path - convert all clean records at once
+        records = CLEAN_NAME_SALARY_LINE_PATTERN.findall(batch, 0, end_pos)
+        if records:
+            names, salary_strs = zip(*records)
+            salaries = list(map(int, salary_strs))
+            result["stats"].add_batch(salaries)
+            groups.add_batch([name.decode("utf-8").strip() for name in names], salaries)
+
+    # Slow path - parse remaining lines one by one to get precise diagnostics
+    line_idx, last_pos = first_line_idx, 0
+    for match in OTHER_SALARY_LINE_PATTERN.finditer(batch, 0, end_pos):
+        line_idx += batch.count(b"\n", last_pos, match.start())
+        last_pos = match.start()
+        line = match.group()
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        parse_salary_line(line_idx, line.decode("utf-8"), result)
+
+    return lines_count
+
+def parse_salary_chunk(chunk: bytes, first_line_idx: int, result: dict) -> int:
+    """
+    Parses a chunk of whole lines by splitting it into smaller batches, so malformed lines
+    only slow down the batch they belong to.
+
+    Args:
+        chunk (bytes): Raw file data consisting of whole lines.
+        first_line_idx (int): Line number (1-based) of the first line in the chunk.
+        result (dict): Accumulator, see `parse_salary_line`.
+
+    Returns:
+        int: Number of lines found in the chunk.
+    """
+    if not chunk.endswith(b"\n"):
+        chunk += b"\n"
+
+    if not chunk.isascii():
+        # Validate encoding the same way as reading in text mode would do
+        chunk.decode("utf-8")
+
+    if chunk.count(b"\r") != chunk.count(b"\r\n"):
+        # Standalone carriage returns split lines in text mode - parse whole chunk line by line
+        lines = split_text_lines(chunk)
+        for line_idx, line in enumerate(lines, start=first_line_idx):
+            parse_salary_line(line_idx, line, result)
+        return len(lines)
+
+    line_idx, start = first_line_idx, 0
+    while start < len(chunk):
+        end = chunk.rfind(b"\n", start, start + BATCH_SIZE) + 1
+        if end <= start:
+            # Line is longer than a batch - take it whole
+            end = chunk.index(b"\n", start) + 1
+        line_idx += parse_salary_batch(chunk[start:end], line_idx, result)
+        start = end
+
+    return line_idx - first_line_idx
+
+def iter_line_chunks(file, chunk_size: int = CHUNK_SIZE, end: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Reads a binary file in large blocks and yields chunks that always end on a line boundary.
+
+    Args:
+        file: File object opened in binary mode and positioned at the start of a line.
+        chunk_size (int): Number of bytes to read at once.
+        end (int, optional): Byte offset to stop reading at (end of file by default).
+
+    Yields:
+        bytes: Chunk of whole lines (the last chunk may lack the trailing newline).
+    """
+    remainder = b""
+    while True:
+        if end is None:
+            block = file.read(chunk_size)
+        else:
+            block = file.read(max(min(chunk_size, end - file.tell()), 0))
+        if not block:
+            break
+        block = remainder + block
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            # No line end in the block yet - keep reading
+            remainder = block
+            continue
+        remainder = block[cut:]
+        yield block[:cut]
+    if remainder:
+        yield remainder
+
+def find_last_line_end(file, start: int, end: int, block_size: int = 64 * 1024) -> int:
+    """
+    Finds the end of the last complete (newline terminated) line in a byte range of a file.
+
+    Args:
+        file: File object opened in binary mode.
+        start (int): Byte offset of the range start.
+        end (int): Byte offset of the range end.
+        block_size (int): Number of bytes to read at once, going backwards from the range end.
+
+    Returns:
+        int: Byte offset right after the last newline, or `start` if there is no newline in the range.
+    """
+    block_end = end
+    while block_end > start:
+        block_start = max(block_end - block_size, start)
+        file.seek(block_start)
+        newline_pos = file.read(block_end - block_start).rfind(b"\n")
+        if newline_pos != -1:
+            return block_start + newline_pos + 1
+        block_end = block_start
+    return start
+
+def parse_salary_range(
+        file,
+        start: int,
+        end: int,
+        line_errors: Optional[list] = None
+    ) -> tuple[StreamingStatistics, int, list[tuple[int, str, str]]]:
+    """
+    Parses a line-aligned byte range of a salary file.
+
+    Args:
+        file: File object opened in binary mode.
+        start (int): Byte offset of the range start (start of a line).
+        end (int): Byte offset of the range end (after a line end or end of file).
+        line_errors (list, optional): Container to add content errors to (a list or another object
+                       with `append`/`extend`, e.g. `utils.error_handler.ContentErrorSink`). New list by default.
+
+    Returns:
+        tuple: Partial result (salary_stats, lines_count, line_errors),
+               where line numbers in line_errors are counted from the range start (1-based).
+    """
+    result = {
+        "stats": StreamingStatistics(),
+        "line_errors": [] if line_errors is None else line_errors
+    }
+
+    file.seek(start)
+    next_line_idx = 1
+    for chunk in iter_line_chunks(file, end=end):
+        next_line_idx += parse_salary_chunk(chunk, next_line_idx, result)
+
+    return result["stats"], next_line_idx - 1, result["line_errors"]
+
+def parse_salary_shard(path: Path, start: int, end: int) -> tuple[StreamingStatistics, int, Optional[str]]:
+    """
+    Worker function for parallel mode - opens the file and parses a single shard of it.
+
+    Content errors are not sent back to the parent process, but written to a temporary
+    errors log (see `salary_checkpoint.ErrorsLogWriter`), which the caller reads and removes.
+
+    Args:
+        path (Path): Path to the salary data file.
+        start (int): Byte offset of the shard start.
+        end (int): Byte offset of the shard end.
+
+    Returns:
+        tuple: (salary_stats, lines_count, errors_log_path), where line numbers in the errors log
+               are counted from the shard start (1-based). The path is None if there are no errors.
+    """
+    with open(path, "rb") as file, tempfile.NamedTemporaryFile(
+            prefix="salary_errors_", suffix=".errors", delete=False
+    ) as errors_log:
+        try:
+            errors_log_writer = ErrorsLogWriter(errors_log)
+            salary_stats, lines_count, _ = parse_salary_range(file, start, end, errors_log_writer)
+        except BaseException:
+            errors_log.close()
+            os.unlink(errors_log.name)
+            raise
+
+    if not errors_log_writer.count:
+        os.unlink(errors_log.name)
+        return salary_stats, lines_count, None
+    return salary_stats, lines_count, errors_log.name
+
+def read_shard_errors(
+        shard_result: tuple[StreamingStatistics, int, Optional[str]]
+    ) -> tuple[StreamingStatistics, int, Iterator[tuple[int, str, str]]]:
+    """
+    Converts the result of `parse_salary_shard` to a partial result that reads content errors
+    lazily from the errors log of the shard.
+    """
+    salary_stats, lines_count, errors_log_path = shard_result
+    if errors_log_path is None:
+        return salary_stats, lines_count, iter(())
+    return salary_stats, lines_count, iter_logged_line_errors(errors_log_path, os.path.getsize(errors_log_path))
+
+def merge_salary_partials(
+        partials: Iterable[tuple[StreamingStatistics, int, list[tuple[int, str, str]]]],
+        line_errors: Optional[list] = None
+    ) -> tuple[StreamingStatistics, int, list[tuple[int, str, str]]]:
+    """
+    Merges partial results of consecutive ranges (in file order) and converts
+    range-local line numbers to line numbers counted from the first range start.
+
+    Args:
+        partials: Partial results, see `parse_salary_range`.
+        line_errors (list, optional): Container to add content errors to (a list or another object
+                       with `append`/`extend`, e.g. `utils.error_handler.ContentErrorSink`). New list by default.
+
+    Returns:
+        tuple: Merged partial result (salary_stats, lines_count, line_errors).
+    """
+    salary_stats = StreamingStatistics()
+    line_errors = [] if line_errors is None else line_errors
+    lines_offset = 0
+    for range_stats, range_lines_count, range_errors in partials:
+        salary_stats.merge(range_stats)
+        line_errors.extend((line_idx + lines_offset, line, cause) for line_idx, line, cause in range_errors)
+        lines_offset += range_lines_count
+
+    return salary_stats, lines_offset, line_errors
+
+def parse_salary_file_range(
+        path: Path,
+        file,
+        start: int,
+        end: int,
+        workers: int = 1,
+        line_errors: Optional[list] = None
+    ) -> tuple[StreamingStatistics, int, list[tuple[int, str, str]]]:
+    """
+    Parses a line-aligned byte range of a salary file, in parallel shards if it is large enough.
+
+    Args:
+        path (Path): Path to the salary data file (opened again by the worker processes).
+        file: The same file opened in binary mode (used for serial parsing).
+        start (int): Byte offset of the range start (start of a line).
+        end (int): Byte offset of the range end (after a line end or end of file).
+        workers (int): Number of processes to parse the range with.
+        line_errors (list, optional): Container to add content errors to (a list or another object
+                       with `append`/`extend`, e.g. `utils.error_handler.ContentErrorSink`). New list by default.
+
+    Returns:
+        tuple: Partial result, see `parse_salary_range`.
+    """
+    if workers <= 1 or end - start < PARALLEL_MIN_FILE_SIZE:
+        return parse_salary_range(file, start, end, line_errors)
+
+    # Parse shards in parallel, each worker reads its own byte range
+    shard_bounds = find_shard_bounds(file, start, end, workers)
+    futures = []
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shard_bounds))) as executor:
+            futures = [
+                executor.submit(parse_salary_shard, path, shard_start, shard_end)
+                for shard_start, shard_end in shard_bounds
+            ]
+            # Errors of the shards are streamed from their logs in shard order
+            return merge_salary_partials((read_shard_errors(future.result()) for future in futures), line_errors)
+    finally:
+        # All shards are finished here (the executor waits for them)
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                errors_log_path = future.result()[2]
+                if errors_log_path is not None:
+                    Path(errors_log_path).unlink(missing_ok=True)
+
+def analyze_salary_with_cache(
+        path: Path,
+        file,
+        file_stat: os.stat_result,
+        cache_dir: Path,
+        rebuild_cache: bool = False,
+        workers: int = 1,
+        line_errors: Optional[list] = None
+    ) -> tuple[StreamingStatistics, list[tuple[int, str, str]]]:
+    """
+    Aggregates salaries from the cache entry of the file, or parses the file and builds the entry.
+
+    The entry is built by serial parsing. A file that is large enough to be parsed in parallel
+    with `workers` > 1 is parsed in parallel instead, without building the entry. If the cache
+    can't be written, a warning is printed and the file is parsed without it.
+
+    Args:
+        path (Path): Path to the salary data file.
+        file: The same file opened in binary mode.
+        file_stat (os.stat_result): Status of the file.
+        cache_dir (Path): Cache directory.
+        rebuild_cache (bool): Ignore an existing cache entry and build a new one.
+        workers (int): Number of processes to parse the file with if it is not in the cache.
+        line_errors (list, optional): Container to add content errors to (a list or another object
+                       with `append`/`extend`, e.g. `utils.error_handler.ContentErrorSink`). New list by default.
+
+    Returns:
+        tuple: (salary_stats, line_errors).
+    """
+    line_errors = [] if line_errors is None else line_errors
+
+    if not rebuild_cache:
+        cached = load_salary_cache(cache_dir, path, file, file_stat)
+        # Errors left out of the cache entry can only be counted by a container supporting that
+        # (e.g. `utils.error_handler.ContentErrorSink`), for others the file is parsed again
+        if cached and (not cached[2] or hasattr(line_errors, "add_cause_counts")):
+            salary_stats, cached_line_errors, uncached_error_counts = cached
+            line_errors.extend(cached_line_errors)
+            if uncached_error_counts:
+                line_errors.add_cause_counts(uncached_error_counts)
+            return salary_stats, line_errors
+
+    if workers > 1 and file_stat.st_size >= PARALLEL_MIN_FILE_SIZE:
+        salary_stats, _, line_errors = parse_salary_file_range(path, file, 0, file_stat.st_size, workers, line_errors)
+        return salary_stats, line_errors
+
+    try:
+        cache_writer = SalaryCacheWriter(cache_dir, path)
+    except OSError as exc:
+        print_and_log(f'Parsed salary cache is not used for "{path}": {exc}', level="WARNING")
+        salary_stats, _, line_errors = parse_salary_file_range(path, file, 0, file_stat.st_size, workers, line_errors)
+        return salary_stats, line_errors
+
+    # Content errors are passed on as they are found, the cache entry keeps only the first ones and counts
+    cached_line_errors = CachedLineErrors(line_errors)
+    result = {
+        "stats": cache_writer,
+        "line_errors": cached_line_errors
+    }
+    try:
+        file.seek(0)
+        next_line_idx = 1
+        for chunk in iter_line_chunks(file, end=file_stat.st_size):
+            next_line_idx += parse_salary_chunk(chunk, next_line_idx, result)
+    except BaseException:
+        cache_writer.discard()
+        raise
+
+    try:
+        cache_writer.commit(file, file_stat, cached_line_errors.line_errors, cached_line_errors.error_counts)
+    except OSError as exc:
+        cache_writer.discard()
+        print_and_log(f'Parsed salary cache entry of "{path}" is not saved: {exc}', level="WARNING")
+    return cache_writer.stats, line_errors
+
+def analyze_salary(
+        path: str,
+        engine: str = "chunked",
+        workers: int = 1,
+        checkpoint_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        rebuild_cache: bool = False,
+        line_errors: Optional[list] = None
+    ) -> tuple[StreamingStatistics, list[tuple[int, str, str]]]:
+    """
+    Reads salary data from a file, validates and parses it, and collects salary statistics in one pass.
+
+    Salaries are not kept in memory - only the streaming statistics (count, total, min, max,
+    mean, variance and approximate quantiles) are accumulated.
 
     Args:
         path (str): Path to the salary data file.
+        engine (str): "chunked" (default) to read the file in binary chunks with a batch fast path,
+                      or "lines" to parse the file line by line.
+        workers (int): Number of processes to parse the file with ("chunked" engine only).
+                       Files smaller than PARALLEL_MIN_FILE_SIZE are always parsed serially.
+        checkpoint_path (str, optional): Path to a checkpoint file ("chunked" engine only).
+                       If the checkpoint matches the salary file, only lines appended after it are parsed.
+                       The checkpoint is updated after parsing.
+        cache_dir (str, optional): Directory of the parsed salary cache ("chunked" engine, no checkpoint).
+                       If the cache has an entry for the unchanged file, salaries are aggregated from it
+                       without parsing; otherwise the file is parsed and the entry is (re)built,
+                       see `analyze_salary_with_cache`.
+        rebuild_cache (bool): Ignore an existing cache entry and build a new one.
+        line_errors (list, optional): Container to add content errors to (a list or another object
+                       with `append`/`extend`, e.g. `utils.error_handler.ContentErrorSink`). New list by default.
 
     Returns:
         tuple:
-            - A tuple of two integers: (total_salary, average_salary).
+            - StreamingStatistics of valid salaries.
             - A list of content error tuples: each tuple contains:
                 (line_number, original_line, explanation).
     """
-    result = {
-        "salaries": [],
-        "line_errors": []
-    }
+    path = Path(path)
 
     try:
-        # Load file with salary data
-        with open(path, encoding="utf-8") as file:
+        if engine == "lines":
+            result = {
+                "stats": StreamingStatistics(),
+                "line_errors": [] if line_errors is None else line_errors
+            }
+
+            # Load file with salary data and parse it line by line
+            with open(path, encoding="utf-8") as file:
+                # Check if file is empty
+                if path.stat().st_size == 0:
+                    raise ValueError(f'The file "{path}" is empty.')
+
+                for line_idx, line in enumerate(file, start=1):
+                    parse_salary_line(line_idx, line.rstrip("\n"), result)
+
+            return result["stats"], result["line_errors"]
+
+        # Load file with salary data and parse it in large chunks
+        with open(path, "rb") as file:
             # Check if file is empty
-            if path.stat().st_size == 0:
+            file_stat = os.fstat(file.fileno())
+            file_size = file_stat.st_size
+            if file_size == 0:
                 raise ValueError(f'The file "{path}" is empty.')
 
-            for line_idx, line in enumerate(file, start=1):
-                line = line.rstrip("\n")
-                try:
-                    # Retrieve salary data from each line
-                    _, salary_str = retrieve_line_data(line)
-                    salary = int(salary_str)
-
-                    # Add salary to the list of salaries
-                    result["salaries"].append(salary)
-
-                    # Log valid edge cases (item still will be added to the salary list as valid)
-                    if salary <= 0:
-                        reason = "zero" if salary == 0 else "negative"
-                        cause = f"Please check if {reason} salary is a valid salary value"
-                        result["line_errors"].append((line_idx, line, f"(Valid) {cause}"))
-                except ValueError:
-                    # Judge and log invalid edge cases (item won't be added to the salary list as invalid)
-                    cause = explain_salary_line_error(line, salary_str)
-                    result["line_errors"].append((line_idx, line, f"(Invalid) {cause}"))
-    
+            if checkpoint_path is None and cache_dir is not None:
+                return analyze_salary_with_cache(
+                    path, file, file_stat, Path(cache_dir), rebuild_cache, workers, line_errors
+                )
+
+            if checkpoint_path is None:
+                salary_stats, _, line_errors = parse_salary_file_range(path, file, 0, file_size, workers, line_errors)
+                return salary_stats, line_errors
+
+            # Tail mode - reuse the result for the already processed part of the file
+            checkpoint = load_checkpoint(checkpoint_path)
+            errors_log_path = get_errors_log_path(checkpoint_path)
+            restored = restore_checkpoint(checkpoint, file, file_stat, errors_log_path) if checkpoint else None
+            if restored:
+                start, (processed_stats, processed_lines_count, processed_errors) = restored
+                errors_log_size, errors_count = checkpoint["errors_log_size"], checkpoint["errors_count"]
+            else:
+                start, processed_stats, processed_lines_count, processed_errors = 0, StreamingStatistics(), 0, []
+                errors_log_size = errors_count = 0
+
+            # Errors of the processed lines are read from the errors log before it is appended to
+            line_errors = [] if line_errors is None else line_errors
+            line_errors.extend(processed_errors)
+
+            # Only complete lines are checkpointed, a last line without newline may still be appended to
+            committed_end = find_last_line_end(file, start, file_size)
+            # Errors of the appended lines are numbered from the file start and streamed to the log and the caller
+            with open_errors_log(checkpoint_path, errors_log_size) as errors_log:
+                errors_log_writer = ErrorsLogWriter(errors_log, processed_lines_count, line_errors)
+                appended_stats, appended_lines_count, _ = parse_salary_file_range(
+                    path, file, start, committed_end, workers, errors_log_writer
+                )
+                errors_log_size = errors_log.tell()
+            committed = merge_salary_partials([
+                (processed_stats, processed_lines_count, []),
+                (appended_stats, appended_lines_count, [])
+            ])
+            save_checkpoint(
+                checkpoint_path,
+                build_checkpoint(file, file_stat, committed_end, committed),
+                errors_log_size,
+                errors_count + errors_log_writer.count
+            )
+
+            unterminated = parse_salary_range(file, committed_end, file_size)
+            salary_stats, _, line_errors = merge_salary_partials([committed, unterminated], line_errors)
+            return salary_stats, line_errors
+
     except FileNotFoundError as exc:
         raise FileNotFoundError(f'The file "{path}" does not exist.') from exc
     except PermissionError as exc:
@@ -95,9 +621,41 @@ def total_salary(path: str) -> tuple[tuple[int, int], list[tuple[int, str, str]]
         raise IsADirectoryError(f'Expected a file, but found a "{path}" directory.') from exc
     except OSError as exc:
         raise OSError(f"OS error occurred: {exc}") from exc
-    
-    # Calculate total and average salaries
-    total_salary_value = calculate_total(result["salaries"])
-    average_salary_value = calculate_average(result["salaries"])
 
-    return (total_salary_value, average_salary_value), result["line_errors"]
+def total_salary(
+        path: str,
+        engine: str = "chunked",
+        workers: int = 1,
+        checkpoint_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        line_errors: Optional[list] = None
+    ) -> tuple[tuple[int, int], list[tuple[int, str, str]]]:
+    """
+    Reads salary data from a file, validates and parses it, then calculates total and average salary.
+
+    Each valid line in the file should contain a developer's name and a numeric salary,
+    separated by a comma (e.g., "John Doe,3000").
+
+    Invalid lines (e.g., missing salary, incorrect format) are ignored in the calculation and
+    returned as part of the content error log.
+
+    Args:
+        path (str): Path to the salary data file.
+        engine (str): Parsing engine, see `analyze_salary`.
+        workers (int): Number of processes to parse the file with, see `analyze_salary`.
+        checkpoint_path (str, optional): Path to a checkpoint file for tail mode, see `analyze_salary`.
+        cache_dir (str, optional): Directory of the parsed salary cache, see `analyze_salary`.
+        line_errors (list, optional): Container to add content errors to, see `analyze_salary`.
+
+    Returns:
+        tuple:
+            - A tuple of two integers: (total_salary, average_salary).
+            - A list of content error tuples: each tuple contains:
+                (line_number, original_line, explanation).
+    """
+    salary_stats, line_errors = analyze_salary(path, engine, workers, checkpoint_path, cache_dir, line_errors=line_errors)
+
+    # Calculate average salary
+    average_salary_value = calculate_average_from_total(salary_stats.total, salary_stats.count)
+
+    return (salary_stats.total, average_salary_value), line_errors
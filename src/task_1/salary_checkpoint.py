@@ -0,0 +1,261 @@
+"""
+Checkpoints for incremental (tail-mode) salary aggregation of append-only files.
+
+A checkpoint stores the byte offset up to which the salary file has been processed (always the end
+of a complete line), the salary statistics collected up to that offset, and the file identity:
+device/inode, size, modification time and a fingerprint of the processed prefix.
+
+Content errors of the processed prefix are not kept in the checkpoint itself, but in an append-only
+errors log next to it (one JSON array per line), and the checkpoint holds only their count and
+the committed size of the log. Errors of the newly processed lines are appended to the log while
+they are parsed (see `ErrorsLogWriter`), so neither the checkpoint nor memory use grows with
+the number of errors in the file.
+
+On the next run only the appended tail has to be parsed. If the file was truncated, replaced or
+rewritten in place, the checkpoint is considered stale and the whole file is parsed again.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from utils.math_operations import StreamingStatistics
+
+CHECKPOINT_VERSION = 2
+FINGERPRINT_READ_SIZE = 1024 * 1024  # bytes of the processed prefix read and hashed at once
+
+def get_prefix_fingerprint(file, offset: int) -> str:
+    """
+    Calculates a fingerprint of the first `offset` bytes of a file.
+
+    The whole prefix is hashed, so an in-place rewrite anywhere in it is detected. Reading it
+    sequentially is still much cheaper than parsing it again.
+
+    Args:
+        file: File object opened in binary mode.
+        offset (int): Length of the prefix in bytes.
+
+    Returns:
+        str: Hex digest of the prefix fingerprint.
+    """
+    digest = hashlib.sha256(str(offset).encode())
+
+    file.seek(0)
+    remaining = offset
+    while remaining > 0:
+        block = file.read(min(remaining, FINGERPRINT_READ_SIZE))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+
+    return digest.hexdigest()
+
+def get_errors_log_path(path: Path) -> Path:
+    """
+    Returns the path of the content errors log kept next to a checkpoint file.
+    """
+    path = Path(path)
+    return path.with_name(f"{path.name}.errors")
+
+def iter_logged_line_errors(errors_log_path: Path, size: int) -> Iterator[tuple[int, str, str]]:
+    """
+    Reads content errors from the committed part of a checkpoint errors log, one at a time.
+
+    Args:
+        errors_log_path (Path): Path to the errors log.
+        size (int): Committed size of the log in bytes (anything after it is ignored).
+
+    Yields:
+        tuple: Content error (line_number, original_line, explanation).
+    """
+    if not size:
+        return
+    with open(errors_log_path, "rb") as file:
+        remaining = size
+        for log_line in file:
+            if remaining <= 0:
+                break
+            remaining -= len(log_line)
+            yield tuple(json.loads(log_line))
+
+class ErrorsLogWriter:
+    """
+    Writes content errors to an errors log file (one JSON array per line) as they are found.
+
+    Can be used instead of a list of content errors (supports `append`/`extend`), so errors
+    are not kept in memory.
+
+    Args:
+        file: Errors log file opened in binary mode for writing.
+        lines_offset (int): Number added to line numbers of the errors before they are written.
+        forward (list, optional): Container to also add the renumbered errors to (a list or another
+                       object with `append`/`extend`, e.g. `utils.error_handler.ContentErrorSink`).
+    """
+
+    def __init__(self, file, lines_offset: int = 0, forward: Optional[list] = None):
+        self.file = file
+        self.lines_offset = lines_offset
+        self.forward = forward
+        self.count = 0
+
+    def append(self, error: tuple[int, str, str]) -> None:
+        """Writes a content error (line_number, original_line, explanation)."""
+        line_idx, line, cause = error
+        error = (line_idx + self.lines_offset, line, cause)
+        self.file.write((json.dumps(error, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.count += 1
+        if self.forward is not None:
+            self.forward.append(error)
+
+    def extend(self, errors: Iterable[tuple[int, str, str]]) -> None:
+        """Writes many content errors."""
+        for error in errors:
+            self.append(error)
+
+def build_checkpoint(
+        file,
+        file_stat: os.stat_result,
+        offset: int,
+        partial: tuple[StreamingStatistics, int, list[tuple[int, str, str]]]
+    ) -> dict:
+    """
+    Builds a checkpoint for the processed prefix of a salary file.
+
+    Args:
+        file: Salary file object opened in binary mode.
+        file_stat (os.stat_result): Status of the salary file.
+        offset (int): Byte offset the file has been processed up to.
+        partial (tuple): Result for the processed prefix: (salary_stats, lines_count, line_errors),
+                         content errors are not part of the checkpoint (see `save_checkpoint`).
+
+    Returns:
+        dict: JSON-serializable checkpoint.
+    """
+    salary_stats, lines_count, _ = partial
+    return {
+        "version": CHECKPOINT_VERSION,
+        "device": file_stat.st_dev,
+        "inode": file_stat.st_ino,
+        "file_size": file_stat.st_size,
+        "mtime_ns": file_stat.st_mtime_ns,
+        "offset": offset,
+        "fingerprint": get_prefix_fingerprint(file, offset),
+        "lines_count": lines_count,
+        "stats": salary_stats.to_dict(),
+    }
+
+def restore_checkpoint(
+        checkpoint: dict,
+        file,
+        file_stat: os.stat_result,
+        errors_log_path: Path
+    ) -> Optional[tuple[int, tuple[StreamingStatistics, int, Iterator[tuple[int, str, str]]]]]:
+    """
+    Validates a checkpoint against the current state of the salary file and restores its result.
+
+    Args:
+        checkpoint (dict): Checkpoint saved by `save_checkpoint`.
+        file: Salary file object opened in binary mode.
+        file_stat (os.stat_result): Current status of the salary file.
+        errors_log_path (Path): Path to the errors log of the checkpoint.
+
+    Returns:
+        Optional[tuple]: (offset, (salary_stats, lines_count, line_errors)) if the file was only
+                         appended to since the checkpoint, or None if it has to be parsed again.
+                         Content errors are read lazily from the errors log.
+    """
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        return None
+
+    # Another file under the same path
+    if (checkpoint["device"], checkpoint["inode"]) != (file_stat.st_dev, file_stat.st_ino):
+        return None
+
+    # File was truncated
+    if file_stat.st_size < checkpoint["file_size"]:
+        return None
+
+    # File was modified without growing
+    if file_stat.st_size == checkpoint["file_size"] and file_stat.st_mtime_ns != checkpoint["mtime_ns"]:
+        return None
+
+    # Processed part of the file was rewritten
+    if get_prefix_fingerprint(file, checkpoint["offset"]) != checkpoint["fingerprint"]:
+        return None
+
+    # Errors log is missing or was cut
+    try:
+        if Path(errors_log_path).stat().st_size < checkpoint["errors_log_size"]:
+            return None
+    except OSError:
+        if checkpoint["errors_log_size"]:
+            return None
+
+    line_errors = iter_logged_line_errors(errors_log_path, checkpoint["errors_log_size"])
+    salary_stats = StreamingStatistics.from_dict(checkpoint["stats"])
+
+    return checkpoint["offset"], (salary_stats, checkpoint["lines_count"], line_errors)
+
+def load_checkpoint(path: Path) -> Optional[dict]:
+    """
+    Loads a checkpoint file.
+
+    Args:
+        path (Path): Path to the checkpoint file.
+
+    Returns:
+        Optional[dict]: The checkpoint, or None if it does not exist or can't be read.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def open_errors_log(path: Path, errors_log_size: int = 0):
+    """
+    Opens the errors log of a checkpoint to append content errors of newly processed lines to.
+
+    The log is cut to its committed size first, so errors appended by a run that didn't save
+    its checkpoint are dropped.
+
+    Args:
+        path (Path): Path to the checkpoint file.
+        errors_log_size (int): Committed size of the errors log of the previous checkpoint (0 to start a new log).
+
+    Returns:
+        File object of the log opened in binary append mode (its `tell()` is the new log size).
+    """
+    errors_log = open(get_errors_log_path(path), "ab")
+    try:
+        errors_log.truncate(errors_log_size)
+        errors_log.seek(errors_log_size)
+    except BaseException:
+        errors_log.close()
+        raise
+    return errors_log
+
+def save_checkpoint(path: Path, checkpoint: dict, errors_log_size: int = 0, errors_count: int = 0) -> None:
+    """
+    Saves a checkpoint file atomically (a reader never sees a partially written checkpoint).
+
+    Args:
+        path (Path): Path to the checkpoint file.
+        checkpoint (dict): Checkpoint created by `build_checkpoint`.
+        errors_log_size (int): Size of the errors log including errors of the newly processed lines
+                               (see `open_errors_log`).
+        errors_count (int): Number of content errors in the log up to that size.
+    """
+    path = Path(path)
+    checkpoint = {
+        **checkpoint,
+        "errors_log_size": errors_log_size,
+        "errors_count": errors_count,
+    }
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+    os.replace(tmp_path, path)
@@ -0,0 +1,211 @@
+"""
+Aggregates salaries per employee name and finds the top earners.
+
+People appear on many lines of a salary file (one line per pay period), so salaries are summed
+per name in a hash map. When the number of distinct names exceeds the memory budget, partial
+aggregates are sorted by name and spilled to a temporary file. The final per-name totals are
+produced by merging the spilled runs with the in-memory part, and the top earners are selected
+from that stream with a bounded heap.
+"""
+
+import heapq
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+from salary_calculator import iter_line_chunks, parse_salary_chunk
+from utils.math_operations import StreamingStatistics
+
+DEFAULT_MAX_NAMES_IN_MEMORY = 1_000_000
+MAX_SPILLED_RUNS = 64  # runs are merged into one when there are more of them (open files limit)
+
+class SalaryGroups:
+    """
+    Salary totals and lines count per name, with spilling to disk above a memory budget.
+
+    Spilled runs are text files with one "name,total,count" record per line, sorted by name
+    (names can't contain commas or line breaks, as they come from the salary file lines).
+    Use as a context manager or call `close()` to remove spilled runs.
+
+    Example:
+        >>> with SalaryGroups() as groups:
+        ...     groups.add_batch(["Alex Korp", "Sitarama Raju", "Alex Korp"], [3000, 1000, 2000])
+        ...     groups.top(1)
+        [('Alex Korp', 5000, 2)]
+    """
+
+    def __init__(self, max_names_in_memory: int = DEFAULT_MAX_NAMES_IN_MEMORY, spill_dir: Optional[str] = None):
+        self.max_names_in_memory = max_names_in_memory
+        self.spill_dir = spill_dir
+        self._totals: dict[str, int] = {}
+        self._counts: dict[str, int] = {}
+        self._spilled_runs: list[Path] = []
+
+    def __enter__(self) -> "SalaryGroups":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def add(self, name: str, salary: int) -> None:
+        """
+        Adds a salary to the total of the given name.
+
+        Args:
+            name (str): Employee name.
+            salary (int): Salary value.
+        """
+        self._totals[name] = self._totals.get(name, 0) + salary
+        self._counts[name] = self._counts.get(name, 0) + 1
+        if len(self._totals) > self.max_names_in_memory:
+            self._spill()
+
+    def add_batch(self, names: list[str], salaries: list[int]) -> None:
+        """
+        Adds many salaries at once.
+
+        Args:
+            names (list[str]): Employee names.
+            salaries (list[int]): Salary values, in the same order as names.
+        """
+        totals, counts = self._totals, self._counts
+        for name, salary in zip(names, salaries):
+            totals[name] = totals.get(name, 0) + salary
+            counts[name] = counts.get(name, 0) + 1
+        if len(totals) > self.max_names_in_memory:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Writes in-memory aggregates to a sorted run on disk and clears them."""
+        self._spilled_runs.append(self._write_run(self._iter_in_memory()))
+        self._totals.clear()
+        self._counts.clear()
+
+        if len(self._spilled_runs) >= MAX_SPILLED_RUNS:
+            # Merge all runs into a single one
+            runs = self._spilled_runs
+            merged_run = self._write_run(self._combine([self._read_run(path) for path in runs]))
+            for path in runs:
+                path.unlink(missing_ok=True)
+            self._spilled_runs = [merged_run]
+
+    def _write_run(self, records: Iterator[tuple[str, int, int]]) -> Path:
+        """Writes (name, total, count) records sorted by name to a new run file."""
+        file_descriptor, run_path = tempfile.mkstemp(prefix="salary_groups_", suffix=".run", dir=self.spill_dir)
+        with open(file_descriptor, "w", encoding="utf-8") as file:
+            for name, total, count in records:
+                file.write(f"{name},{total},{count}\n")
+        return Path(run_path)
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator[tuple[str, int, int]]:
+        """Reads a spilled run back as (name, total, count) records."""
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                name, total, count = line.rstrip("\n").rsplit(",", 2)
+                yield name, int(total), int(count)
+
+    def _iter_in_memory(self) -> Iterator[tuple[str, int, int]]:
+        """Iterates over in-memory aggregates as (name, total, count) records sorted by name."""
+        return ((name, self._totals[name], self._counts[name]) for name in sorted(self._totals))
+
+    @staticmethod
+    def _combine(sorted_sources: list[Iterator[tuple[str, int, int]]]) -> Iterator[tuple[str, int, int]]:
+        """Merges record sources sorted by name, summing up records of the same name."""
+        current_name, current_total, current_count = None, 0, 0
+        for name, total, count in heapq.merge(*sorted_sources, key=lambda record: record[0]):
+            if name == current_name:
+                current_total += total
+                current_count += count
+                continue
+            if current_name is not None:
+                yield current_name, current_total, current_count
+            current_name, current_total, current_count = name, total, count
+        if current_name is not None:
+            yield current_name, current_total, current_count
+
+    def iter_totals(self) -> Iterator[tuple[str, int, int]]:
+        """
+        Iterates over the final aggregates, sorted by name.
+
+        Yields:
+            tuple[str, int, int]: (name, salary_total, lines_count).
+        """
+        runs = [self._read_run(path) for path in self._spilled_runs]
+        return self._combine([self._iter_in_memory(), *runs])
+
+    def top(self, k: int) -> list[tuple[str, int, int]]:
+        """
+        Finds the names with the highest salary totals, keeping at most k of them in a heap.
+
+        Args:
+            k (int): Number of top earners to find.
+
+        Returns:
+            list[tuple[str, int, int]]: (name, salary_total, lines_count), highest total first.
+        """
+        return heapq.nlargest(k, self.iter_totals(), key=lambda record: record[1])
+
+    def close(self) -> None:
+        """Removes spilled runs from disk."""
+        for path in self._spilled_runs:
+            path.unlink(missing_ok=True)
+        self._spilled_runs.clear()
+
+def group_salary_by_name(
+        path: str,
+        max_names_in_memory: int = DEFAULT_MAX_NAMES_IN_MEMORY,
+        line_errors: Optional[list] = None
+    ) -> tuple[SalaryGroups, StreamingStatistics, list[tuple[int, str, str]]]:
+    """
+    Reads salary data from a file and aggregates salaries per name in one pass.
+
+    Lines are validated the same way as by `total_salary`, so salary statistics and content errors
+    are collected at the same time.
+
+    Args:
+        path (str): Path to the salary data file.
+        max_names_in_memory (int): Number of distinct names kept in memory before spilling to disk.
+        line_errors (list, optional): Container to add content errors to (a list or another object
+                       with `append`/`extend`, e.g. `utils.error_handler.ContentErrorSink`). New list by default.
+
+    Returns:
+        tuple:
+            - SalaryGroups with salary totals per name (close it to remove spilled data).
+            - StreamingStatistics of valid salaries.
+            - A list of content error tuples: each tuple contains:
+                (line_number, original_line, explanation).
+    """
+    path = Path(path)
+    result = {
+        "stats": StreamingStatistics(),
+        "groups": SalaryGroups(max_names_in_memory),
+        "line_errors": [] if line_errors is None else line_errors
+    }
+
+    try:
+        # Load file with salary data and parse it in large chunks
+        with open(path, "rb") as file:
+            # Check if file is empty
+            if os.fstat(file.fileno()).st_size == 0:
+                raise ValueError(f'The file "{path}" is empty.')
+
+            try:
+                next_line_idx = 1
+                for chunk in iter_line_chunks(file):
+                    next_line_idx += parse_salary_chunk(chunk, next_line_idx, result)
+            except BaseException:
+                result["groups"].close()
+                raise
+
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f'The file "{path}" does not exist.') from exc
+    except PermissionError as exc:
+        raise PermissionError(f'You do not have permission to access "{path}" file.') from exc
+    except IsADirectoryError as exc:
+        raise IsADirectoryError(f'Expected a file, but found a "{path}" directory.') from exc
+    except OSError as exc:
+        raise OSError(f"OS error occurred: {exc}") from exc
+
+    return result["groups"], result["stats"], result["line_errors"]
@@ -0,0 +1,186 @@
+"""
+Reads salary data from many files at once, plain or compressed.
+
+Sources can be given as file paths, directories (all files in them, recursively) or glob patterns.
+Files with ".gz", ".bz2" or ".xz" suffix are decompressed on the fly while reading.
+
+Files are parsed in a process pool, one file per task. Inside a task, a reader thread reads and
+decompresses the next chunks while the current one is parsed (decompression releases the GIL),
+so reading overlaps with parsing. Partial results are merged into a single result, and every
+content error carries the file it was found in.
+"""
+
+import bz2
+import glob
+import gzip
+import lzma
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from salary_calculator import iter_line_chunks, parse_salary_chunk
+from utils.math_operations import StreamingStatistics
+
+COMPRESSED_FILE_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+PREFETCH_CHUNKS = 2  # chunks read ahead of the parser
+
+def resolve_salary_sources(patterns: Iterable[str]) -> list[Path]:
+    """
+    Expands file paths, directories and glob patterns into a sorted list of salary files.
+
+    Args:
+        patterns (Iterable[str]): File paths, directory paths or glob patterns.
+
+    Raises:
+        FileNotFoundError: If a pattern does not match any file.
+
+    Returns:
+        list[Path]: Salary files, without duplicates, in the order of patterns (sorted within a pattern).
+    """
+    sources = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(entry for entry in path.rglob("*") if entry.is_file())
+        elif path.is_file():
+            matches = [path]
+        else:
+            matches = sorted(Path(match) for match in glob.glob(pattern, recursive=True) if Path(match).is_file())
+
+        if not matches:
+            raise FileNotFoundError(f'No files found for "{pattern}".')
+        sources.extend(match for match in matches if match not in sources)
+
+    return sources
+
+def open_salary_source(path: Path):
+    """
+    Opens a salary file for binary reading, decompressing it on the fly if needed.
+
+    Args:
+        path (Path): Path to the salary file.
+
+    Returns:
+        Binary file object.
+    """
+    opener = COMPRESSED_FILE_OPENERS.get(path.suffix.lower(), open)
+    return opener(path, "rb")
+
+def iter_prefetched(iterator: Iterator[bytes], depth: int = PREFETCH_CHUNKS) -> Iterator[bytes]:
+    """
+    Runs an iterator in a background thread, keeping up to `depth` items ready ahead of the consumer.
+
+    Args:
+        iterator (Iterator[bytes]): Iterator to run in the background (e.g., file chunks reader).
+        depth (int): Number of items to read ahead.
+
+    Yields:
+        bytes: Items of the iterator, in order. Exceptions of the iterator are raised in the consumer.
+    """
+    items = queue.Queue(maxsize=depth)
+    finished = object()
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Wait for free space, unless the consumer has stopped
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+            put(finished)
+        except Exception as exc:  # passed to the consumer
+            put(exc)
+
+    reader = threading.Thread(target=produce, daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = items.get()
+            if item is finished:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        reader.join()
+
+def parse_salary_source(path: Path) -> tuple[StreamingStatistics, int, list[tuple[int, str, str]]]:
+    """
+    Parses a single (possibly compressed) salary file, reading ahead in a background thread.
+
+    Args:
+        path (Path): Path to the salary file.
+
+    Returns:
+        tuple: Partial result (salary_stats, lines_count, line_errors).
+    """
+    result = {
+        "stats": StreamingStatistics(),
+        "line_errors": []
+    }
+
+    with open_salary_source(path) as file:
+        next_line_idx = 1
+        for chunk in iter_prefetched(iter_line_chunks(file)):
+            next_line_idx += parse_salary_chunk(chunk, next_line_idx, result)
+
+    return result["stats"], next_line_idx - 1, result["line_errors"]
+
+def analyze_salary_sources(
+        patterns: Iterable[str],
+        workers: int = 1,
+        line_errors: Optional[list] = None
+    ) -> tuple[StreamingStatistics, list[tuple[int, str, str, str]]]:
+    """
+    Reads salary data from many (possibly compressed) files and collects combined salary statistics.
+
+    Args:
+        patterns (Iterable[str]): File paths, directory paths or glob patterns.
+        workers (int): Number of processes to parse files with (one file per process at a time).
+        line_errors (list, optional): Container to add content errors to (a list or another object
+                       with `append`/`extend`, e.g. `utils.error_handler.ContentErrorSink`). New list by default.
+
+    Returns:
+        tuple:
+            - StreamingStatistics of valid salaries from all files.
+            - A list of content error tuples: each tuple contains:
+                (line_number, original_line, explanation, file_path).
+    """
+    sources = resolve_salary_sources(patterns)
+
+    try:
+        if workers > 1 and len(sources) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(sources))) as executor:
+                partials = list(executor.map(parse_salary_source, sources))
+        else:
+            partials = [parse_salary_source(source) for source in sources]
+    except PermissionError as exc:
+        raise PermissionError(f'You do not have permission to access "{exc.filename}" file.') from exc
+    except (EOFError, lzma.LZMAError) as exc:
+        raise ValueError(f"Compressed file is corrupted or truncated: {exc}") from exc
+    except OSError as exc:
+        raise OSError(f"OS error occurred: {exc}") from exc
+
+    salary_stats = StreamingStatistics()
+    line_errors = [] if line_errors is None else line_errors
+    for source, (source_stats, _, source_errors) in zip(sources, partials):
+        salary_stats.merge(source_stats)
+        line_errors.extend((line_idx, line, cause, str(source)) for line_idx, line, cause in source_errors)
+
+    return salary_stats, line_errors
@@ -0,0 +1,103 @@
+"""
+This script benchmarks cat data validation on a synthetic dataset.
+
+It generates a temporary cats file with the given number of lines (a share of them invalid),
+runs `get_cats_info` with each engine and storage format, and with a growing number of worker
+processes (up to the number of CPUs), and prints the elapsed time and the memory held by the valid
+records (measured in a separate run, with errors discarded).
+
+Usage:
+    python src/task_2/benchmark.py [lines_count] [invalid_ratio]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+from cats_inventory import get_cats_info
+
+DEFAULT_LINES_COUNT = 1_000_000
+DEFAULT_INVALID_RATIO = 0.5
+INVALID_LINES = (
+    "",
+    "123,,-15",
+    "abc,Tessi,5",
+    "60b90c4613067a15887e1ae6,,5",
+    "60b90c4613067a15887e1ae7,Tessi,",
+    "60b90c4613067a15887e1ae8,Tessi,-5",
+)
+CAT_NAMES = ("Tayson", "Vika", "Barsik", "Simon", "Tessi", "Murzik", "Pushok")
+
+def generate_cats_file(path: Path, lines_count: int, invalid_ratio: float) -> None:
+    """
+    Writes a synthetic cats file.
+
+    Args:
+        path (Path): Path of the file to write.
+        lines_count (int): Number of lines to generate.
+        invalid_ratio (float): Share of invalid lines.
+    """
+    rnd = random.Random(42)
+    with open(path, "w", encoding="utf-8") as file:
+        for idx in range(lines_count):
+            if rnd.random() < invalid_ratio:
+                file.write(f"{rnd.choice(INVALID_LINES)}\n")
+            else:
+                file.write(f"{idx:024x},{rnd.choice(CAT_NAMES)} {idx},{rnd.randint(0, 20)}\n")
+
+def measure(label: str, path: Path, **kwargs):
+    """
+    Runs `get_cats_info` on the file, prints the elapsed time and the memory held by valid records,
+    and returns the result.
+    """
+    start = time.perf_counter()
+    result = get_cats_info(path, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    # Measure memory in a separate run - tracing slows the run down, errors are not kept
+    tracemalloc.start()
+    data, _ = get_cats_info(path, line_errors=deque(maxlen=0), **kwargs)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+
+    print(f"{label.ljust(30)} {elapsed:8.3f} s {memory / 2**20:10.1f} MiB")
+    return result
+
+def main():
+    """
+    Main entry point of the script.
+    """
+    lines_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES_COUNT
+    invalid_ratio = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_INVALID_RATIO
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file_path = Path(tmp_dir) / "cats_file.txt"
+        generate_cats_file(data_file_path, lines_count, invalid_ratio)
+        print(f"Dataset: {lines_count} lines ({invalid_ratio:.0%} invalid), "
+              f"{data_file_path.stat().st_size / 2**20:.1f} MiB")
+        print(f"{'Engine, storage'.ljust(30)} {'Time'.rjust(10)} {'Memory'.rjust(14)}")
+
+        baseline = measure("lines, list of dicts", data_file_path, engine="lines", as_dicts=True)
+        chunked = measure("chunked, list of dicts", data_file_path, as_dicts=True)
+        assert chunked == baseline, "Engines returned different results"
+        del chunked
+
+        compact = measure("chunked, compact records", data_file_path)
+        assert compact[0].to_dicts() == baseline[0], "Storage formats returned different records"
+        assert compact[1] == baseline[1], "Storage formats returned different errors"
+
+        workers = 2
+        while workers <= (os.cpu_count() or 1):
+            parallel = measure(f"chunked, compact, {workers} workers", data_file_path, workers=workers)
+            assert parallel[0].to_dicts() == baseline[0], "Parallel mode returned different records"
+            assert parallel[1] == baseline[1], "Parallel mode returned different errors"
+            workers *= 2
+
+if __name__ == "__main__":
+    main()
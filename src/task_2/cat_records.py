@@ -0,0 +1,216 @@
+"""
+Compact in-memory storage of valid cat records.
+
+Instead of a dictionary per record, all records are kept in a few flat buffers:
+IDs as 12-byte binary values in one contiguous buffer, ages in an `array('H')`,
+and names as UTF-8 text in one blob with an array of end offsets.
+Records are accessed through lightweight `CatRecord` views.
+
+Values that can't be restored exactly from the compact form (IDs with uppercase hex digits,
+ages written in a non-canonical way like " 5" or "007", or too large for `array('H')`)
+are kept as original strings in small override dictionaries, so `CatRecords.to_dicts`
+always gives the same list of dictionaries as before.
+"""
+
+import struct
+from array import array
+from itertools import accumulate
+from typing import Iterator
+
+ID_SIZE = 12  # 24 hex characters
+AGE_OVERRIDDEN = 0xFFFF  # age is kept as original string in the overrides
+
+class CatRecord:
+    """
+    Lightweight view of a single record of `CatRecords`.
+
+    Args:
+        records (CatRecords): Storage the record belongs to.
+        index (int): Index of the record in the storage.
+    """
+
+    __slots__ = ("_records", "_index")
+
+    def __init__(self, records: "CatRecords", index: int):
+        self._records = records
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        """Cat ID (24 hex characters)."""
+        return self._records.get_id(self._index)
+
+    @property
+    def name(self) -> str:
+        """Cat name."""
+        return self._records.get_name(self._index)
+
+    @property
+    def age(self) -> int:
+        """Cat age."""
+        return self._records.get_age(self._index)
+
+    def to_dict(self) -> dict[str, str]:
+        """
+        Returns the record as a dictionary with keys "id", "name" and "age" (all values are strings, as in the file).
+        """
+        return {"id": self.id, "name": self.name, "age": self._records.get_age_str(self._index)}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CatRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"CatRecord(id={self.id!r}, name={self.name!r}, age={self.age})"
+
+class CatRecords:
+    """
+    Compact sequence of valid cat records.
+
+    Supports `len()`, indexing (also negative) and iteration over `CatRecord` views.
+    """
+
+    def __init__(self):
+        self._ids = bytearray()
+        self._ages = array("H")
+        self._name_ends = array("Q")
+        self._names = bytearray()
+        self._id_overrides: dict[int, str] = {}
+        self._age_overrides: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._ages)
+
+    def __getitem__(self, index: int) -> CatRecord:
+        records_count = len(self._ages)
+        if index < 0:
+            index += records_count
+        if not 0 <= index < records_count:
+            raise IndexError("cat record index out of range")
+        return CatRecord(self, index)
+
+    def __iter__(self) -> Iterator[CatRecord]:
+        for index in range(len(self._ages)):
+            yield CatRecord(self, index)
+
+    def __repr__(self) -> str:
+        return f"CatRecords({len(self)} records)"
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate number of bytes used by the record buffers (without override dictionaries)."""
+        return (
+            len(self._ids) + len(self._names)
+            + self._ages.itemsize * len(self._ages)
+            + self._name_ends.itemsize * len(self._name_ends)
+        )
+
+    def append(self, cat_id: str, name: str, age: str) -> None:
+        """
+        Adds a valid record.
+
+        Args:
+            cat_id (str): Cat ID (24 hex characters).
+            name (str): Cat name.
+            age (str): Cat age as written in the file (a non-negative integer).
+        """
+        self.extend([cat_id], [name], [age])
+
+    def extend(self, ids: list[str], names: list[str], ages: list[str]) -> None:
+        """
+        Adds many valid records at once.
+
+        Args:
+            ids (list[str]): Cat IDs (24 hex characters each).
+            names (list[str]): Cat names.
+            ages (list[str]): Cat ages as written in the file (non-negative integers).
+        """
+        if not ids:
+            return
+        first_index = len(self._ages)
+
+        # IDs - converted all at once, IDs that are not lowercase are kept as they are
+        joined_ids = "".join(ids)
+        binary_ids = bytes.fromhex(joined_ids)
+        if binary_ids.hex() != joined_ids:
+            for index, cat_id in enumerate(ids, start=first_index):
+                if cat_id != cat_id.lower():
+                    self._id_overrides[index] = cat_id
+        self._ids += binary_ids
+
+        # Names - UTF-8 blob with end offsets
+        encoded_names = [name.encode("utf-8") for name in names]
+        name_ends = accumulate(map(len, encoded_names), initial=len(self._names))
+        next(name_ends)  # skip the start offset of the first name
+        self._name_ends.extend(name_ends)
+        self._names += b"".join(encoded_names)
+
+        # Ages - numbers, unless they can't be restored as they were written
+        age_values = list(map(int, ages))
+        if list(map(str, age_values)) != ages or max(age_values) >= AGE_OVERRIDDEN:
+            for offset, (age, age_value) in enumerate(zip(ages, age_values)):
+                if str(age_value) != age or age_value >= AGE_OVERRIDDEN:
+                    self._age_overrides[first_index + offset] = age
+                    age_values[offset] = AGE_OVERRIDDEN
+        self._ages.extend(age_values)
+
+    def extend_records(self, other: "CatRecords") -> None:
+        """
+        Adds all records of another storage at once, by joining the buffers.
+
+        Args:
+            other (CatRecords): Storage to add records from.
+        """
+        first_index, names_size = len(self._ages), len(self._names)
+        self._ids += other._ids
+        self._ages.extend(other._ages)
+        self._name_ends.extend(name_end + names_size for name_end in other._name_ends)
+        self._names += other._names
+        self._id_overrides.update((first_index + index, cat_id) for index, cat_id in other._id_overrides.items())
+        self._age_overrides.update((first_index + index, age) for index, age in other._age_overrides.items())
+
+    def id_keys(self) -> list[int]:
+        """
+        Returns IDs of all records as integers (96-bit values, as IDs are compared for duplicates).
+        """
+        return [(high << 64) | low for high, low in struct.iter_unpack(">IQ", self._ids)]
+
+    def get_id(self, index: int) -> str:
+        """
+        Returns the ID of the record at the index.
+        """
+        if index in self._id_overrides:
+            return self._id_overrides[index]
+        return self._ids[index * ID_SIZE:(index + 1) * ID_SIZE].hex()
+
+    def get_name(self, index: int) -> str:
+        """
+        Returns the name of the record at the index.
+        """
+        start = self._name_ends[index - 1] if index else 0
+        return self._names[start:self._name_ends[index]].decode("utf-8")
+
+    def get_age(self, index: int) -> int:
+        """
+        Returns the age of the record at the index.
+        """
+        age = self._ages[index]
+        if age == AGE_OVERRIDDEN:
+            return int(self._age_overrides[index])
+        return age
+
+    def get_age_str(self, index: int) -> str:
+        """
+        Returns the age of the record at the index as written in the file.
+        """
+        age = self._ages[index]
+        if age == AGE_OVERRIDDEN:
+            return self._age_overrides[index]
+        return str(age)
+
+    def to_dicts(self) -> list[dict[str, str]]:
+        """
+        Returns all records as a list of dictionaries with keys "id", "name" and "age" (legacy format).
+        """
+        return [record.to_dict() for record in self]
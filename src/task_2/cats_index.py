@@ -0,0 +1,443 @@
+"""
+Persistent on-disk lookup index over the cats dataset.
+
+The index file holds two sorted tables of fixed-size binary records, memory mapped for binary search:
+- IDs table: ID (96-bit, big-endian) -> byte offset and line number of the record in the data file,
+- ages table: age -> byte offset of the record, sorted by age and then by offset.
+
+Only valid records (see `cats_inventory.get_cats_info`) are indexed. Lookups read only the matching
+lines of the data file (memory mapped as well), so answering "which cat has ID X" or "all cats aged 3"
+doesn't validate the whole file again.
+
+The index remembers size and modification time of the data file it was built from. A stale index is
+refreshed when opened: if lines were only appended to the file (the indexed part is unchanged), only
+the new lines are validated and merged into the tables, otherwise the index is built from scratch.
+"""
+
+import hashlib
+import heapq
+import mmap
+import os
+import re
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+from cats_inventory import (
+    CHUNK_SIZE,
+    ID_PATTERN,
+    cats_file_errors,
+    decode_lines,
+    iter_byte_chunks,
+    validate_cats_chunk,
+)
+from duplicate_ids import DEFAULT_MAX_IDS_IN_MEMORY, SeenIds
+from utils.file_handler import retrieve_line_data
+
+INDEX_MAGIC = b"CATIDX01"
+# magic, data file size, data file mtime (ns), digest of the data file, lines count, IDs count, ages count
+HEADER_FORMAT = ">8sQq16sQQQ"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+ID_SIZE = 12  # 96 bits
+OFFSET_SIZE = 8
+LINE_IDX_SIZE = 8
+AGE_SIZE = 8
+ID_RECORD_SIZE = ID_SIZE + OFFSET_SIZE + LINE_IDX_SIZE
+AGE_RECORD_SIZE = AGE_SIZE + OFFSET_SIZE
+MAX_AGE = (1 << 64) - 1  # larger ages are stored as this value and checked when lines are read
+WRITE_BATCH = 65_536  # records per write
+NEWLINE_PATTERN = re.compile(rb"\r\n?|\n")  # line ends of the text mode reading ("\r\n", "\r" and "\n")
+
+def default_index_path(data_path: Path) -> Path:
+    """
+    Returns the default path of the index of a data file: next to it, with ".idx" suffix added.
+    """
+    return data_path.with_name(data_path.name + ".idx")
+
+def write_records(path: Path, records: Iterator[bytes]) -> int:
+    """
+    Appends raw records to a file in large writes.
+
+    Returns:
+        int: Number of records written.
+    """
+    records_count = 0
+    with open(path, "ab") as file:
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= WRITE_BATCH:
+                file.write(b"".join(batch))
+                records_count += len(batch)
+                batch.clear()
+        file.write(b"".join(batch))
+        records_count += len(batch)
+    return records_count
+
+class SortedTable:
+    """
+    Sorted table of fixed-size binary records in a memory mapped buffer.
+
+    Args:
+        buffer: Memory mapped index file.
+        start (int): Byte offset of the first record.
+        records_count (int): Number of records.
+        record_size (int): Size of a record in bytes.
+    """
+
+    def __init__(self, buffer, start: int, records_count: int, record_size: int):
+        self.buffer = buffer
+        self.start = start
+        self.records_count = records_count
+        self.record_size = record_size
+
+    def __len__(self) -> int:
+        return self.records_count
+
+    def record(self, idx: int) -> bytes:
+        """Returns the raw record at the index."""
+        offset = self.start + idx * self.record_size
+        return self.buffer[offset:offset + self.record_size]
+
+    def iter_records(self) -> Iterator[bytes]:
+        """Iterates over raw records in sorted order."""
+        for idx in range(self.records_count):
+            yield self.record(idx)
+
+    def find(self, key: bytes) -> Optional[bytes]:
+        """
+        Finds the raw record that starts with the key, None if there is no such record.
+        """
+        idx = self.lower_bound(key)
+        if idx < self.records_count:
+            record = self.record(idx)
+            if record.startswith(key):
+                return record
+        return None
+
+    def lower_bound(self, key: bytes) -> int:
+        """
+        Finds the index of the first record that is not less than the key (binary search over record prefixes).
+        """
+        buffer, key_size, low, high = self.buffer, len(key), 0, self.records_count
+        while low < high:
+            middle = (low + high) // 2
+            offset = self.start + middle * self.record_size
+            if buffer[offset:offset + key_size] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+class IndexedIds:
+    """
+    Seen IDs (see `duplicate_ids.SeenIds`) backed by the IDs table of an existing index,
+    used to validate lines appended to the data file.
+
+    Args:
+        ids_table (SortedTable): IDs table of the existing index.
+        seen_ids (SeenIds): IDs of the appended lines.
+    """
+
+    def __init__(self, ids_table: SortedTable, seen_ids: SeenIds):
+        self.ids_table = ids_table
+        self.seen_ids = seen_ids
+
+    def __contains__(self, cat_id: str) -> bool:
+        return self._find_indexed(cat_id) is not None or cat_id in self.seen_ids
+
+    def _find_indexed(self, cat_id: str) -> Optional[int]:
+        """Finds the line number of the ID in the IDs table."""
+        record = self.ids_table.find(int(cat_id, 16).to_bytes(ID_SIZE, "big"))
+        return None if record is None else int.from_bytes(record[ID_SIZE + OFFSET_SIZE:], "big")
+
+    def register(self, cat_id: str, line_idx: int) -> Optional[int]:
+        """
+        Registers an ID, unless it was already registered, see `SeenIds.register`.
+        """
+        first_line_idx = self._find_indexed(cat_id)
+        if first_line_idx is not None:
+            return first_line_idx
+        return self.seen_ids.register(cat_id, line_idx)
+
+class ChunkRecords:
+    """
+    Valid records of a chunk, as collected by `validate_cats_chunk` (used instead of `CatRecords`).
+    """
+
+    def __init__(self):
+        self.ids, self.ages = [], []
+
+    def extend(self, ids: list[str], _names: list[str], ages: list[str]) -> None:
+        """Adds valid records (names are not indexed)."""
+        self.ids += ids
+        self.ages += ages
+
+class CatsIndex:
+    """
+    Persistent lookup index over a cats data file.
+
+    Opening the index builds it if it doesn't exist and refreshes it if the data file was changed.
+    Use as a context manager or call `close()` to unmap the files.
+
+    Example:
+        >>> with CatsIndex(Path("dataset/cats_file.txt")) as cats_index:
+        ...     cats_index.find("60b90c1c13067a15887e1ae1")
+        ...     cats_index.find_by_age(3, 5)
+        {'id': '60b90c1c13067a15887e1ae1', 'name': 'Tayson', 'age': '3'}
+        [{'id': '60b90c1c13067a15887e1ae1', 'name': 'Tayson', 'age': '3'}, ...]
+
+    Args:
+        data_path (Path): Path to the data file.
+        index_path (Path, optional): Path to the index file (see `default_index_path` by default).
+        max_ids_in_memory (int): Number of IDs kept in memory for duplicate detection before spilling to disk.
+    """
+
+    def __init__(
+            self,
+            data_path: Path,
+            index_path: Optional[Path] = None,
+            max_ids_in_memory: int = DEFAULT_MAX_IDS_IN_MEMORY
+        ):
+        self.data_path = Path(data_path)
+        self.index_path = Path(index_path) if index_path else default_index_path(self.data_path)
+        self.max_ids_in_memory = max_ids_in_memory
+        self.header = None
+        self.ids_table: Optional[SortedTable] = None
+        self.ages_table: Optional[SortedTable] = None
+        self._index_map = None
+        self._data_map = None
+        self.refresh()
+
+    def __enter__(self) -> "CatsIndex":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.ids_table)
+
+    def close(self) -> None:
+        """
+        Unmaps the index and the data file.
+        """
+        for buffer in (self._index_map, self._data_map):
+            if buffer is not None:
+                buffer.close()
+        self._index_map = self._data_map = None
+
+    def is_stale(self) -> bool:
+        """
+        Checks if the data file was changed since the index was built (by size and modification time).
+        """
+        stat = self.data_path.stat()
+        return self.header is None or (stat.st_size, stat.st_mtime_ns) != self.header[1:3]
+
+    def refresh(self, full: bool = False) -> str:
+        """
+        Brings the index up to date with the data file.
+
+        Parameters:
+            full (bool): Rebuild the index from scratch even if it is up to date.
+
+        Returns:
+            str: "fresh" if the index was up to date, "appended" if only new lines were indexed,
+                 "rebuilt" if the index was built from scratch.
+        """
+        with cats_file_errors(self.data_path):
+            if self.data_path.stat().st_size == 0:
+                raise ValueError(f'The file "{self.data_path}" is empty.')
+
+            if self.header is None and self.index_path.exists():
+                self._open()
+            if not full and self.header is not None and not self.is_stale():
+                return "fresh"
+
+            prefix_hash = self._hash_unchanged_prefix() if not full and self.header is not None else None
+            if prefix_hash is not None:
+                self._build(self.header[1], self.header[4], prefix_hash)
+            else:
+                self._build(0, 0, hashlib.blake2b(digest_size=16))
+            self._open()
+        return "rebuilt" if prefix_hash is None else "appended"
+
+    def _open(self) -> None:
+        """Maps the index and the data file, a malformed index is treated as missing."""
+        self.close()
+        with open(self.index_path, "rb") as file:
+            header = file.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE or not header.startswith(INDEX_MAGIC):
+                self.header = None
+                return
+            self._index_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.data_path, "rb") as file:
+            self._data_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.header = struct.unpack(HEADER_FORMAT, header)
+        ids_count, ages_count = self.header[5], self.header[6]
+        self.ids_table = SortedTable(self._index_map, HEADER_SIZE, ids_count, ID_RECORD_SIZE)
+        self.ages_table = SortedTable(
+            self._index_map, HEADER_SIZE + ids_count * ID_RECORD_SIZE, ages_count, AGE_RECORD_SIZE
+        )
+
+    def _hash_unchanged_prefix(self):
+        """
+        Checks if the indexed part of the data file is unchanged and new lines were only added after it.
+
+        Returns:
+            Hash of the indexed part (to continue with new lines), None if the data file was changed otherwise.
+        """
+        indexed_size, digest = self.header[1], self.header[3]
+        with open(self.data_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size <= indexed_size:
+                return None
+            # The last indexed line must be complete, otherwise appended text continues it
+            file.seek(indexed_size - 1)
+            if file.read(1) != b"\n":
+                return None
+            file.seek(0)
+            prefix_hash = hashlib.blake2b(digest_size=16)
+            remaining = indexed_size
+            while remaining and (chunk := file.read(min(CHUNK_SIZE, remaining))):
+                prefix_hash.update(chunk)
+                remaining -= len(chunk)
+        return prefix_hash if prefix_hash.digest() == digest else None
+
+    def _build(self, first_offset: int, lines_count: int, data_hash) -> None:
+        """
+        Validates the data file starting from the byte offset and writes a new index file,
+        merging new records with the current index if the offset is not zero.
+
+        Parameters:
+            first_offset (int): Byte offset of the first line to validate.
+            lines_count (int): Number of lines before the offset.
+            data_hash: Hash of the data file before the offset, updated with the validated part.
+        """
+        id_records, age_records = [], []
+
+        with SeenIds(self.max_ids_in_memory) as new_ids, open(self.data_path, "rb") as file:
+            seen_ids = IndexedIds(self.ids_table, new_ids) if first_offset else new_ids
+            mtime_ns = os.fstat(file.fileno()).st_mtime_ns
+            file.seek(first_offset)
+
+            for chunk_offset, chunk in iter_byte_chunks(file, first_offset):
+                data_hash.update(chunk)
+                data_hash.update(b"\n")
+                text = decode_lines(chunk)
+
+                chunk_result = {"data": ChunkRecords(), "seen_ids": seen_ids, "line_errors": [], "duplicates": None}
+                chunk_lines_count = validate_cats_chunk(text, lines_count + 1, chunk_result)
+
+                # Valid records are the lines without errors, in order
+                line_starts = [chunk_offset]
+                line_starts += (chunk_offset + match.end() for match in NEWLINE_PATTERN.finditer(chunk))
+                error_lines = {line_error[0] for line_error in chunk_result["line_errors"]}
+                valid_lines = (
+                    line_idx for line_idx in range(lines_count + 1, lines_count + chunk_lines_count + 1)
+                    if line_idx not in error_lines
+                )
+                records = chunk_result["data"]
+                for line_idx, cat_id, age in zip(valid_lines, records.ids, records.ages):
+                    offset = line_starts[line_idx - lines_count - 1].to_bytes(OFFSET_SIZE, "big")
+                    id_records.append(
+                        int(cat_id, 16).to_bytes(ID_SIZE, "big") + offset + line_idx.to_bytes(LINE_IDX_SIZE, "big")
+                    )
+                    age_records.append(min(int(age), MAX_AGE).to_bytes(AGE_SIZE, "big") + offset)
+
+                lines_count += chunk_lines_count
+            indexed_size = file.tell()
+
+        # The hash matches the file only if it ends with a newline, otherwise the index is not extended anyway
+        id_records.sort()
+        age_records.sort()
+        if first_offset:
+            id_records = heapq.merge(self.ids_table.iter_records(), id_records)
+            age_records = heapq.merge(self.ages_table.iter_records(), age_records)
+
+        # Write the new index next to the current one and replace it at once
+        file_descriptor, tmp_path = tempfile.mkstemp(prefix=".cats_", suffix=".idx", dir=self.index_path.parent)
+        tmp_path = Path(tmp_path)
+        try:
+            with open(file_descriptor, "wb") as file:
+                file.write(bytes(HEADER_SIZE))
+            ids_count = write_records(tmp_path, id_records)
+            ages_count = write_records(tmp_path, age_records)
+            with open(tmp_path, "r+b") as file:
+                file.write(struct.pack(
+                    HEADER_FORMAT, INDEX_MAGIC, indexed_size, mtime_ns, data_hash.digest(),
+                    lines_count, ids_count, ages_count
+                ))
+            self.close()
+            os.replace(tmp_path, self.index_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _read_record(self, offset: int) -> dict[str, str]:
+        """Reads and parses the line at the byte offset of the data file."""
+        data_map = self._data_map
+        line_end = NEWLINE_PATTERN.search(data_map, offset)
+        line = data_map[offset:line_end.start() if line_end else len(data_map)].decode("utf-8")
+        cat_id, name, age = retrieve_line_data(line)
+        return {"id": cat_id, "name": name, "age": age}
+
+    def _find_id_record(self, cat_id: str) -> Optional[bytes]:
+        """Finds the raw record of the ID in the IDs table, None for unknown or malformed IDs."""
+        if not ID_PATTERN.match(cat_id):
+            return None
+        return self.ids_table.find(int(cat_id, 16).to_bytes(ID_SIZE, "big"))
+
+    def find(self, cat_id: str) -> Optional[dict[str, str]]:
+        """
+        Finds the valid record with the ID (case-insensitively).
+
+        Parameters:
+            cat_id (str): Cat ID (24 hex characters).
+
+        Returns:
+            dict, optional: Record with keys "id", "name", and "age", None if there is no such record.
+        """
+        record = self._find_id_record(cat_id)
+        if record is None:
+            return None
+        return self._read_record(int.from_bytes(record[ID_SIZE:ID_SIZE + OFFSET_SIZE], "big"))
+
+    def find_line(self, cat_id: str) -> Optional[int]:
+        """
+        Finds the line number of the valid record with the ID (case-insensitively), None if there is no such record.
+        """
+        record = self._find_id_record(cat_id)
+        return None if record is None else int.from_bytes(record[ID_SIZE + OFFSET_SIZE:], "big")
+
+    def iter_by_age(self, min_age: int, max_age: Optional[int] = None) -> Iterator[dict[str, str]]:
+        """
+        Iterates over valid records with ages in the range, ordered by age and then by position in the file.
+
+        Parameters:
+            min_age (int): Minimal age.
+            max_age (int, optional): Maximal age (inclusive), same as `min_age` by default.
+
+        Yields:
+            dict: Records with keys "id", "name", and "age".
+        """
+        max_age = min_age if max_age is None else max_age
+        if max_age < 0 or min_age > max_age:
+            return
+        ages_table = self.ages_table
+        first_idx = ages_table.lower_bound(min(max(min_age, 0), MAX_AGE).to_bytes(AGE_SIZE, "big"))
+        for idx in range(first_idx, len(ages_table)):
+            record = ages_table.record(idx)
+            age = int.from_bytes(record[:AGE_SIZE], "big")
+            if age > max_age:
+                break
+            cat = self._read_record(int.from_bytes(record[AGE_SIZE:], "big"))
+            # Ages beyond the stored range are checked against the line
+            if age < MAX_AGE or min_age <= int(cat["age"]) <= max_age:
+                yield cat
+
+    def find_by_age(self, min_age: int, max_age: Optional[int] = None) -> list[dict[str, str]]:
+        """
+        Finds valid records with ages in the range, see `iter_by_age`.
+        """
+        return list(self.iter_by_age(min_age, max_age))
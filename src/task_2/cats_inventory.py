@@ -1,8 +1,102 @@
 import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from typing import Iterator, Optional, Union
 
-from utils.file_handler import retrieve_line_data
+from cat_records import CatRecords
+from duplicate_ids import SeenIds, DEFAULT_MAX_IDS_IN_MEMORY
+from utils.file_handler import find_shard_bounds, retrieve_line_data
+
+CHUNK_SIZE = 4 * 1024 * 1024  # 4 Mi characters per read
+DEFAULT_BATCH_SIZE = 1000  # events per batch in the streaming mode
+PARALLEL_MIN_FILE_SIZE = 16 * 1024 * 1024  # smaller files are validated serially
+SHARDS_PER_WORKER = 4  # more shards than workers let merging overlap with validation
 
 ID_PATTERN = re.compile(r"^[a-fA-F0-9]{24}$")
+# Anything int() accepts: whitespace (except "\x1c"-"\x1f"), an optional sign and (Unicode) decimal digits,
+# optionally separated by "_"
+AGE_PATTERN = re.compile(r"^[^\S\x1c-\x1f]*[+-]?\d+(?:_\d+)*[^\S\x1c-\x1f]*$")
+# Every line of a chunk matches exactly once: either as a line of three fields that can be checked
+# by the pattern alone (the line has no leading or trailing whitespace, the ID is either valid or not,
+# the name is either present or not, the age is a non-negative integer, a negative integer or
+# surely not an integer), capturing only the valid (or negative age) fields, or as any other line (last group)
+# that needs a per-field check
+CAT_LINE_PATTERN = re.compile(
+    r"^(?:(?=\S)"
+    r"(?:([a-fA-F0-9]{24})|[^,\n]*),"
+    r"(?:([^\S\n]*[^\s,][^,\n]*)|[^\S\n]*),"
+    r"(?:([^\S\n\x1c-\x1f]*\+?[0-9]+)|([^\S\n\x1c-\x1f]*-0*[1-9][0-9]*)|[^\d,\n]*|(?=[^,\n]*[^\d\s_+\-,])[^,\n]*)(?<=\S)"
+    r"|(.*))$",
+    re.MULTILINE
+)
+
+# Validation error codes (bit flags), listed in the order their messages are combined
+CAT_ERROR_FORMAT = 1
+CAT_ERROR_ID = 2
+CAT_ERROR_DUPLICATE_ID = 4
+CAT_ERROR_NAME = 8
+CAT_ERROR_AGE_NOT_INTEGER = 16
+CAT_ERROR_AGE_NEGATIVE = 32
+CAT_ERROR_MESSAGES = {
+    CAT_ERROR_FORMAT: "Invalid data format or missing/extra data",
+    CAT_ERROR_ID: "Invalid or missing ID",
+    CAT_ERROR_DUPLICATE_ID: "Duplicate ID",
+    CAT_ERROR_NAME: "Missing or empty name",
+    CAT_ERROR_AGE_NOT_INTEGER: "Age must be a numeric integer",
+    CAT_ERROR_AGE_NEGATIVE: "Age cannot be negative",
+}
+
+def check_cat_data(cat: list[str], seen_ids: set[str]) -> int:
+    """
+    Checks a single cat data entry without raising exceptions.
+
+    Parameters:
+        cat (list[str]): A list of three elements representing the cat's ID, name, and age.
+        seen_ids (set[str]): A set of already encountered IDs used to detect duplicates
+                             (or `duplicate_ids.SeenIds`).
+
+    Returns:
+        int: Combination of `CAT_ERROR_*` codes of all failed checks, 0 if the entry is valid.
+    """
+    if len(cat) != 3:
+        return CAT_ERROR_FORMAT
+
+    errors = 0
+    cat_id, name, age_str = cat
+
+    # Validate ID
+    if not ID_PATTERN.match(cat_id):
+        errors |= CAT_ERROR_ID
+    elif cat_id in seen_ids:
+        errors |= CAT_ERROR_DUPLICATE_ID
+
+    # Validate name
+    if not name.strip():
+        errors |= CAT_ERROR_NAME
+
+    # Validate age
+    if not AGE_PATTERN.match(age_str):
+        errors |= CAT_ERROR_AGE_NOT_INTEGER
+    elif int(age_str) < 0:
+        errors |= CAT_ERROR_AGE_NEGATIVE
+
+    return errors
+
+@lru_cache(maxsize=None)
+def describe_cat_errors(errors: int) -> str:
+    """
+    Builds the error message of a cat data entry from its error codes.
+
+    Parameters:
+        errors (int): Combination of `CAT_ERROR_*` codes, see `check_cat_data`.
+
+    Returns:
+        str: All error messages combined, e.g. "Invalid or missing ID, Age cannot be negative".
+    """
+    return ", ".join(message for code, message in CAT_ERROR_MESSAGES.items() if errors & code)
 
 def validate_cat_data(cat: list[str], seen_ids: set[str]):
     """
@@ -16,61 +110,395 @@ def validate_cat_data(cat: list[str], seen_ids: set[str]):
         ValueError: If any validation check fails (invalid format, duplicate ID, empty fields, or incorrect age).
                     Combines all encountered errors and provides them as error message.
     """
-    errors = []
-    
-    if len(cat) != 3:
-        errors.append("Invalid data format or missing/extra data")
+    errors = check_cat_data(cat, seen_ids)
+    if errors:
+        # Combine all errors into a string and provide it as error message
+        raise ValueError(describe_cat_errors(errors))
+
+def validate_cats_chunk(text: str, first_line_idx: int, result: dict) -> int:
+    """
+    Validates all lines of a text chunk in one pass (fast path) and stores the outcome in the result accumulator.
+
+    Most lines are checked by a single regex over the whole chunk, only unusual lines are split
+    and checked field by field. No exceptions are raised for invalid lines, error messages
+    are built from error codes only for lines being reported.
+
+    Parameters:
+        text (str): Complete lines of the file, without the trailing newline of the last one.
+        first_line_idx (int): Line number (1-based) of the first line of the chunk.
+        result (dict): Accumulator with "data" (CatRecords), "seen_ids" (SeenIds), "line_errors" list
+                       and optional "duplicates" list.
+
+    Returns:
+        int: Number of lines in the chunk.
+    """
+    seen_ids, line_errors = result["seen_ids"], result["line_errors"]
+    # Valid records of the chunk are added to the storage at once
+    ids, names, ages = [], [], []
+    line_idx = first_line_idx - 1
+
+    for line_idx, match in enumerate(CAT_LINE_PATTERN.finditer(text), start=first_line_idx):
+        cat_id, name, age, negative_age, line = match.groups()
+
+        if line is None:
+            # Line checked by the pattern - collect error codes of missing fields
+            errors = 0 if cat_id is not None else CAT_ERROR_ID
+            if name is None:
+                errors |= CAT_ERROR_NAME
+            if age is None:
+                errors |= CAT_ERROR_AGE_NEGATIVE if negative_age is not None else CAT_ERROR_AGE_NOT_INTEGER
+
+            # A valid ID is a duplicate if it was registered by an earlier valid line
+            if errors:
+                if cat_id is not None and cat_id in seen_ids:
+                    errors |= CAT_ERROR_DUPLICATE_ID
+            elif seen_ids.register(cat_id, line_idx) is not None:
+                errors = CAT_ERROR_DUPLICATE_ID
+            else:
+                ids.append(cat_id)
+                names.append(name)
+                ages.append(age)
+                continue
+            line = match.group()
+        else:
+            # Any other line - check it field by field
+            cat = retrieve_line_data(line)
+            errors = check_cat_data(cat, seen_ids)
+
+            if not errors:
+                seen_ids.register(cat[0], line_idx)
+                ids.append(cat[0])
+                names.append(cat[1])
+                ages.append(cat[2])
+                continue
+
+        line_errors.append((line_idx, line, describe_cat_errors(errors)))
+        if errors & CAT_ERROR_DUPLICATE_ID:
+            report_duplicate_id(line, line_idx, result)
+
+    result["data"].extend(ids, names, ages)
+    return line_idx - first_line_idx + 1
+
+def report_duplicate_id(line: str, line_idx: int, result: dict) -> None:
+    """
+    Adds a duplicate ID with the line numbers of both occurrences to the result accumulator, if it collects them.
+
+    Parameters:
+        line (str): The line with the duplicate ID.
+        line_idx (int): Line number (1-based) of the line.
+        result (dict): Accumulator with "seen_ids" (SeenIds) and optional "duplicates" list.
+    """
+    if result["duplicates"] is None:
+        return
+    cat_id = retrieve_line_data(line)[0]
+    result["duplicates"].append((cat_id, result["seen_ids"].first_line(cat_id), line_idx))
+
+def iter_text_chunks(file, chunk_size: int = CHUNK_SIZE):
+    """
+    Reads a text file in large chunks of complete lines.
+
+    Parameters:
+        file: File object opened in text mode.
+        chunk_size (int): Number of characters to read at once.
+
+    Yields:
+        str: Complete lines without the trailing newline of the last one (the last line of the file
+             may have no newline at all). Every line of the file belongs to exactly one chunk.
+    """
+    tail = ""
+    while chunk := file.read(chunk_size):
+        last_line_end = chunk.rfind("\n")
+        if last_line_end == -1:
+            tail += chunk
+            continue
+        yield tail + chunk[:last_line_end]
+        tail = chunk[last_line_end + 1:]
+    if tail:
+        yield tail
+
+def iter_byte_chunks(
+        file,
+        first_offset: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[tuple[int, bytes]]:
+    """
+    Reads a binary file in large chunks of complete lines (same split as `iter_text_chunks`).
+
+    Parameters:
+        file: File object opened in binary mode, positioned at `first_offset` (start of a line).
+        first_offset (int): Byte offset of the current file position.
+        end (int, optional): Byte offset to stop reading at (end of file by default).
+        chunk_size (int): Number of bytes to read at once.
+
+    Yields:
+        tuple[int, bytes]: Byte offset of the chunk and complete lines without the trailing newline of the last one.
+    """
+    tail, offset, position = b"", first_offset, first_offset
+    while chunk := file.read(chunk_size if end is None else max(min(chunk_size, end - position), 0)):
+        position += len(chunk)
+        last_line_end = chunk.rfind(b"\n")
+        if last_line_end == -1:
+            tail += chunk
+            continue
+        lines = tail + chunk[:last_line_end]
+        yield offset, lines
+        offset += len(lines) + 1
+        tail = chunk[last_line_end + 1:]
+    if tail:
+        yield offset, tail
+
+def decode_lines(chunk: bytes) -> str:
+    """
+    Decodes a chunk of lines read in binary mode the same way as the file is read in text mode
+    (UTF-8, "\\r\\n" and "\\r" line ends translated to "\\n").
+    """
+    text = chunk.decode("utf-8")
+    if "\r" in text:
+        # A trailing "\r" is the rest of the "\r\n" the chunk was split at (or the last line end of the file)
+        text = text.removesuffix("\r").replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def validate_cats_shard(
+        path: str,
+        start: int,
+        end: int,
+        max_ids_in_memory: int = DEFAULT_MAX_IDS_IN_MEMORY
+    ) -> tuple[CatRecords, array, int, list[tuple[int, str, str]], list[tuple[str, int, int]], list[tuple[int, int]]]:
+    """
+    Worker function for parallel mode - validates a single shard of the file on its own.
+
+    Duplicate IDs are detected within the shard only, the rest is done by `merge_cats_shard`.
+
+    Parameters:
+        path (str): Path to the data file.
+        start (int): Byte offset of the shard start (start of a line).
+        end (int): Byte offset of the shard end (after a line end or end of file).
+        max_ids_in_memory (int): Number of IDs kept in memory for duplicate detection before spilling to disk.
+
+    Returns:
+        tuple: Partial result, where line numbers are counted from the shard start (1-based):
+        - Valid records of the shard (`CatRecords`).
+        - Line numbers of the valid records (`array('Q')`).
+        - Number of lines in the shard.
+        - Errors from invalid lines: (line index, line content, error message).
+        - Duplicate IDs within the shard: (ID, line index of the first occurrence, line index of the duplicate).
+        - Errors of lines with a valid, not yet duplicate ID (it may be a duplicate of an earlier shard):
+          (index in errors, ID as an integer).
+    """
+    result = {
+        "data": CatRecords(),
+        "seen_ids": SeenIds(max_ids_in_memory),
+        "line_errors": [],
+        "duplicates": []
+    }
+    with result["seen_ids"], open(path, "rb") as file:
+        file.seek(start)
+        lines_count = 0
+        for _, chunk in iter_byte_chunks(file, start, end):
+            lines_count += validate_cats_chunk(decode_lines(chunk), lines_count + 1, result)
+
+    error_lines = set()
+    unresolved_errors = []
+    for error_idx, (line_idx, line, cause) in enumerate(result["line_errors"]):
+        error_lines.add(line_idx)
+        if CAT_ERROR_MESSAGES[CAT_ERROR_DUPLICATE_ID] not in cause:
+            cat = retrieve_line_data(line)
+            if len(cat) == 3 and ID_PATTERN.match(cat[0]):
+                unresolved_errors.append((error_idx, int(cat[0], 16)))
+
+    record_lines = array("Q", (line_idx for line_idx in range(1, lines_count + 1) if line_idx not in error_lines))
+    return result["data"], record_lines, lines_count, result["line_errors"], result["duplicates"], unresolved_errors
+
+def read_range_lines(path: str, start: int, end: int, line_numbers: set[int]) -> dict[int, str]:
+    """
+    Reads lines with the given numbers (counted from the range start, 1-based) from a byte range of the file.
+    """
+    lines = {}
+    with open(path, "rb") as file:
+        file.seek(start)
+        lines_count = 0
+        for _, chunk in iter_byte_chunks(file, start, end):
+            chunk_lines = decode_lines(chunk).split("\n")
+            for line_idx, line in enumerate(chunk_lines, start=lines_count + 1):
+                if line_idx in line_numbers:
+                    lines[line_idx] = line
+            lines_count += len(chunk_lines)
+    return lines
+
+def merge_cats_shard(partial: tuple, first_line_idx: int, path: str, start: int, end: int, result: dict) -> int:
+    """
+    Merges the partial result of a shard (see `validate_cats_shard`) into the result accumulator,
+    marking duplicates exactly as the serial validation would: the first valid line with an ID
+    registers it, later lines with the same ID are duplicates. Shards must be merged in file order.
+
+    Parameters:
+        partial (tuple): Partial result of the shard.
+        first_line_idx (int): Line number (1-based) of the first line of the shard.
+        path (str): Path to the data file (lines of new errors are read from it).
+        start (int): Byte offset of the shard start.
+        end (int): Byte offset of the shard end.
+        result (dict): Accumulator with "data" (CatRecords), "seen_ids" (SeenIds with IDs of earlier shards),
+                       "line_errors" list and optional "duplicates" list.
+
+    Returns:
+        int: Number of lines in the shard.
+    """
+    records, record_lines, lines_count, shard_errors, shard_duplicates, unresolved_errors = partial
+    seen_ids = result["seen_ids"]
+    lines_offset = first_line_idx - 1
+    duplicates = []
+
+    # Duplicates within the shard - the first occurrence may be in an earlier shard
+    for cat_id, shard_first_line_idx, line_idx in shard_duplicates:
+        earlier_line_idx = seen_ids.first_line(cat_id)
+        first_line = shard_first_line_idx + lines_offset if earlier_line_idx is None else earlier_line_idx
+        duplicates.append((cat_id, first_line, line_idx + lines_offset))
+
+    # Invalid lines with an ID registered in an earlier shard get the duplicate error as well
+    for error_idx, key in unresolved_errors:
+        earlier_line_idx = seen_ids.first_line_by_key(key)
+        if earlier_line_idx is not None:
+            line_idx, line, _ = shard_errors[error_idx]
+            cat = retrieve_line_data(line)
+            shard_errors[error_idx] = (line_idx, line, describe_cat_errors(check_cat_data(cat, (cat[0],))))
+            duplicates.append((cat[0], earlier_line_idx, line_idx + lines_offset))
+
+    # Valid records register their IDs (distinct within the shard), those registered in an earlier shard are duplicates
+    keys = records.id_keys()
+    earlier_lines = seen_ids.register_keys(keys, map(lines_offset.__add__, record_lines))
+    dropped_records = {}
+    if earlier_lines:
+        for record_idx, key in enumerate(keys):
+            if key in earlier_lines:
+                line_idx = record_lines[record_idx]
+                dropped_records[line_idx] = record_idx
+                duplicates.append((records.get_id(record_idx), earlier_lines[key], line_idx + lines_offset))
+
+    line_errors = [(line_idx + lines_offset, line, cause) for line_idx, line, cause in shard_errors]
+    if dropped_records:
+        dropped_lines = read_range_lines(path, start, end, set(dropped_records))
+        line_errors.extend(
+            (line_idx + lines_offset, line, describe_cat_errors(CAT_ERROR_DUPLICATE_ID))
+            for line_idx, line in dropped_lines.items()
+        )
+        line_errors.sort(key=lambda line_error: line_error[0])
+
+        dropped_idxs = set(dropped_records.values())
+        kept_records = [idx for idx in range(len(records)) if idx not in dropped_idxs]
+        result["data"].extend(
+            [records.get_id(idx) for idx in kept_records],
+            [records.get_name(idx) for idx in kept_records],
+            [records.get_age_str(idx) for idx in kept_records]
+        )
     else:
-        # Validate ID
-        cat_id = cat[0]
-        if not cat_id.strip() or not ID_PATTERN.match(cat_id):
-            errors.append("Invalid or missing ID")
-        elif cat_id in seen_ids:
-            errors.append("Duplicate ID")
-
-        # Validate name
-        name = cat[1]
-        if not name or not name.strip():
-            errors.append("Missing or empty name")
-
-        # Validate age
-        age_str = cat[2]
-        try:
-            age = int(age_str)
-            if age < 0:
-                errors.append("Age cannot be negative")
-        except (ValueError, TypeError):
-            errors.append("Age must be a numeric integer")
+        result["data"].extend_records(records)
 
-    if errors:
-        # Combine all errors into a string and provide it as error message 
-        raise ValueError(", ".join(errors))
+    result["line_errors"].extend(line_errors)
+    if result["duplicates"] is not None:
+        duplicates.sort(key=lambda duplicate: duplicate[2])
+        result["duplicates"].extend(duplicates)
+    return lines_count
+
+def validate_cats_file_parallel(path: str, file_size: int, workers: int, result: dict, max_ids_in_memory: int) -> int:
+    """
+    Validates the file in byte-range shards in parallel and merges them in file order.
+
+    Parameters:
+        path (str): Path to the data file.
+        file_size (int): Size of the file in bytes.
+        workers (int): Number of processes to validate the file with.
+        result (dict): Accumulator, see `merge_cats_shard`.
+        max_ids_in_memory (int): Number of IDs kept in memory for duplicate detection before spilling to disk.
+
+    Returns:
+        int: Number of lines in the file.
+    """
+    with open(path, "rb") as file:
+        shard_bounds = find_shard_bounds(file, 0, file_size, workers * SHARDS_PER_WORKER)
+
+    lines_count = 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(shard_bounds))) as executor:
+        futures = [
+            executor.submit(validate_cats_shard, path, shard_start, shard_end, max_ids_in_memory)
+            for shard_start, shard_end in shard_bounds
+        ]
+        for (shard_start, shard_end), future in zip(shard_bounds, futures):
+            lines_count += merge_cats_shard(future.result(), lines_count + 1, path, shard_start, shard_end, result)
+    return lines_count
+
+@contextmanager
+def cats_file_errors(path: str):
+    """
+    Re-raises file access errors that occur within the context with messages about the data file.
+
+    Parameters:
+        path (str): Path to the data file.
+    """
+    try:
+        yield
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f'The file "{path}" does not exist.') from exc
+    except PermissionError as exc:
+        raise PermissionError(f'You do not have permission to access "{path}" file.') from exc
+    except IsADirectoryError as exc:
+        raise IsADirectoryError(f'Expected a file, but found a "{path}" directory.') from exc
+    except OSError as exc:
+        raise OSError(f"OS error occurred: {exc}") from exc
 
-def get_cats_info(path: str) -> tuple[list[dict[str, str]], list[tuple[int, str, str]]]:
+def get_cats_info(
+        path: str,
+        line_errors: Optional[list] = None,
+        engine: str = "chunked",
+        as_dicts: bool = False,
+        duplicates: Optional[list] = None,
+        max_ids_in_memory: int = DEFAULT_MAX_IDS_IN_MEMORY,
+        workers: int = 1
+    ) -> tuple[Union[CatRecords, list[dict[str, str]]], list[tuple[int, str, str]]]:
     """
     Retrieves and validates cat data from a file.
 
     Parameters:
         path (str): Path to the data file.
+        line_errors (list, optional): Container to add errors from invalid lines to (a list or another object
+                                      with `append`, e.g. `utils.error_handler.ContentErrorSink`). New list by default.
+        engine (str): "chunked" (default) validates chunks of lines in one pass,
+                      "lines" validates the file line by line. Both give the same result.
+        as_dicts (bool): Return valid cat data as a list of dictionaries (legacy format)
+                         instead of compact `CatRecords` storage.
+        duplicates (list, optional): Container to add duplicate IDs to, as (ID, line index of the first
+                                     occurrence, line index of the duplicate). Not collected by default.
+        max_ids_in_memory (int): Number of IDs kept in memory for duplicate detection before spilling to disk.
+        workers (int): Number of processes to validate large files with ("chunked" engine only).
+                       The result is the same as with a single process.
+
+    Lines with a duplicate ID are reported as errors: an ID is registered by the first valid line with it,
+    IDs are compared as hex numbers (case-insensitively).
 
     Returns:
         Tuple:
-        - List of valid cat data dictionaries with keys "id", "name", and "age".
+        - Valid cat data: `CatRecords` (see `cat_records`), or a list of dictionaries
+          with keys "id", "name", and "age" if `as_dicts` is set.
         - List of errors from invalid lines: (line index, line content, error message).
     """
     result = {
-        "data": [],
-        "seen_ids": set(),
-        "line_errors": []
+        "data": CatRecords(),
+        "seen_ids": SeenIds(max_ids_in_memory),
+        "line_errors": [] if line_errors is None else line_errors,
+        "duplicates": duplicates
     }
 
-    try:
-        # Load file with cat data
-        with open(path, encoding="utf-8") as file:
-            # Check if file is empty
-            if path.stat().st_size == 0:
-                raise ValueError(f'The file "{path}" is empty.')
+    # Load file with cat data
+    with cats_file_errors(path), result["seen_ids"], open(path, encoding="utf-8") as file:
+        # Check if file is empty
+        file_size = path.stat().st_size
+        if file_size == 0:
+            raise ValueError(f'The file "{path}" is empty.')
 
+        if engine != "lines" and workers > 1 and file_size >= PARALLEL_MIN_FILE_SIZE:
+            # Validate shards of the file in parallel, each worker reads its own byte range
+            validate_cats_file_parallel(path, file_size, workers, result, max_ids_in_memory)
+        elif engine == "lines":
             for line_idx, line in enumerate(file, start=1):
                 line = line.rstrip("\n")
                 try:
@@ -80,17 +508,105 @@ def get_cats_info(path: str) -> tuple[list[dict[str, str]], list[tuple[int, str,
                     # Validate cat data
                     validate_cat_data(cat, result["seen_ids"])
 
-                    # Add valid cat data to the list
-                    result["data"].append({"id": cat[0], "name": cat[1], "age": cat[2]})
+                    # Add valid cat data to the storage
+                    result["seen_ids"].register(cat[0], line_idx)
+                    result["data"].append(cat[0], cat[1], cat[2])
                 except ValueError as exc:
                     result["line_errors"].append((line_idx, line, f"{exc}"))
-    except FileNotFoundError as exc:
-        raise FileNotFoundError(f'The file "{path}" does not exist.') from exc
-    except PermissionError as exc:
-        raise PermissionError(f'You do not have permission to access "{path}" file.') from exc
-    except IsADirectoryError as exc:
-        raise IsADirectoryError(f'Expected a file, but found a "{path}" directory.') from exc
-    except OSError as exc:
-        raise OSError(f"OS error occurred: {exc}") from exc
+                    if CAT_ERROR_MESSAGES[CAT_ERROR_DUPLICATE_ID] in f"{exc}":
+                        report_duplicate_id(line, line_idx, result)
+        else:
+            # Validate the file in chunks of complete lines
+            lines_count = 0
+            for text in iter_text_chunks(file):
+                lines_count += validate_cats_chunk(text, lines_count + 1, result)
 
+    if as_dicts:
+        return result["data"].to_dicts(), result["line_errors"]
     return result["data"], result["line_errors"]
+
+def iter_cat_events(
+        path: str,
+        duplicates: Optional[list] = None,
+        max_ids_in_memory: int = DEFAULT_MAX_IDS_IN_MEMORY
+    ) -> Iterator[tuple[str, int, dict[str, str]]]:
+    """
+    Validates cat data from a file and yields an event for every line, in file order.
+
+    Only one chunk of the file (see `CHUNK_SIZE`) is validated and held in memory at a time.
+
+    Parameters:
+        path (str): Path to the data file.
+        duplicates (list, optional): Container to add duplicate IDs to, see `get_cats_info`.
+        max_ids_in_memory (int): Number of IDs kept in memory for duplicate detection before spilling to disk.
+
+    Yields:
+        tuple: (event type, line index, event data):
+        - ("record", line index, dictionary with keys "id", "name", and "age") for valid lines.
+        - ("error", line index, dictionary with keys "line" and "cause") for invalid lines.
+    """
+    with cats_file_errors(path), SeenIds(max_ids_in_memory) as seen_ids, open(path, encoding="utf-8") as file:
+        # Check if file is empty
+        if path.stat().st_size == 0:
+            raise ValueError(f'The file "{path}" is empty.')
+
+        lines_count = 0
+        for text in iter_text_chunks(file):
+            chunk_result = {
+                "data": CatRecords(),
+                "seen_ids": seen_ids,
+                "line_errors": [],
+                "duplicates": duplicates
+            }
+            chunk_lines_count = validate_cats_chunk(text, lines_count + 1, chunk_result)
+
+            # Every line is either a valid record or an error - put them back in line order
+            records, line_errors = iter(chunk_result["data"]), iter(chunk_result["line_errors"])
+            line_error = next(line_errors, None)
+            for line_idx in range(lines_count + 1, lines_count + chunk_lines_count + 1):
+                if line_error is not None and line_error[0] == line_idx:
+                    yield "error", line_idx, {"line": line_error[1], "cause": line_error[2]}
+                    line_error = next(line_errors, None)
+                else:
+                    yield "record", line_idx, next(records).to_dict()
+
+            lines_count += chunk_lines_count
+
+def iter_cats_info(
+        path: str,
+        batch_size: Optional[int] = None,
+        duplicates: Optional[list] = None,
+        max_ids_in_memory: int = DEFAULT_MAX_IDS_IN_MEMORY
+    ) -> Iterator:
+    """
+    Lazily retrieves and validates cat data from a file, as a stream of events with bounded memory.
+
+    The file is opened when the first event is requested. Events are the same as in `get_cats_info`
+    results: valid records and errors from invalid lines, but in file order, see `iter_cat_events`.
+
+    Parameters:
+        path (str): Path to the data file.
+        batch_size (int, optional): Yield lists of up to this number of events instead of single events
+                                    (at least 1).
+        duplicates (list, optional): Container to add duplicate IDs to, see `get_cats_info`.
+        max_ids_in_memory (int): Number of IDs kept in memory for duplicate detection before spilling to disk.
+
+    Returns:
+        Iterator: Events, or lists of events if `batch_size` is set.
+
+    Raises:
+        ValueError: If `batch_size` is less than 1.
+
+    Example:
+        >>> for event_type, line_idx, event_data in iter_cats_info(path):
+        ...     print(event_type, line_idx, event_data)
+        record 1 {'id': '60b90c1c13067a15887e1ae1', 'name': 'Tayson', 'age': '3'}
+        error 2 {'line': 'abc,Tessi,5', 'cause': 'Invalid or missing ID'}
+    """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError(f"Batch size must be at least 1, got {batch_size}")
+    events = iter_cat_events(path, duplicates, max_ids_in_memory)
+    if batch_size is None:
+        return events
+    # Take batches until an empty one
+    return iter(lambda: list(islice(events, batch_size)), [])
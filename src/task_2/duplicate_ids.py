@@ -0,0 +1,328 @@
+"""
+Detects duplicate cat IDs with bounded memory.
+
+IDs (24 hex characters) are kept as 96-bit integers together with the line number of their
+first occurrence. When the number of IDs exceeds the memory budget, they are sorted and spilled
+to a binary run file on disk, and added to a Bloom filter kept in memory (about 10 bits per ID).
+A new ID is looked up in spilled runs only when the Bloom filter says it may be there,
+so duplicates are still detected exactly, with the line numbers of both occurrences.
+"""
+
+import heapq
+import mmap
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+DEFAULT_MAX_IDS_IN_MEMORY = 1_000_000
+MAX_SPILLED_RUNS = 16  # runs are merged into one when there are more of them
+ID_SIZE = 12  # 96 bits
+LINE_IDX_SIZE = 8
+RUN_RECORD_SIZE = ID_SIZE + LINE_IDX_SIZE
+RUN_WRITE_BATCH = 65_536  # records per write
+BLOOM_BITS_PER_ID = 10
+BLOOM_HASHES_COUNT = 7  # ~1% false positives with 10 bits per ID
+MASK_64 = (1 << 64) - 1
+
+def hash_id(key: int) -> tuple[int, int]:
+    """
+    Mixes a 96-bit ID into two 32-bit hashes for the Bloom filter (IDs are not random - they start with a timestamp).
+
+    Args:
+        key (int): ID as an integer.
+
+    Returns:
+        tuple[int, int]: Two hashes, the second one is odd.
+    """
+    # splitmix64 finalizer over the ID folded into 64 bits
+    x = ((key >> 64) * 0x9E3779B97F4A7C15 ^ key) & MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK_64
+    x ^= x >> 31
+    return x & 0xFFFFFFFF, (x >> 32) | 1
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter of 96-bit IDs.
+
+    Args:
+        capacity (int): Number of IDs the filter is sized for.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.count = 0
+        self.bits_count = max(capacity * BLOOM_BITS_PER_ID, 64)
+        self.bits = bytearray((self.bits_count + 7) // 8)
+
+    def add(self, hashes: tuple[int, int]) -> None:
+        """
+        Adds an ID to the filter.
+
+        Args:
+            hashes (tuple[int, int]): Hashes of the ID, see `hash_id`.
+        """
+        bits, bits_count = self.bits, self.bits_count
+        first, second = hashes
+        for idx in range(BLOOM_HASHES_COUNT):
+            position = (first + idx * second) % bits_count
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def might_contain(self, hashes: tuple[int, int]) -> bool:
+        """
+        Checks if an ID may have been added to the filter (false positives are possible, false negatives are not).
+
+        Args:
+            hashes (tuple[int, int]): Hashes of the ID, see `hash_id`.
+        """
+        bits, bits_count = self.bits, self.bits_count
+        first, second = hashes
+        for idx in range(BLOOM_HASHES_COUNT):
+            position = (first + idx * second) % bits_count
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+class SpilledRun:
+    """
+    Sorted run of (ID, first line number) records on disk, memory mapped for binary search.
+
+    Args:
+        path (Path): Path of the run file.
+        records_count (int): Number of records in the file.
+    """
+
+    def __init__(self, path: Path, records_count: int):
+        self.path = path
+        self.records_count = records_count
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def iter_records(self) -> Iterator[bytes]:
+        """Iterates over raw records in ID order."""
+        run_map = self.map
+        for offset in range(0, self.records_count * RUN_RECORD_SIZE, RUN_RECORD_SIZE):
+            yield run_map[offset:offset + RUN_RECORD_SIZE]
+
+    def find(self, key: int) -> Optional[int]:
+        """
+        Finds the first line number of the ID (binary search).
+
+        Args:
+            key (int): ID as an integer.
+
+        Returns:
+            int, optional: Line number, None if the ID is not in the run.
+        """
+        target = key.to_bytes(ID_SIZE, "big")
+        run_map, low, high = self.map, 0, self.records_count
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * RUN_RECORD_SIZE
+            middle_id = run_map[offset:offset + ID_SIZE]
+            if middle_id < target:
+                low = middle + 1
+            elif middle_id > target:
+                high = middle
+            else:
+                return int.from_bytes(run_map[offset + ID_SIZE:offset + RUN_RECORD_SIZE], "big")
+        return None
+
+    def close(self) -> None:
+        """Unmaps and removes the run file."""
+        self.map.close()
+        self.path.unlink(missing_ok=True)
+
+class SeenIds:
+    """
+    Set of already encountered cat IDs with the line numbers of their first occurrence.
+
+    Supports `in` checks with hex string IDs, so it can be used instead of a set of IDs.
+    IDs are compared as hex numbers (case-insensitively). Use as a context manager
+    or call `close()` to remove spilled runs.
+
+    Example:
+        >>> with SeenIds() as seen_ids:
+        ...     seen_ids.register("60b90c1c13067a15887e1ae1", 1)
+        ...     seen_ids.register("60B90C1C13067A15887E1AE1", 7)
+        1
+
+    Args:
+        max_ids_in_memory (int): Number of IDs kept in memory before spilling them to disk (at least 1).
+        spill_dir (str, optional): Directory for spilled runs (system temporary directory by default).
+
+    Raises:
+        ValueError: If `max_ids_in_memory` is less than 1.
+    """
+
+    def __init__(self, max_ids_in_memory: int = DEFAULT_MAX_IDS_IN_MEMORY, spill_dir: Optional[str] = None):
+        if max_ids_in_memory < 1:
+            raise ValueError(f"Number of IDs kept in memory must be at least 1, got {max_ids_in_memory}")
+        self.max_ids_in_memory = max_ids_in_memory
+        self.spill_dir = spill_dir
+        self._first_lines: dict[int, int] = {}
+        self._spilled_runs: list[SpilledRun] = []
+        # Bloom filters of all spilled IDs - a new, twice larger, filter is added when the last one is full
+        self._blooms: list[BloomFilter] = []
+
+    def __enter__(self) -> "SeenIds":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __contains__(self, cat_id: str) -> bool:
+        return self.first_line(cat_id) is not None
+
+    def _find_spilled(self, key: int) -> Optional[int]:
+        """Finds the first line number of the ID in spilled runs."""
+        hashes = hash_id(key)
+        if not any(bloom.might_contain(hashes) for bloom in self._blooms):
+            return None
+        for run in self._spilled_runs:
+            first_line_idx = run.find(key)
+            if first_line_idx is not None:
+                return first_line_idx
+        return None
+
+    def _find(self, key: int) -> Optional[int]:
+        """Finds the first line number of the ID in memory or in spilled runs."""
+        first_line_idx = self._first_lines.get(key)
+        if first_line_idx is None and self._blooms:
+            first_line_idx = self._find_spilled(key)
+        return first_line_idx
+
+    def first_line(self, cat_id: str) -> Optional[int]:
+        """
+        Finds the line number of the first occurrence of the ID.
+
+        Args:
+            cat_id (str): Cat ID (24 hex characters).
+
+        Returns:
+            int, optional: Line number, None if the ID was not registered.
+        """
+        return self._find(int(cat_id, 16))
+
+    def first_line_by_key(self, key: int) -> Optional[int]:
+        """
+        Finds the line number of the first occurrence of the ID given as an integer, see `first_line`.
+        """
+        return self._find(key)
+
+    def register(self, cat_id: str, line_idx: int) -> Optional[int]:
+        """
+        Registers an ID, unless it was already registered.
+
+        Args:
+            cat_id (str): Cat ID (24 hex characters).
+            line_idx (int): Line number of the ID.
+
+        Returns:
+            int, optional: Line number of the first occurrence if the ID is a duplicate, None otherwise.
+        """
+        key = int(cat_id, 16)
+        first_lines = self._first_lines
+        first_line_idx = first_lines.setdefault(key, line_idx)
+        if first_line_idx != line_idx:
+            return first_line_idx
+
+        # New in memory - it still may be a duplicate of a spilled ID
+        if self._blooms:
+            first_line_idx = self._find_spilled(key)
+            if first_line_idx is not None:
+                del first_lines[key]
+                return first_line_idx
+
+        if len(first_lines) >= self.max_ids_in_memory:
+            self._spill()
+        return None
+
+    def register_keys(self, keys: Iterable[int], line_idxs: Iterable[int]) -> dict[int, int]:
+        """
+        Registers many distinct IDs at once (given as integers), unless they were already registered.
+
+        Faster than registering IDs one by one, but the number of IDs in memory may exceed
+        `max_ids_in_memory` by the number of the IDs registered at once before they are spilled.
+
+        Args:
+            keys (Iterable[int]): Distinct IDs as integers.
+            line_idxs (Iterable[int]): Line numbers of the IDs.
+
+        Returns:
+            dict[int, int]: Line numbers of the first occurrence of duplicate IDs, by ID.
+        """
+        new_lines = dict(zip(keys, line_idxs))
+        first_lines = self._first_lines
+        registered = {key: first_lines[key] for key in new_lines.keys() & first_lines.keys()}
+        if self._blooms:
+            for key in new_lines:
+                if key not in registered:
+                    first_line_idx = self._find_spilled(key)
+                    if first_line_idx is not None:
+                        registered[key] = first_line_idx
+
+        for key in registered:
+            del new_lines[key]
+        first_lines.update(new_lines)
+        if len(first_lines) >= self.max_ids_in_memory:
+            self._spill()
+        return registered
+
+    def _spill(self) -> None:
+        """Writes in-memory IDs to a sorted run on disk, adds them to Bloom filters and clears them."""
+        if not self._first_lines:
+            return
+        bloom = self._blooms[-1] if self._blooms else None
+        if bloom is None or bloom.count + len(self._first_lines) > bloom.capacity:
+            bloom = BloomFilter(max(2 * bloom.capacity if bloom else 0, len(self._first_lines)))
+            self._blooms.append(bloom)
+        for key in self._first_lines:
+            bloom.add(hash_id(key))
+
+        records = (
+            key.to_bytes(ID_SIZE, "big") + line_idx.to_bytes(LINE_IDX_SIZE, "big")
+            for key, line_idx in sorted(self._first_lines.items())
+        )
+        self._spilled_runs.append(self._write_run(records, len(self._first_lines)))
+        self._first_lines.clear()
+
+        if len(self._spilled_runs) >= MAX_SPILLED_RUNS:
+            # Merge all runs into a single one (IDs are unique across runs)
+            runs = self._spilled_runs
+            merged_run = self._write_run(
+                heapq.merge(*(run.iter_records() for run in runs)),
+                sum(run.records_count for run in runs)
+            )
+            for run in runs:
+                run.close()
+            self._spilled_runs = [merged_run]
+
+    def _write_run(self, records: Iterator[bytes], records_count: int) -> SpilledRun:
+        """Writes raw records sorted by ID to a new run file."""
+        file_descriptor, run_path = tempfile.mkstemp(prefix="cat_ids_", suffix=".run", dir=self.spill_dir)
+        try:
+            with open(file_descriptor, "wb") as file:
+                batch = []
+                for record in records:
+                    batch.append(record)
+                    if len(batch) >= RUN_WRITE_BATCH:
+                        file.write(b"".join(batch))
+                        batch.clear()
+                file.write(b"".join(batch))
+            return SpilledRun(Path(run_path), records_count)
+        except BaseException:
+            # Not added to the runs, so `close()` would not remove it
+            Path(run_path).unlink(missing_ok=True)
+            raise
+
+    def close(self) -> None:
+        """
+        Removes spilled runs.
+        """
+        for run in self._spilled_runs:
+            run.close()
+        self._spilled_runs = []
+        self._blooms = []
+        self._first_lines.clear()
@@ -3,13 +3,130 @@ This script processes cat data from a file.
 
 Reads the file with data about the cats, validates each line (expects id, name, age),
 prints valid records, and logs all validation errors to log file.
+
+Command-line arguments:
+    --ndjson (flag): Optional. Streams valid records to stdout as they are read, one JSON object per line
+                     (NDJSON), instead of printing the whole list at the end. Other messages go to stderr.
+    --batch-size N (option): Optional. Number of lines per batch in the --ndjson mode,
+                             records of a batch are written at once (default: 1000).
+    --workers N (option): Optional. Number of processes to validate large files with (default: 1).
+                          Not used in the --ndjson mode.
+    --find-id ID (option): Optional. Prints the valid record with the ID using the persistent index
+                           of the data file (built or refreshed if needed) instead of validating the file.
+    --find-age MIN [MAX] (option): Optional. Prints valid records with ages in the range using the index.
 """
 
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
 from pathlib import Path
+from typing import Optional, TextIO
 
-from cats_inventory import get_cats_info
+from cats_index import CatsIndex
+from cats_inventory import get_cats_info, iter_cats_info, DEFAULT_BATCH_SIZE
 from utils.logging_handler import init_logging, print_and_log
-from utils.error_handler import report_content_errors
+from utils.error_handler import ContentErrorSink
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments of the script.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Validate cat data from a dataset file.")
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="stream valid records to stdout as NDJSON while the file is read"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        metavar="N",
+        default=DEFAULT_BATCH_SIZE,
+        help=f"lines per written batch in the --ndjson mode (default: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        default=1,
+        help="number of processes to validate large files with (default: 1)"
+    )
+    parser.add_argument(
+        "--find-id",
+        metavar="ID",
+        help="print the valid record with the ID using the persistent index of the data file"
+    )
+    parser.add_argument(
+        "--find-age",
+        type=int,
+        nargs="+",
+        metavar="AGE",
+        help="print valid records with ages from MIN to MAX (or equal to MIN) using the index"
+    )
+    args = parser.parse_args()
+    if args.find_age is not None and len(args.find_age) > 2:
+        parser.error("--find-age expects MIN and optional MAX ages")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    return args
+
+def stream_cats_info(
+        path: Path,
+        output: TextIO,
+        content_err: ContentErrorSink,
+        duplicates: list,
+        batch_size: int
+    ) -> int:
+    """
+    Writes valid cat records as NDJSON while the file is read, and passes errors to the error sink.
+
+    Args:
+        path (Path): Path to the data file.
+        output (TextIO): Stream to write records to.
+        content_err (ContentErrorSink): Sink of errors from invalid lines.
+        duplicates (list): Container to add duplicate IDs to, see `get_cats_info`.
+        batch_size (int): Number of lines per batch (at least 1) - records of a batch are written at once.
+
+    Returns:
+        int: Number of valid records written.
+    """
+    records_count = 0
+
+    for batch in iter_cats_info(path, batch_size=batch_size, duplicates=duplicates):
+        records = []
+        for event_type, line_idx, event_data in batch:
+            if event_type == "record":
+                records.append(json.dumps(event_data, ensure_ascii=False) + "\n")
+            else:
+                content_err.append((line_idx, event_data["line"], event_data["cause"]))
+        output.write("".join(records))
+        output.flush()
+        records_count += len(records)
+
+    return records_count
+
+def query_cats_index(path: Path, cat_id: Optional[str], ages: Optional[list[int]]) -> None:
+    """
+    Prints valid records found with the persistent index of the data file.
+
+    Args:
+        path (Path): Path to the data file.
+        cat_id (str, optional): ID of the record to find.
+        ages (list[int], optional): Minimal and optional maximal age of records to find.
+    """
+    with CatsIndex(path) as cats_index:
+        if cat_id is not None:
+            cat = cats_index.find(cat_id)
+            if cat is None:
+                print_and_log(f"No valid record with ID {cat_id} found.", level="WARNING")
+            else:
+                print(cat)
+        if ages is not None:
+            print(cats_index.find_by_age(*ages))
 
 def main():
     """
@@ -18,6 +135,8 @@ def main():
     This function processes the cat data file, validates the records (expects id, name, and age),
     prints valid records, and logs any validation errors.
     """
+    args = parse_args()
+
     data_file_rel_path = "dataset/cats_file.txt"
     log_file_rel_path = "task_2.log"
 
@@ -26,28 +145,65 @@ def main():
     # Initialize the environment (e.g., logging)
     init_logging(current_folder_path / log_file_rel_path)
 
-    try:
-        # Retrieve cats data with potential content lines issues
-        cats_info, content_err = get_cats_info(current_folder_path / data_file_rel_path)
+    # Content lines issues are logged as soon as they are found and summarized at the end
+    content_err = ContentErrorSink(log_file_rel_path, samples_per_cause=3)
 
-        # Report potential file content lines issues
-        if content_err:
-            report_content_errors(content_err, log_file_rel_path)
+    duplicate_ids = []
 
-        if cats_info:
-            # Display results
-            print(cats_info)
-        else:
-            # Handle case and warn user when all file lines have issues
-            if content_err:
+    # In the NDJSON mode stdout carries records only, all messages go to stderr
+    output = sys.stdout
+    with redirect_stdout(sys.stderr if args.ndjson else sys.stdout):
+        try:
+            if args.find_id is not None or args.find_age is not None:
+                # Answer queries from the index without validating the whole file
+                query_cats_index(current_folder_path / data_file_rel_path, args.find_id, args.find_age)
+                return
+
+            if args.ndjson:
+                # Stream valid records with potential content lines issues
+                records_count = stream_cats_info(
+                    current_folder_path / data_file_rel_path,
+                    output,
+                    content_err,
+                    duplicate_ids,
+                    args.batch_size
+                )
+                cats_info = None
+            else:
+                # Retrieve cats data with potential content lines issues
+                cats_info, _ = get_cats_info(
+                    current_folder_path / data_file_rel_path,
+                    line_errors=content_err,
+                    as_dicts=True,
+                    duplicates=duplicate_ids,
+                    workers=args.workers
+                )
+                records_count = len(cats_info)
+
+            # Summarize potential file content lines issues
+            content_err.report_summary()
+            for cat_id, first_line_idx, line_idx in duplicate_ids:
                 print_and_log(
-                    f'After processing "{data_file_rel_path}" file, no valid data found in the file".',
-                    level="WARNING"
+                    f"Duplicate ID {cat_id} on line {line_idx}, first seen on line {first_line_idx}",
+                    level="INFO",
+                    print_to_console=False
                 )
-    except (FileNotFoundError, PermissionError, IsADirectoryError, OSError, ValueError) as exc:
-        print_and_log(str(exc), level="ERROR")
-    except Exception as exc:
-        print_and_log(f"An unexpected error occurred: {exc}", level="ERROR")
+
+            if records_count:
+                # Display results (already streamed in the NDJSON mode)
+                if cats_info is not None:
+                    print(cats_info)
+            else:
+                # Handle case and warn user when all file lines have issues
+                if content_err:
+                    print_and_log(
+                        f'After processing "{data_file_rel_path}" file, no valid data found in the file".',
+                        level="WARNING"
+                    )
+        except (FileNotFoundError, PermissionError, IsADirectoryError, OSError, ValueError) as exc:
+            print_and_log(str(exc), level="ERROR")
+        except Exception as exc:
+            print_and_log(f"An unexpected error occurred: {exc}", level="ERROR")
 
 if __name__ == "__main__":
     main()
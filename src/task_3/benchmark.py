@@ -0,0 +1,240 @@
+"""
+This script benchmarks directory traversal on a synthetic directory tree.
+
+It generates a temporary tree with the given number of entries (every directory holds a few
+subdirectories and a number of empty files), then builds and prints it with the previous
+`Path.iterdir()` based recursive traversal and with the current `os.scandir` based one,
+builds it again with a directory snapshot (the first run and a run reusing the snapshot),
+builds it as nested dictionaries and as a compact node table (time and retained memory),
+builds the node table with sizes and totals in the same walk, exports it as NDJSON and nested JSON,
+displays the built tree with a `print()` per entry and with buffered rendering,
+finds duplicates in a separate tree of files with content by hashing every file and by size, then hash,
+and prints the elapsed time and speedup. The printed structure is discarded.
+
+Usage:
+    python src/task_3/benchmark.py [entries_count]
+"""
+
+import contextlib
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from dir_duplicates import find_duplicates
+from dir_scanner import walk_dir
+from dir_snapshot import DirSnapshot
+from tree_export import export_json, export_ndjson
+from dir_visualizer import (
+    DirectoryTree,
+    INDENT_PER_LEVEL,
+    build_dir_table,
+    build_dir_usage,
+    build_dir_tree,
+    display_tree,
+    visualize_dir_structure,
+)
+
+DEFAULT_ENTRIES_COUNT = 1_000_000
+DIRS_PER_DIR = 10
+FILES_PER_DIR = 90
+SETTLED_AGE_NS = 60 * 1_000_000_000
+CONTENT_FILES_COUNT = 400
+CONTENT_FILE_SIZE = 256 * 1024
+
+def generate_dir_tree(path: Path, entries_count: int) -> None:
+    """
+    Creates a synthetic directory tree, breadth-first.
+
+    Args:
+        path (Path): Root directory (must exist).
+        entries_count (int): Number of entries (files and directories) to create.
+    """
+    dirs_to_fill = [str(path)]
+    created = 0
+    for dir_path in dirs_to_fill:
+        for idx in range(DIRS_PER_DIR):
+            if created >= entries_count:
+                break
+            subdir_path = os.path.join(dir_path, f"Dir {idx}")
+            os.mkdir(subdir_path)
+            dirs_to_fill.append(subdir_path)
+            created += 1
+        for idx in range(FILES_PER_DIR):
+            if created >= entries_count:
+                break
+            with open(os.path.join(dir_path, f"file_{idx}.txt"), "wb"):
+                created += 1
+
+    # Backdate directories, so a snapshot doesn't treat them as just modified
+    settled_ns = time.time_ns() - SETTLED_AGE_NS
+    for dir_path in dirs_to_fill:
+        os.utime(dir_path, ns=(settled_ns, settled_ns))
+
+def generate_content_files(path: Path, files_count: int) -> None:
+    """
+    Creates files with content in a single directory: a quarter of them are copies of other files,
+    a quarter share the size of other files and the rest have sizes of their own.
+
+    Args:
+        path (Path): Directory (must exist).
+        files_count (int): Number of files to create.
+    """
+    content = os.urandom(CONTENT_FILE_SIZE)
+    for idx in range(files_count):
+        kind = idx % 4
+        if kind == 0:
+            data = content  # copies of the same file
+        elif kind == 1:
+            data = content[:-1] + bytes([idx % 256])  # same size, different end
+        else:
+            data = content[:CONTENT_FILE_SIZE - idx]  # unique size
+        (path / f"file_{idx}.bin").write_bytes(data)
+
+def find_duplicates_full_hash(path: Path) -> list[list[str]]:
+    """
+    Naive duplicate search - every file is hashed completely, for comparison.
+    """
+    paths_by_digest: dict[bytes, list[str]] = {}
+    for _, entry in walk_dir(path):
+        if not entry.is_dir:
+            content_hash = hashlib.blake2b()
+            with open(entry.path, "rb") as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                    content_hash.update(chunk)
+            digest = content_hash.digest()
+            paths_by_digest.setdefault(digest, []).append(entry.path)
+    return sorted(sorted(paths) for paths in paths_by_digest.values() if len(paths) > 1)
+
+def build_dir_tree_iterdir(path: Path) -> DirectoryTree:
+    """
+    Previous implementation of `build_dir_tree` (recursion with `Path.iterdir()` and `Path.is_dir()`), for comparison.
+    """
+    def _build(current_path: Path) -> DirectoryTree:
+        tree: DirectoryTree = {}
+        for entry in sorted(current_path.iterdir(), key=lambda x: x.name.lower()):
+            tree[entry.name] = _build(entry) if entry.is_dir() else None
+        return tree
+
+    return {path.name: _build(path)}
+
+def visualize_dir_structure_iterdir(path: Path, depth: int = 0):
+    """
+    Previous implementation of `visualize_dir_structure` (without colors), for comparison.
+    """
+    if depth == 0:
+        print(f"{path.name}/")
+    for entry in sorted(path.iterdir(), key=lambda x: x.name.lower()):
+        indentation = INDENT_PER_LEVEL * (depth + 1)
+        if entry.is_dir():
+            print(f"{indentation}{entry.name}/")
+            visualize_dir_structure_iterdir(entry, depth + 1)
+        else:
+            print(f"{indentation}{entry.name}")
+
+def display_tree_print(tree: DirectoryTree, level: int = 0):
+    """
+    Previous implementation of `display_tree` (recursion with a `print()` per entry, without colors), for comparison.
+    """
+    for name, subtree in tree.items():
+        indent = INDENT_PER_LEVEL * level
+        if subtree is None:
+            print(f"{indent}{name}")
+        else:
+            print(f"{indent}{name}/")
+            display_tree_print(subtree, level + 1)
+
+def build_dir_tree_snapshot(path: Path, snapshot_path: Path, rescan: bool = False) -> DirectoryTree:
+    """
+    Loads the snapshot, builds the tree with it and saves the snapshot.
+    """
+    snapshot = DirSnapshot(snapshot_path, rescan=rescan)
+    tree = build_dir_tree(path, snapshot=snapshot)
+    snapshot.save()
+    return tree
+
+def measure(label: str, func, *args, **kwargs):
+    """
+    Runs the function once with stdout discarded, prints the elapsed time and returns it with the function result.
+    """
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    print(f"{label.ljust(30)} {elapsed:8.3f} s")
+    return elapsed, result
+
+def measure_memory(label: str, func, *args, **kwargs) -> int:
+    """
+    Runs the function once with stdout discarded, prints and returns the memory retained by its result.
+    """
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        tracemalloc.start()
+        try:
+            result = func(*args, **kwargs)
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    del result
+    print(f"{label.ljust(30)} {retained / 1024 / 1024:8.1f} MiB")
+    return retained
+
+def main():
+    """
+    Main entry point of the script.
+    """
+    entries_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES_COUNT
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root_path = Path(tmp_dir) / "tree"
+        root_path.mkdir()
+        generate_dir_tree(root_path, entries_count)
+        print(f"Dataset: {entries_count} entries")
+
+        baseline_time, baseline = measure("build, iterdir recursion", build_dir_tree_iterdir, root_path)
+        scandir_time, scandir = measure("build, scandir stack", build_dir_tree, root_path)
+        assert scandir == baseline, "Traversal engines returned different trees"
+        print(f"Speedup: x{baseline_time / scandir_time:.1f}")
+
+        snapshot_path = Path(tmp_dir) / "tree.snapshot"
+        measure("build, snapshot full scan", build_dir_tree_snapshot, root_path, snapshot_path, rescan=True)
+        snapshot_time, snapshot_tree = measure("build, snapshot reused", build_dir_tree_snapshot, root_path, snapshot_path)
+        assert snapshot_tree == baseline, "Snapshot gave a different tree"
+        print(f"Speedup: x{scandir_time / snapshot_time:.1f} (snapshot {snapshot_path.stat().st_size} bytes)")
+
+        dict_time, _ = measure("build, nested dict", build_dir_tree, root_path)
+        table_time, table = measure("build, node table", build_dir_table, root_path)
+        assert table.to_dict() == baseline, "Node table gave a different tree"
+        print(f"Speedup: x{dict_time / table_time:.1f}")
+        dict_memory = measure_memory("memory, nested dict", build_dir_tree, root_path)
+        table_memory = measure_memory("memory, node table", build_dir_table, root_path)
+        print(f"Memory saved: x{dict_memory / table_memory:.1f}")
+        usage_time, usage = measure("build, node table with sizes", build_dir_usage, root_path)
+        assert usage.table.to_dict() == baseline, "Node table with sizes gave a different tree"
+        print(f"Sizes overhead: x{usage_time / table_time:.1f}")
+        # Output stream is looked up while stdout is redirected
+        measure("export, ndjson", lambda path: export_ndjson(path, sys.stdout), root_path)
+        measure("export, nested json", lambda path: export_json(path, sys.stdout), root_path)
+
+        content_path = Path(tmp_dir) / "content"
+        content_path.mkdir()
+        generate_content_files(content_path, CONTENT_FILES_COUNT)
+        print(f"Dataset: {CONTENT_FILES_COUNT} files of up to {CONTENT_FILE_SIZE // 1024} KiB")
+        baseline_time, baseline_groups = measure("duplicates, hash every file", find_duplicates_full_hash, content_path)
+        staged_time, groups = measure("duplicates, size then hash", find_duplicates, content_path)
+        assert [group.paths for group in groups] == baseline_groups, "Duplicate searches gave different groups"
+        print(f"Speedup: x{baseline_time / staged_time:.1f}")
+
+        baseline_time, _ = measure("display, print per entry", display_tree_print, scandir)
+        buffered_time, _ = measure("display, buffered chunks", display_tree, scandir)
+        print(f"Speedup: x{baseline_time / buffered_time:.1f}")
+
+        baseline_time, _ = measure("print, iterdir recursion", visualize_dir_structure_iterdir, root_path)
+        scandir_time, _ = measure("print, scandir stack", visualize_dir_structure, root_path)
+        print(f"Speedup: x{baseline_time / scandir_time:.1f}")
+
+if __name__ == "__main__":
+    main()
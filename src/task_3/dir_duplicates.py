@@ -0,0 +1,198 @@
+"""
+Duplicate files in a directory tree, found by size, then by partial hash, then by full hash.
+
+Files are read as little as possible:
+
+- Sizes are taken during the walk (see `dir_scanner.walk_dir`), files with a unique size
+  can't have duplicates and are never opened.
+- Files sharing a size are checked once (hard links of the same file are counted once)
+  and hashed by their first and last blocks. Files that differ there are not read further.
+  Files not larger than these two blocks are hashed completely at this stage.
+- Only files with the same size and partial hash are hashed completely, through a memory map.
+
+Files are checked and hashed on a thread pool (`hashlib` releases the GIL while hashing,
+so reads and hashing of many files overlap). Empty files and symbolic links are not checked.
+"""
+
+import hashlib
+import mmap
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, NamedTuple, Optional, TypeVar
+
+from dir_filter import ScanFilter
+from dir_scanner import ListDirFunc, list_dir, report_scan_error, walk_dir
+
+PARTIAL_BLOCK_SIZE = 64 * 1024  # bytes hashed from the start and from the end of a file
+READ_CHUNK_SIZE = 1024 * 1024  # chunk size of files that can't be memory-mapped
+
+Key = TypeVar("Key")
+
+class DuplicateGroup(NamedTuple):
+    """
+    Files with the same content.
+
+    Attributes:
+        size (int): Size of every file in bytes.
+        paths (list[str]): Paths of the files, sorted.
+    """
+    size: int
+    paths: list[str]
+
+    @property
+    def reclaimable(self) -> int:
+        """Number of bytes freed by keeping a single file of the group."""
+        return self.size * (len(self.paths) - 1)
+
+def partial_digest(path: str, size: int) -> tuple[tuple[int, int], bytes]:
+    """
+    Checks a file and hashes its first and last blocks (the whole file if it is not larger).
+
+    Args:
+        path (str): File path.
+        size (int): File size found during the walk.
+
+    Returns:
+        tuple[tuple[int, int], bytes]: Device and inode of the file, and the digest.
+
+    Raises:
+        OSError: The file can't be read, is not a regular file or changed since the walk.
+    """
+    with open(path, "rb") as file:
+        file_stat = os.fstat(file.fileno())
+        if not stat.S_ISREG(file_stat.st_mode):
+            raise OSError("Not a regular file")
+        if file_stat.st_size != size:
+            raise OSError("Changed during the scan")
+
+        content_hash = hashlib.blake2b()
+        content_hash.update(file.read(PARTIAL_BLOCK_SIZE))
+        if size > PARTIAL_BLOCK_SIZE:
+            file.seek(max(size - PARTIAL_BLOCK_SIZE, PARTIAL_BLOCK_SIZE))
+            content_hash.update(file.read(PARTIAL_BLOCK_SIZE))
+    return (file_stat.st_dev, file_stat.st_ino), content_hash.digest()
+
+def full_digest(path: str, size: int) -> bytes:
+    """
+    Hashes the whole content of a file through a memory map (or in chunks if it can't be mapped).
+
+    Args:
+        path (str): File path.
+        size (int): File size found during the walk.
+
+    Returns:
+        bytes: The digest.
+
+    Raises:
+        OSError: The file can't be read or changed since the walk.
+    """
+    content_hash = hashlib.blake2b()
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size != size:
+            raise OSError("Changed during the scan")
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, OverflowError):
+            # Not mappable (some file systems) or larger than the address space
+            for chunk in iter(lambda: file.read(READ_CHUNK_SIZE), b""):
+                content_hash.update(chunk)
+            return content_hash.digest()
+
+        with mapped:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            content_hash.update(mapped)
+    return content_hash.digest()
+
+def group_files(
+        files: list[tuple[str, int]],
+        digest_func: Callable[[str, int], Key],
+        pool: Optional[ThreadPoolExecutor],
+        errors: Optional[list] = None
+    ) -> dict[tuple[int, Key], list[tuple[str, int]]]:
+    """
+    Groups files by size and the value of the function for each file, computed on the pool.
+    Files the function fails for are reported and left out.
+
+    Args:
+        files (list[tuple[str, int]]): Paths and sizes of the files.
+        digest_func (Callable[[str, int], Key]): Function of a path and a size.
+        pool (ThreadPoolExecutor, optional): Pool to call the function on (called in this thread without it).
+        errors (list, optional): Container to add (path, message) errors to.
+
+    Returns:
+        dict: Paths and sizes of the files per (size, value).
+    """
+    def call(file: tuple[str, int]) -> tuple[Optional[Key], Optional[str]]:
+        try:
+            return digest_func(*file), None
+        except OSError as exc:
+            return None, exc.strerror or str(exc)
+
+    results = pool.map(call, files) if pool is not None else map(call, files)
+    groups: dict[tuple[int, Key], list[tuple[str, int]]] = {}
+    for (path, size), (value, error) in zip(files, results):
+        if error is not None:
+            report_scan_error(path, error, errors)
+        else:
+            groups.setdefault((size, value), []).append((path, size))
+    return groups
+
+def collisions(groups: Iterable[list[tuple[str, int]]]) -> list[tuple[str, int]]:
+    """
+    Returns files of the groups holding more than one file.
+    """
+    return [file for group in groups if len(group) > 1 for file in group]
+
+def find_duplicates(
+        path,
+        errors: Optional[list] = None,
+        workers: int = 1,
+        scan_filter: Optional[ScanFilter] = None,
+        list_dir_func: ListDirFunc = list_dir
+    ) -> list[DuplicateGroup]:
+    """
+    Finds groups of files with the same content in a directory tree.
+
+    Args:
+        path: Root directory path.
+        errors (list, optional): Container to add (path, message) errors of unreadable
+                                 directories and files to.
+        workers (int): Number of threads listing directories and hashing files concurrently.
+        scan_filter (ScanFilter, optional): Exclude patterns, `.gitignore` filtering and depth limit.
+        list_dir_func (ListDirFunc): Function listing a directory (see `dir_scanner.walk_dir`).
+
+    Returns:
+        list[DuplicateGroup]: Groups of duplicates, the most reclaimable bytes first.
+    """
+    paths_by_size: dict[int, list[str]] = {}
+    for _, entry in walk_dir(path, errors, workers, scan_filter, list_dir_func, with_stats=True):
+        if not entry.is_dir and not entry.is_symlink and entry.size > 0:
+            paths_by_size.setdefault(entry.size, []).append(entry.path)
+    candidates = [
+        (file_path, size) for size, paths in paths_by_size.items() if len(paths) > 1 for file_path in paths
+    ]
+
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        # Hard links of the same file (and files seen again through linked directories) are kept once
+        partial_groups: dict[tuple[int, bytes], list[tuple[str, int]]] = {}
+        for (size, (_, digest)), files in group_files(candidates, partial_digest, pool, errors).items():
+            partial_groups.setdefault((size, digest), []).append(files[0])
+
+        # Files not larger than the hashed blocks are already hashed completely
+        fully_hashed = [group for (size, _), group in partial_groups.items() if size <= 2 * PARTIAL_BLOCK_SIZE]
+        to_hash = collisions(group for (size, _), group in partial_groups.items() if size > 2 * PARTIAL_BLOCK_SIZE)
+        full_groups = group_files(to_hash, full_digest, pool, errors).values()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    duplicates = [
+        DuplicateGroup(group[0][1], sorted(file_path for file_path, _ in group))
+        for group in (*fully_hashed, *full_groups)
+        if len(group) > 1
+    ]
+    duplicates.sort(key=lambda group: (-group.reclaimable, group.paths[0]))
+    return duplicates
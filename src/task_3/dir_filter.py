@@ -0,0 +1,301 @@
+"""
+Filtering of directory entries during traversal.
+
+Entries can be excluded by glob patterns (`--exclude`), by `.gitignore` files found in the walked
+tree, and the depth of the walk can be limited. Filtering is applied to every directory listing
+right after it is read, so excluded directories and directories below the depth limit are never
+listed at all (also not ahead of the walk by `dir_scanner.ConcurrentDirLister`).
+
+Patterns are compiled once into a few regular expressions: all exclude patterns into one,
+and every `.gitignore` file into one expression per run of patterns with the same sign
+(`!` re-includes), so an entry is checked with a couple of regex matches instead of a loop
+over the patterns.
+"""
+
+import os
+import re
+from fnmatch import translate
+from typing import Iterable, Optional, Pattern
+
+GITIGNORE_NAME = ".gitignore"
+GIT_DIR_NAME = ".git"  # never shown with .gitignore filtering, as in git itself
+
+def compile_globs(patterns: Iterable[str]) -> Optional[Pattern]:
+    """
+    Compiles glob patterns (`fnmatch` syntax) into a single regular expression matching any of them.
+
+    Returns:
+        Pattern: Compiled expression (use `match`), None if there are no patterns.
+    """
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile("|".join(translate(pattern) for pattern in patterns))
+
+def translate_gitignore_pattern(pattern: str) -> str:
+    """
+    Translates a `.gitignore` pattern (without `!` and trailing slash) into a regular expression.
+
+    The expression matches paths relative to the directory of the `.gitignore` file. Patterns
+    without a slash match names at any level, other patterns are anchored to the directory.
+    `*` and `?` don't match slashes, `**` matches across directories.
+    """
+    anchored = "/" in pattern
+    if pattern.startswith("/"):
+        pattern = pattern[1:]
+
+    parts = []
+    index = 0
+    if pattern.startswith("**/"):
+        parts.append("(?:.*/)?")
+        index = 3
+    elif not anchored:
+        parts.append("(?:.*/)?")
+
+    pattern_size = len(pattern)
+    while index < pattern_size:
+        char = pattern[index]
+        if pattern.startswith("/**/", index):
+            parts.append("/(?:.*/)?")
+            index += 4
+        elif pattern.startswith("/**", index) and index + 3 == pattern_size:
+            parts.append("/.+")
+            index += 3
+        elif pattern == "**":
+            parts.append(".*")
+            index += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            index += 1
+        elif char == "?":
+            parts.append("[^/]")
+            index += 1
+        elif char == "[":
+            end = index + 1
+            if end < pattern_size and pattern[end] in "!^":
+                end += 1
+            if end < pattern_size and pattern[end] == "]":
+                end += 1
+            end = pattern.find("]", end)
+            if end == -1:
+                parts.append(re.escape(char))
+                index += 1
+            else:
+                chars = pattern[index + 1:end].replace("\\", "\\\\")
+                if chars[0] in "!^":
+                    chars = "^" + chars[1:]
+                parts.append(f"[{chars}]")
+                index = end + 1
+        elif char == "\\" and index + 1 < pattern_size:
+            parts.append(re.escape(pattern[index + 1]))
+            index += 2
+        else:
+            parts.append(re.escape(char))
+            index += 1
+    return "".join(parts)
+
+class IgnoreRules:
+    """
+    Compiled patterns of a single `.gitignore` file.
+
+    Consecutive patterns of the same sign are joined into one expression (separately for
+    patterns matching directories only), runs are checked from the last one, as the last
+    matching pattern decides.
+
+    Args:
+        base (str): Path of the `.gitignore` directory relative to the walked root ("" or ending with "/").
+        lines (Iterable[str]): Lines of the `.gitignore` file.
+    """
+
+    __slots__ = ("base", "runs")
+
+    def __init__(self, base: str, lines: Iterable[str]):
+        self.base = base
+        # Sign, patterns for any entries and patterns for directories only, per run of the same sign
+        runs: list[tuple[bool, list[str], list[str]]] = []
+        for line in lines:
+            pattern = line.rstrip("\r\n")
+            while pattern.endswith(" ") and not pattern.endswith("\\ "):
+                pattern = pattern[:-1]
+            if not pattern or pattern.startswith("#"):
+                continue
+
+            negated = pattern.startswith("!")
+            if negated:
+                pattern = pattern[1:]
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            if not pattern:
+                continue
+
+            if not runs or runs[-1][0] != negated:
+                runs.append((negated, [], []))
+            runs[-1][2 if dir_only else 1].append(translate_gitignore_pattern(pattern))
+
+        self.runs = [
+            (negated, self._compile(any_patterns), self._compile(dir_patterns))
+            for negated, any_patterns, dir_patterns in reversed(runs)
+        ]
+
+    def __bool__(self) -> bool:
+        return bool(self.runs)
+
+    @staticmethod
+    def _compile(patterns: list[str]) -> Optional[Pattern]:
+        """Joins translated patterns into one expression matching whole paths."""
+        if not patterns:
+            return None
+        return re.compile("(?:" + "|".join(patterns) + r")\Z", re.DOTALL)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Checks a path against the rules.
+
+        Args:
+            rel_path (str): Entry path relative to the `.gitignore` directory.
+            is_dir (bool): The entry is a directory.
+
+        Returns:
+            bool: True if the entry is ignored, False if it is re-included (`!`), None if no pattern matches.
+        """
+        for negated, any_regex, dir_regex in self.runs:
+            if (any_regex is not None and any_regex.match(rel_path)) or \
+                    (is_dir and dir_regex is not None and dir_regex.match(rel_path)):
+                return not negated
+        return None
+
+class ScanFilter:
+    """
+    Filtering options of a directory walk.
+
+    Args:
+        excludes (Iterable[str]): Glob patterns of entries to exclude. Patterns without a slash match
+                                  entry names, others match paths relative to the walked root
+                                  (leading and trailing slashes are ignored).
+        gitignore (bool): Exclude entries ignored by `.gitignore` files of the walked tree
+                          (and `.git` directories).
+        max_depth (int, optional): Maximal depth of shown entries (1 for the content of the root only),
+                                   directories at that depth are not listed.
+    """
+
+    def __init__(self, excludes: Iterable[str] = (), gitignore: bool = False, max_depth: Optional[int] = None):
+        if max_depth is not None and max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        excludes = [pattern.strip("/") for pattern in excludes]
+        self.name_regex = compile_globs(pattern for pattern in excludes if "/" not in pattern)
+        self.path_regex = compile_globs(pattern for pattern in excludes if "/" in pattern)
+        self.gitignore = gitignore
+        self.max_depth = max_depth
+
+    @property
+    def filters_entries(self) -> bool:
+        """The filter excludes entries by patterns (regardless of `.gitignore` rules found so far)."""
+        return self.name_regex is not None or self.path_regex is not None or self.gitignore
+
+    def root_scope(self) -> "DirScope":
+        """
+        Returns the scope of the walked root directory.
+        """
+        return DirScope(self, 0, "", ())
+
+    def is_excluded(self, name: str, rel_path: str, is_dir: bool) -> bool:
+        """
+        Checks an entry against the exclude patterns (not `.gitignore` rules, see `DirScope`).
+        """
+        return (
+            (self.name_regex is not None and self.name_regex.match(name) is not None)
+            or (self.path_regex is not None and self.path_regex.match(rel_path) is not None)
+            or (self.gitignore and is_dir and name == GIT_DIR_NAME)
+        )
+
+class DirScope:
+    """
+    Filtering state of a single directory: its depth, path relative to the walked root
+    and `.gitignore` rules of the directory and its parents.
+
+    Args:
+        scan_filter (ScanFilter): Filtering options of the walk.
+        depth (int): Depth of the directory (0 for the root).
+        rel_path (str): Path relative to the walked root ("" for the root, ending with "/" otherwise).
+        rules (tuple[IgnoreRules, ...]): `.gitignore` rules in effect, the deepest last.
+    """
+
+    __slots__ = ("scan_filter", "depth", "rel_path", "rules")
+
+    def __init__(self, scan_filter: ScanFilter, depth: int, rel_path: str, rules: tuple[IgnoreRules, ...]):
+        self.scan_filter = scan_filter
+        self.depth = depth
+        self.rel_path = rel_path
+        self.rules = rules
+
+    @property
+    def opens_subdirs(self) -> bool:
+        """Subdirectories of the directory are listed (they are not below the depth limit)."""
+        max_depth = self.scan_filter.max_depth
+        return max_depth is None or self.depth + 1 < max_depth
+
+    def child(self, name: str) -> "DirScope":
+        """
+        Returns the scope of a subdirectory (before its own `.gitignore` file is read).
+        """
+        return DirScope(self.scan_filter, self.depth + 1, f"{self.rel_path}{name}/", self.rules)
+
+    def with_dir_rules(self, path: str, entries: list, errors: Optional[list] = None) -> "DirScope":
+        """
+        Reads the `.gitignore` file of the directory, if there is one among its entries.
+
+        Args:
+            path (str): Directory path.
+            entries (list[ScanEntry]): Directory entries.
+            errors (list, optional): Container to add (path, message) errors to.
+
+        Returns:
+            DirScope: Scope with the rules of the directory added (the same scope if there are none).
+        """
+        if not self.scan_filter.gitignore or not any(
+                entry.name == GITIGNORE_NAME and not entry.is_dir for entry in entries
+        ):
+            return self
+
+        gitignore_path = os.path.join(path, GITIGNORE_NAME)
+        try:
+            with open(gitignore_path, "r", encoding="utf-8", errors="replace") as file:
+                rules = IgnoreRules(self.rel_path, file)
+        except OSError as exc:
+            if errors is not None:
+                errors.append((gitignore_path, exc.strerror or str(exc)))
+            return self
+        if not rules:
+            return self
+        return DirScope(self.scan_filter, self.depth, self.rel_path, self.rules + (rules,))
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Checks an entry against the `.gitignore` rules, the deepest file with a matching pattern decides.
+        """
+        for rules in reversed(self.rules):
+            ignored = rules.match(rel_path[len(rules.base):], is_dir)
+            if ignored is not None:
+                return ignored
+        return False
+
+    def filter(self, entries: list) -> list:
+        """
+        Removes excluded and ignored entries of the directory.
+
+        Args:
+            entries (list[ScanEntry]): Directory entries.
+
+        Returns:
+            list[ScanEntry]: Remaining entries, in the same order.
+        """
+        scan_filter = self.scan_filter
+        if not scan_filter.filters_entries:
+            return entries
+
+        rel_path = self.rel_path
+        return [
+            entry for entry in entries
+            if not scan_filter.is_excluded(entry.name, rel_path + entry.name, entry.is_dir)
+            and not (self.rules and self.is_ignored(rel_path + entry.name, entry.is_dir))
+        ]
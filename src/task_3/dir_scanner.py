@@ -0,0 +1,416 @@
+"""
+Directory traversal engine for the directory visualizer.
+
+Directories are listed with `os.scandir`, which returns the type of each entry from the directory
+listing itself (`d_type` on most file systems), so no separate `stat` call and no `Path` object
+are needed per entry. The tree is walked depth-first with an explicit stack instead of recursion,
+so very deep trees don't hit Python's recursion limit.
+
+Listing can run ahead of the walk in a thread pool (see `ConcurrentDirLister`), which helps
+on network and FUSE mounts where every listing waits for the server, while the output stays the same.
+
+Entries are filtered right after every listing (see `dir_filter`), so excluded directories
+and directories below the depth limit are never listed, also not ahead of the walk.
+
+Directories that can't be listed (e.g. because of missing permissions) and symbolic links
+that lead back to a directory being walked (one of their parents, also through other links)
+are shown without their content, and reported to an optional errors container instead of
+aborting the traversal.
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import SimpleQueue
+from typing import Callable, Container, Iterator, NamedTuple, Optional
+
+from dir_filter import DirScope, ScanFilter
+
+IN_FLIGHT_PER_WORKER = 2  # running directory listings per thread
+MAX_LISTINGS_AHEAD = 4096  # directory listings done ahead of the walk and kept until requested
+
+class ScanEntry(NamedTuple):
+    """
+    Single directory entry.
+
+    Attributes:
+        name (str): Entry name.
+        path (str): Entry path (the directory path joined with the name).
+        is_dir (bool): The entry is a directory (or a symbolic link to a directory).
+        is_symlink (bool): The entry is a symbolic link.
+        size (int): Size in bytes of the entry itself, not following symbolic links (0 unless stats are collected).
+        mtime_ns (int): Modification time of the entry itself in nanoseconds (0 unless stats are collected).
+    """
+    name: str
+    path: str
+    is_dir: bool
+    is_symlink: bool
+    size: int = 0
+    mtime_ns: int = 0
+
+def report_scan_error(path: str, message: str, errors: Optional[list]) -> None:
+    """
+    Adds a traversal error to the errors container, if there is one.
+
+    Args:
+        path (str): Path of the entry the error is about.
+        message (str): Error message.
+        errors (list, optional): Container to add (path, message) errors to.
+    """
+    if errors is not None:
+        errors.append((path, message))
+
+def is_dir_entry(entry: os.DirEntry, errors: Optional[list] = None) -> bool:
+    """
+    Checks if a directory entry is a directory (following symbolic links), without failing.
+
+    Entries that can't be checked (e.g. symbolic links pointing to themselves) are treated as files.
+    """
+    try:
+        return entry.is_dir()
+    except OSError as exc:
+        report_scan_error(entry.path, exc.strerror or str(exc), errors)
+        return False
+
+def list_dir(path: str, errors: Optional[list] = None) -> list[ScanEntry]:
+    """
+    Lists a directory, with entries sorted alphabetically (case-insensitively) by name.
+
+    Args:
+        path (str): Directory path.
+        errors (list, optional): Container to add (path, message) errors to.
+
+    Returns:
+        list[ScanEntry]: Directory entries, empty if the directory can't be listed.
+    """
+    try:
+        with os.scandir(path) as dir_entries:
+            entries = [
+                ScanEntry(entry.name, entry.path, is_dir_entry(entry, errors), entry.is_symlink())
+                for entry in dir_entries
+            ]
+    except OSError as exc:
+        report_scan_error(path, exc.strerror or str(exc), errors)
+        return []
+
+    entries.sort(key=lambda entry: entry.name.lower())
+    return entries
+
+def stat_entries(entries: list[ScanEntry], errors: Optional[list] = None) -> list[ScanEntry]:
+    """
+    Adds sizes and modification times to directory entries (of the entries themselves, not following
+    symbolic links). Entries that can't be checked get zeros.
+
+    Args:
+        entries (list[ScanEntry]): Directory entries.
+        errors (list, optional): Container to add (path, message) errors to.
+
+    Returns:
+        list[ScanEntry]: Entries with stats, in the same order.
+    """
+    entries_with_stats = []
+    for entry in entries:
+        try:
+            entry_stat = os.lstat(entry.path)
+            entries_with_stats.append(
+                ScanEntry(entry.name, entry.path, entry.is_dir, entry.is_symlink, entry_stat.st_size, entry_stat.st_mtime_ns)
+            )
+        except OSError as exc:
+            report_scan_error(entry.path, exc.strerror or str(exc), errors)
+            entries_with_stats.append(entry)
+    return entries_with_stats
+
+def is_inside(path: str, dir_path: str) -> bool:
+    """
+    Checks if a (resolved) path is the directory itself or lies inside it.
+    """
+    return path == dir_path or path.startswith(dir_path.rstrip(os.sep) + os.sep)
+
+def resolve_subdir(entry: ScanEntry, real_path: str, open_real_paths: Container[str]) -> Optional[str]:
+    """
+    Resolves the path of a subdirectory to walk into, unless it leads to a loop.
+
+    A loop is a subdirectory (a symbolic link, or a directory reached through one) resolving to
+    a directory being walked, or a symbolic link to a parent of the directory it is in.
+
+    Args:
+        entry (ScanEntry): Directory entry (a directory or a symbolic link to one).
+        real_path (str): Resolved path of the directory the entry is in.
+        open_real_paths (Container[str]): Resolved paths of the directory the entry is in and all
+                                          directories walked on the way to it.
+
+    Returns:
+        Optional[str]: Resolved path of the subdirectory, None for a loop.
+    """
+    if entry.is_symlink:
+        entry_real_path = os.path.realpath(entry.path)
+        if is_inside(real_path, entry_real_path):
+            return None
+    else:
+        entry_real_path = os.path.join(real_path, entry.name)
+    return None if entry_real_path in open_real_paths else entry_real_path
+
+ListDirFunc = Callable[[str, Optional[list]], list[ScanEntry]]
+
+def scan_dir(
+        path: str,
+        scope: DirScope,
+        list_dir_func: ListDirFunc = list_dir,
+        with_stats: bool = False
+    ) -> tuple[list[ScanEntry], list[tuple[str, str]], DirScope]:
+    """
+    Lists a directory, reads its `.gitignore` rules and filters the entries (see `list_dir` and `dir_filter.DirScope`).
+    Stats are taken after filtering, so excluded entries are not checked.
+
+    Args:
+        path (str): Directory path.
+        scope (DirScope): Filtering state of the directory.
+        list_dir_func (ListDirFunc): Function listing the directory (`list_dir` by default).
+        with_stats (bool): Add sizes and modification times to the entries (see `stat_entries`).
+
+    Returns:
+        tuple: Sorted and filtered directory entries, (path, message) errors of the listing
+               and the scope of the directory with its own `.gitignore` rules.
+    """
+    errors = []
+    entries = list_dir_func(path, errors)
+    scope = scope.with_dir_rules(path, entries, errors)
+    entries = scope.filter(entries)
+    if with_stats:
+        entries = stat_entries(entries, errors)
+    return entries, errors, scope
+
+class DirLister:
+    """
+    Lists directories for `walk_dir` one by one, in the calling thread.
+
+    Args:
+        list_dir_func (ListDirFunc): Function listing a directory (`list_dir` by default).
+        with_stats (bool): Add sizes and modification times to the entries.
+    """
+
+    def __init__(self, list_dir_func: ListDirFunc = list_dir, with_stats: bool = False):
+        self.list_dir_func = list_dir_func
+        self.with_stats = with_stats
+
+    def list_dir(self, path: str, scope: DirScope) -> tuple[list[ScanEntry], list[tuple[str, str]], DirScope]:
+        """
+        Lists a directory, see `scan_dir`.
+
+        Returns:
+            tuple: Sorted and filtered directory entries, (path, message) errors of the listing
+                   and the scope of the directory.
+        """
+        return scan_dir(path, scope, self.list_dir_func, self.with_stats)
+
+    def prefetch(self, dirs: list[tuple[str, DirScope]]) -> None:
+        """
+        Hints directories (paths with their scopes) that will be listed next, in order
+        (nothing to do for serial listing).
+        """
+
+    def close(self) -> None:
+        """
+        Releases resources of the lister.
+        """
+
+class ConcurrentDirLister(DirLister):
+    """
+    Lists directories for `walk_dir` in a thread pool ahead of time, for file systems where listing
+    a directory mostly waits for I/O (network or FUSE mounts).
+
+    Directories hinted with `prefetch` and subdirectories found by finished listings (except symbolic
+    links, which may lead to a loop, and directories below the depth limit) are listed ahead, the most recently found first, as the walk
+    is depth-first. At most `max_in_flight` listings run at a time and at most `max_ahead` finished
+    listings wait to be requested. Results don't depend on timing: every listing returns
+    its own entries and errors.
+
+    Args:
+        workers (int): Number of threads.
+        max_in_flight (int, optional): Maximal number of running listings (`IN_FLIGHT_PER_WORKER` per thread by default).
+        max_ahead (int): Maximal number of listings done ahead and not requested yet.
+        list_dir_func (ListDirFunc): Function listing a directory (`list_dir` by default), called from the threads.
+        with_stats (bool): Add sizes and modification times to the entries (the stat calls run in the threads too).
+    """
+
+    def __init__(
+            self,
+            workers: int,
+            max_in_flight: Optional[int] = None,
+            max_ahead: int = MAX_LISTINGS_AHEAD,
+            list_dir_func: ListDirFunc = list_dir,
+            with_stats: bool = False
+        ):
+        super().__init__(list_dir_func, with_stats)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dir_scanner")
+        self.max_in_flight = max_in_flight or workers * IN_FLIGHT_PER_WORKER
+        self.max_ahead = max_ahead
+        self.running_count = 0
+        # Submitted listings not requested yet, listings finished since the last check, and requested paths
+        self.pending: dict[str, Future] = {}
+        self.finished: SimpleQueue = SimpleQueue()
+        self.requested: set[str] = set()
+        # Directories to list ahead with their scopes, the next one last, and the same paths as a set
+        self.waiting: list[tuple[str, DirScope]] = []
+        self.waiting_paths: set[str] = set()
+
+    def list_dir(self, path: str, scope: DirScope) -> tuple[list[ScanEntry], list[tuple[str, str]], DirScope]:
+        self.requested.add(path)
+        future = self.pending.pop(path, None)
+        if future is None:
+            # Not listed ahead - list it right away
+            self.waiting_paths.discard(path)
+            future = self._submit_listing(path, scope)
+        # Keep other threads busy while waiting
+        while not future.done():
+            self._collect_finished(block=True)
+            self._submit()
+        return future.result()
+
+    def prefetch(self, dirs: list[tuple[str, DirScope]]) -> None:
+        self._add_waiting(dirs)
+        self._collect_finished()
+        self._submit()
+
+    def _add_waiting(self, dirs: list[tuple[str, DirScope]]) -> None:
+        """Adds directories to list ahead, unless they are already listed."""
+        dirs = [
+            (path, scope) for path, scope in dirs
+            if path not in self.pending and path not in self.requested and path not in self.waiting_paths
+        ]
+        self.waiting.extend(reversed(dirs))
+        self.waiting_paths.update(path for path, _ in dirs)
+
+    def _submit_listing(self, path: str, scope: DirScope) -> Future:
+        """Submits a listing to the thread pool."""
+        self.running_count += 1
+        future = self.executor.submit(scan_dir, path, scope, self.list_dir_func, self.with_stats)
+        future.add_done_callback(self.finished.put)
+        return future
+
+    def _collect_finished(self, block: bool = False) -> None:
+        """Counts finished listings and adds their subdirectories to list ahead."""
+        if block:
+            futures = [self.finished.get()]
+        else:
+            futures = []
+        while not self.finished.empty():
+            futures.append(self.finished.get())
+
+        for future in futures:
+            self.running_count -= 1
+            if not future.cancelled() and future.exception() is None:
+                entries, _, scope = future.result()
+                if scope.opens_subdirs:
+                    self._add_waiting([
+                        (entry.path, scope.child(entry.name))
+                        for entry in entries if entry.is_dir and not entry.is_symlink
+                    ])
+
+    def _submit(self) -> None:
+        """Submits waiting listings while there are free slots."""
+        while (
+            self.waiting
+            and self.running_count < self.max_in_flight
+            and len(self.pending) < self.max_ahead
+        ):
+            path, scope = self.waiting.pop()
+            if path in self.waiting_paths:
+                self.waiting_paths.remove(path)
+                if path not in self.requested and path not in self.pending:
+                    self.pending[path] = self._submit_listing(path, scope)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.pending.clear()
+
+def walk_dir(
+        path: str,
+        errors: Optional[list] = None,
+        workers: int = 1,
+        scan_filter: Optional[ScanFilter] = None,
+        list_dir_func: ListDirFunc = list_dir,
+        with_stats: bool = False
+    ) -> Iterator[tuple[int, ScanEntry]]:
+    """
+    Walks a directory tree depth-first, in display order: every directory is followed by its content,
+    entries of a directory are sorted alphabetically (case-insensitively).
+
+    Symbolic links to directories are followed, unless they lead to a directory on the way to them
+    (a loop, see `resolve_subdir`), such links are reported and not followed.
+
+    Excluded and ignored entries are skipped, directories at the maximal depth are shown without
+    their content (see `dir_filter.ScanFilter`). Skipped directories are never listed.
+
+    Args:
+        path (str): Root directory path.
+        errors (list, optional): Container to add (path, message) errors to.
+        workers (int): Number of threads listing directories ahead of the walk (see `ConcurrentDirLister`).
+                       The result is the same as with a single thread.
+        scan_filter (ScanFilter, optional): Exclude patterns, `.gitignore` filtering and depth limit.
+        list_dir_func (ListDirFunc): Function listing a directory, `list_dir` by default
+                                     (e.g. `dir_snapshot.DirSnapshot.list_dir` to reuse listings of unchanged directories).
+        with_stats (bool): Add sizes and modification times to the entries (taken in the listing threads).
+
+    Yields:
+        tuple[int, ScanEntry]: Depth of the entry (1 for the content of the root) and the entry.
+    """
+    scan_filter = ScanFilter() if scan_filter is None else scan_filter
+    if workers > 1:
+        lister = ConcurrentDirLister(workers, list_dir_func=list_dir_func, with_stats=with_stats)
+    else:
+        lister = DirLister(list_dir_func, with_stats)
+
+    def open_dir(
+            dir_path: str,
+            real_path: str,
+            scope: DirScope
+        ) -> Iterator[tuple[ScanEntry, Optional[str], Optional[DirScope]]]:
+        """
+        Lists a directory and resolves paths of its subdirectories to follow (None for files and loops)
+        and their scopes (None if they are not opened).
+        """
+        entries, list_errors, scope = lister.list_dir(dir_path, scope)
+        if errors is not None:
+            errors.extend(list_errors)
+
+        opens_subdirs = scope.opens_subdirs
+        resolved = []
+        for entry in entries:
+            entry_real_path = entry_scope = None
+            if entry.is_dir and opens_subdirs:
+                entry_scope = scope.child(entry.name)
+                entry_real_path = resolve_subdir(entry, real_path, open_real_paths)
+            resolved.append((entry, entry_real_path, entry_scope))
+
+        lister.prefetch([
+            (entry.path, entry_scope) for entry, entry_real_path, entry_scope in resolved
+            if entry_real_path is not None
+        ])
+        return iter(resolved)
+
+    try:
+        path = os.fspath(path)
+        root_real_path = os.path.realpath(path)
+        # Resolved paths of the directories on the stack, to detect loops through symbolic links
+        stack_real_paths = [root_real_path]
+        open_real_paths = {root_real_path}
+        # Every level of the stack holds not yet walked entries of a directory
+        stack = [open_dir(path, root_real_path, scan_filter.root_scope())]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                open_real_paths.discard(stack_real_paths.pop())
+                continue
+
+            entry, entry_real_path, entry_scope = item
+            yield len(stack), entry
+
+            if entry_real_path is not None:
+                stack_real_paths.append(entry_real_path)
+                open_real_paths.add(entry_real_path)
+                stack.append(open_dir(entry.path, entry_real_path, entry_scope))
+            elif entry_scope is not None:
+                report_scan_error(entry.path, "Symbolic link loop, not followed", errors)
+    finally:
+        lister.close()
@@ -0,0 +1,193 @@
+"""
+Persistent snapshot of directory listings for repeated visualization of the same tree.
+
+A directory's modification time changes whenever an entry is added to it, removed or renamed,
+so a listing stays valid while the directory has the same device, inode and modification time.
+The snapshot keeps the listing of every walked directory with these values. On a later walk
+every directory is checked with a single `stat` call and only directories that changed are
+listed again, the content of the others is taken from the snapshot. Subdirectories are still
+checked one by one, as changes deep in the tree don't change the modification time of their parents.
+
+Listings with errors and directories modified shortly before the previous walk started
+(within the timestamp granularity of some file systems) are not reused.
+
+The snapshot file is a compact binary file with native byte order (it is a local cache):
+a header, arrays of device, inode, modification time and entries end offset per directory,
+directory paths and entry names as NUL-separated blobs and a byte of flags per entry.
+It is loaded with a few bulk reads and splits, without per-entry parsing.
+"""
+
+import os
+import struct
+import time
+from array import array
+from typing import Optional
+
+from dir_scanner import ScanEntry, list_dir
+
+SNAPSHOT_MAGIC = b"DIRSNP01"
+SNAPSHOT_HEADER = struct.Struct("=8sqQQQQ")  # magic, started_ns, dirs_count, entries_count, paths_size, names_size
+RACY_WINDOW_NS = 2_000_000_000  # directories modified that shortly before a walk are listed again
+FLAG_DIR = 1
+FLAG_SYMLINK = 2
+
+class DirSnapshot:
+    """
+    Directory listings of a previous walk, reused for directories that didn't change.
+
+    Pass `list_dir` of the snapshot to `dir_scanner.walk_dir` (as `list_dir_func`) and call `save`
+    after the walk. The saved snapshot holds the listings of the directories walked this time.
+
+    Args:
+        path (str): Snapshot file path (it doesn't have to exist).
+        rescan (bool): Ignore the existing snapshot and list every directory.
+    """
+
+    def __init__(self, path: str, rescan: bool = False):
+        self.path = os.fspath(path)
+        self.started_ns = time.time_ns()
+        self.reused_count = 0
+        self.listed_count = 0
+        # Previous snapshot - directory index per path, identity and entries end offset per directory
+        self._dir_indexes: dict[str, int] = {}
+        self._devices = array("Q")
+        self._inodes = array("Q")
+        self._mtimes = array("q")
+        self._entry_ends = array("Q")
+        self._names: list[str] = []
+        self._flags = b""
+        self._trusted_before_ns = 0
+        # Listings of this walk - device, inode, modification time and entries per directory path
+        self._listings: dict[str, tuple[int, int, int, list[ScanEntry]]] = {}
+
+        if not rescan:
+            self.load()
+
+    def load(self) -> bool:
+        """
+        Loads the snapshot file, an unreadable or invalid file is ignored (everything is listed).
+
+        Returns:
+            bool: True if the snapshot was loaded.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return False
+        if len(data) < SNAPSHOT_HEADER.size:
+            return False
+
+        magic, started_ns, dirs_count, entries_count, paths_size, names_size = SNAPSHOT_HEADER.unpack_from(data)
+        offset = SNAPSHOT_HEADER.size
+        tables_size = dirs_count * 8 * 4
+        if magic != SNAPSHOT_MAGIC or len(data) != offset + tables_size + paths_size + names_size + entries_count:
+            return False
+
+        tables = []
+        for typecode in ("Q", "Q", "q", "Q"):
+            table = array(typecode)
+            table.frombytes(data[offset:offset + dirs_count * 8])
+            tables.append(table)
+            offset += dirs_count * 8
+        paths = os.fsdecode(data[offset:offset + paths_size]).split("\0") if dirs_count else []
+        offset += paths_size
+        names = os.fsdecode(data[offset:offset + names_size]).split("\0") if entries_count else []
+        offset += names_size
+        if len(paths) != dirs_count or len(names) != entries_count:
+            return False
+
+        self._devices, self._inodes, self._mtimes, self._entry_ends = tables
+        self._dir_indexes = {dir_path: index for index, dir_path in enumerate(paths)}
+        self._names = names
+        self._flags = data[offset:]
+        self._trusted_before_ns = started_ns - RACY_WINDOW_NS
+        return True
+
+    def _cached_entries(self, path: str, dir_stat: os.stat_result) -> Optional[list[ScanEntry]]:
+        """Returns entries of the directory from the previous snapshot, if it didn't change since."""
+        index = self._dir_indexes.get(path)
+        if (
+            index is None
+            or self._mtimes[index] != dir_stat.st_mtime_ns
+            or self._inodes[index] != dir_stat.st_ino
+            or self._devices[index] != dir_stat.st_dev
+            or dir_stat.st_mtime_ns >= self._trusted_before_ns
+        ):
+            return None
+
+        start = self._entry_ends[index - 1] if index else 0
+        end = self._entry_ends[index]
+        # Entry paths are joined as `os.scandir` joins them
+        prefix = path if path.endswith(os.sep) else path + os.sep
+        return [
+            ScanEntry(name, prefix + name, flag & FLAG_DIR != 0, flag & FLAG_SYMLINK != 0)
+            for name, flag in zip(self._names[start:end], self._flags[start:end])
+        ]
+
+    def list_dir(self, path: str, errors: Optional[list] = None) -> list[ScanEntry]:
+        """
+        Lists a directory (see `dir_scanner.list_dir`), or takes its entries from the snapshot
+        if the directory didn't change. Can be called from many threads.
+
+        Args:
+            path (str): Directory path.
+            errors (list, optional): Container to add (path, message) errors to.
+
+        Returns:
+            list[ScanEntry]: Directory entries, empty if the directory can't be listed.
+        """
+        try:
+            dir_stat = os.stat(path)
+        except OSError:
+            # Reported by the listing
+            return list_dir(path, errors)
+
+        entries = self._cached_entries(path, dir_stat)
+        if entries is not None:
+            self.reused_count += 1
+        else:
+            self.listed_count += 1
+            list_errors = []
+            entries = list_dir(path, list_errors)
+            if errors is not None:
+                errors.extend(list_errors)
+            if list_errors:
+                # Listed again next time, so the errors are reported again
+                return entries
+
+        self._listings[path] = (dir_stat.st_dev, dir_stat.st_ino, dir_stat.st_mtime_ns, entries)
+        return entries
+
+    def save(self) -> None:
+        """
+        Writes listings of the directories walked since the snapshot was created to the snapshot file
+        (atomically, through a temporary file).
+        """
+        listings = list(self._listings.items())
+        devices, inodes, mtimes, entry_ends = array("Q"), array("Q"), array("q"), array("Q")
+        names: list[str] = []
+        flags = bytearray()
+        for _, (device, inode, mtime_ns, entries) in listings:
+            devices.append(device)
+            inodes.append(inode)
+            mtimes.append(mtime_ns)
+            names.extend(entry.name for entry in entries)
+            flags.extend((FLAG_DIR if entry.is_dir else 0) | (FLAG_SYMLINK if entry.is_symlink else 0) for entry in entries)
+            entry_ends.append(len(names))
+
+        paths_blob = os.fsencode("\0".join(path for path, _ in listings))
+        names_blob = os.fsencode("\0".join(names))
+        header = SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, self.started_ns, len(listings), len(names), len(paths_blob), len(names_blob)
+        )
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(header)
+            for table in (devices, inodes, mtimes, entry_ends):
+                table.tofile(file)
+            file.write(paths_blob)
+            file.write(names_blob)
+            file.write(flags)
+        os.replace(tmp_path, self.path)
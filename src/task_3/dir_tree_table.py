@@ -0,0 +1,218 @@
+"""
+Compact array-backed representation of a directory tree.
+
+Instead of a dictionary per directory and a key per entry (`dir_visualizer.DirectoryTree`),
+all nodes are kept in a few flat arrays indexed by node number: parent, first child and
+next sibling links, the end offset of the name in a single name blob and a byte of kind
+per node. This takes a few dozen bytes per node, so trees with millions of entries fit in memory.
+
+Nodes are added in display order (a directory before its content), so the tree is walked
+by following the links, without recursion and without a stack.
+"""
+
+import sys
+from array import array
+from itertools import accumulate
+from typing import Callable, Iterator, Optional
+
+NO_NODE = -1
+ROOT_NODE = 0
+NAME_ENCODING = sys.getfilesystemencoding()
+NAME_ERRORS = "surrogateescape"  # names that are not valid in the file system encoding are kept as they are
+NAMES_PER_FLUSH = 4096  # added names encoded into the blob at once
+
+class DirTreeTable:
+    """
+    Directory tree as a flat node table.
+
+    Node 0 is the root directory. Supports `len()` (number of nodes, the root included).
+    """
+
+    def __init__(self):
+        self._parents = array("i")
+        self._first_children = array("i")
+        self._next_siblings = array("i")
+        self._name_ends = array("Q")
+        self._names = bytearray()
+        self._is_dir = bytearray()
+        # Added names not encoded into the blob yet
+        self._pending_names: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def __repr__(self) -> str:
+        return f"DirTreeTable({len(self)} nodes)"
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the node arrays and the name blob."""
+        self._flush_names()
+        return (
+            len(self._names) + len(self._is_dir)
+            + sum(table.itemsize * len(table) for table in (
+                self._parents, self._first_children, self._next_siblings, self._name_ends
+            ))
+        )
+
+    def add_node(self, parent: int, name: str, is_dir: bool) -> int:
+        """
+        Adds a node as the last child of its parent.
+
+        Nodes must be added in display order: the root first, then every directory
+        followed by its content (as `dir_scanner.walk_dir` yields them).
+
+        Args:
+            parent (int): Parent node (`NO_NODE` for the root).
+            name (str): Entry name.
+            is_dir (bool): The entry is a directory.
+
+        Returns:
+            int: Number of the new node.
+        """
+        parents, first_children = self._parents, self._first_children
+        node = len(parents)
+        if parent != NO_NODE:
+            if first_children[parent] == NO_NODE:
+                first_children[parent] = node
+            else:
+                # The previous sibling is the last added node or one of its parents
+                sibling = node - 1
+                while parents[sibling] != parent:
+                    sibling = parents[sibling]
+                self._next_siblings[sibling] = node
+
+        parents.append(parent)
+        first_children.append(NO_NODE)
+        self._next_siblings.append(NO_NODE)
+        self._is_dir.append(is_dir)
+        pending_names = self._pending_names
+        pending_names.append(name)
+        if len(pending_names) >= NAMES_PER_FLUSH:
+            self._flush_names()
+        return node
+
+    def _flush_names(self) -> None:
+        """Encodes pending names into the name blob, all at once if they are ASCII."""
+        pending_names = self._pending_names
+        if not pending_names:
+            return
+        joined = "".join(pending_names)
+        if joined.isascii():
+            encoded = joined.encode("ascii")
+            name_sizes = map(len, pending_names)
+        else:
+            encoded_names = [name.encode(NAME_ENCODING, NAME_ERRORS) for name in pending_names]
+            encoded = b"".join(encoded_names)
+            name_sizes = map(len, encoded_names)
+        name_ends = accumulate(name_sizes, initial=len(self._names))
+        next(name_ends)  # skip the start offset of the first name
+        self._name_ends.extend(name_ends)
+        self._names += encoded
+        pending_names.clear()
+
+    def name(self, node: int) -> str:
+        """
+        Returns the name of the node.
+        """
+        if node >= len(self._name_ends):
+            self._flush_names()
+        start = self._name_ends[node - 1] if node else 0
+        return self._names[start:self._name_ends[node]].decode(NAME_ENCODING, NAME_ERRORS)
+
+    def is_dir(self, node: int) -> bool:
+        """
+        Checks if the node is a directory.
+        """
+        return self._is_dir[node] != 0
+
+    def parent(self, node: int) -> int:
+        """
+        Returns the parent of the node (`NO_NODE` for the root).
+        """
+        return self._parents[node]
+
+    def children(self, node: int) -> Iterator[int]:
+        """
+        Iterates over the children of the node, in display order.
+        """
+        child = self._first_children[node]
+        while child != NO_NODE:
+            yield child
+            child = self._next_siblings[child]
+
+    def path(self, node: int) -> str:
+        """
+        Returns the path of the node relative to the parent of the root (starting with the root name).
+        """
+        names = []
+        while node != NO_NODE:
+            names.append(self.name(node))
+            node = self._parents[node]
+        return "/".join(reversed(names))
+
+    def sort_children(self, key: Callable[[int], object]) -> None:
+        """
+        Reorders children of every directory by the key (stable), by relinking the siblings.
+        Nodes can't be added after sorting.
+
+        Args:
+            key (Callable[[int], object]): Sort key of a node.
+        """
+        first_children, next_siblings = self._first_children, self._next_siblings
+        for node, is_dir in enumerate(self._is_dir):
+            if not is_dir or first_children[node] == NO_NODE or next_siblings[first_children[node]] == NO_NODE:
+                continue
+            children = sorted(self.children(node), key=key)
+            first_children[node] = children[0]
+            for child, next_child in zip(children, children[1:]):
+                next_siblings[child] = next_child
+            next_siblings[children[-1]] = NO_NODE
+
+    def walk(self, node: int = ROOT_NODE, max_depth: Optional[int] = None) -> Iterator[tuple[int, int]]:
+        """
+        Walks the subtree of the node depth-first, in display order, by following the links.
+
+        Args:
+            node (int): Node to start from (the root by default).
+            max_depth (int, optional): Maximal depth of walked nodes (deeper nodes are skipped).
+
+        Yields:
+            tuple[int, int]: Depth relative to the starting node (0 for the node itself) and the node.
+        """
+        if not len(self._parents):
+            return
+        parents, first_children, next_siblings = self._parents, self._first_children, self._next_siblings
+        start, depth = node, 0
+        while True:
+            yield depth, node
+            child = first_children[node]
+            if child != NO_NODE and (max_depth is None or depth < max_depth):
+                node = child
+                depth += 1
+                continue
+            # Go up to the nearest node with a next sibling, within the subtree
+            while node != start and next_siblings[node] == NO_NODE:
+                node = parents[node]
+                depth -= 1
+            if node == start:
+                return
+            node = next_siblings[node]
+
+    def to_dict(self) -> dict:
+        """
+        Returns the tree in the nested dictionary form of `dir_visualizer.build_dir_tree`
+        (with the root element as the top-level key, None for files).
+        """
+        tree: dict = {}
+        # Subtrees of the directories on the way to the current node
+        subtrees = [tree]
+        for depth, node in self.walk():
+            del subtrees[depth + 1:]
+            if self.is_dir(node):
+                subtree: dict = {}
+                subtrees[-1][self.name(node)] = subtree
+                subtrees.append(subtree)
+            else:
+                subtrees[-1][self.name(node)] = None
+        return tree
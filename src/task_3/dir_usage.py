@@ -0,0 +1,122 @@
+"""
+Disk usage of a directory tree: size, file count and newest modification time per node.
+
+Values are kept in arrays parallel to the nodes of a `dir_tree_table.DirTreeTable`.
+Every node first holds its own values (taken during the walk), `roll_up` then adds them
+to the parents in a single pass over the nodes in reverse order: children always come after
+their parents in the table, so every subtree is complete before it is added to its parent.
+
+Sizes are apparent sizes of files (and symbolic links themselves), sizes of directory
+entries are not counted. Content of followed symbolic links to directories is shown with its
+totals, but not counted in the totals of the parents of the link, as it is stored elsewhere.
+"""
+
+import heapq
+import time
+from array import array
+
+from dir_tree_table import DirTreeTable, NO_NODE, ROOT_NODE
+
+SIZE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB", "PiB")
+
+def format_size(size: int) -> str:
+    """
+    Formats a size in bytes with a binary unit (e.g. "512 B", "1.5 KiB").
+    """
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in SIZE_UNITS[1:-1]:
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} {SIZE_UNITS[-1]}"
+
+def format_mtime(mtime_ns: int) -> str:
+    """
+    Formats a modification time in nanoseconds as local date and time ("-" if unknown).
+    """
+    if not mtime_ns:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime_ns / 1e9))
+
+class DirUsage:
+    """
+    Sizes, file counts and newest modification times of the nodes of a node table.
+
+    Add values of every node in the order of the table with `add_node`, then call `roll_up`.
+
+    Args:
+        table (DirTreeTable): Node table the values belong to.
+    """
+
+    def __init__(self, table: DirTreeTable):
+        self.table = table
+        self.sizes = array("Q")
+        self.file_counts = array("Q")
+        self.newest_mtimes = array("q")
+        # Followed symbolic links to directories, not counted in the totals of their parents
+        self.linked_dirs: set[int] = set()
+
+    def add_node(self, size: int, is_file: bool, mtime_ns: int, is_linked_dir: bool = False) -> None:
+        """
+        Adds values of the next node of the table.
+
+        Args:
+            size (int): Size of the entry itself in bytes (not counted for directories).
+            is_file (bool): The entry is not a directory (counted as a file).
+            mtime_ns (int): Modification time of the entry itself in nanoseconds.
+            is_linked_dir (bool): The entry is a followed symbolic link to a directory.
+        """
+        if is_linked_dir:
+            self.linked_dirs.add(len(self.sizes))
+        self.sizes.append(size if is_file else 0)
+        self.file_counts.append(1 if is_file else 0)
+        self.newest_mtimes.append(mtime_ns)
+
+    def roll_up(self) -> None:
+        """
+        Adds the values of every subtree to its directory, bottom-up in a single pass.
+        """
+        sizes, file_counts, newest_mtimes = self.sizes, self.file_counts, self.newest_mtimes
+        parent_of, linked_dirs = self.table.parent, self.linked_dirs
+        for node in range(len(sizes) - 1, ROOT_NODE, -1):
+            parent = parent_of(node)
+            if parent == NO_NODE or node in linked_dirs:
+                continue
+            sizes[parent] += sizes[node]
+            file_counts[parent] += file_counts[node]
+            if newest_mtimes[node] > newest_mtimes[parent]:
+                newest_mtimes[parent] = newest_mtimes[node]
+
+    def sort_by_size(self) -> None:
+        """
+        Reorders children of every directory from the largest (the same sizes keep their order).
+        """
+        sizes = self.sizes
+        self.table.sort_children(key=lambda node: -sizes[node])
+
+    def largest_subtrees(self, count: int) -> list[int]:
+        """
+        Returns directories with the largest totals (without the root), the largest first.
+
+        Args:
+            count (int): Number of directories.
+
+        Returns:
+            list[int]: Directory nodes.
+        """
+        table, sizes = self.table, self.sizes
+        dir_nodes = (node for node in range(ROOT_NODE + 1, len(sizes)) if table.is_dir(node))
+        return heapq.nlargest(count, dir_nodes, key=sizes.__getitem__)
+
+    def details(self, node: int) -> str:
+        """
+        Returns the values of the node as text: size, file count for directories and (newest) modification time.
+        """
+        size = format_size(self.sizes[node])
+        mtime = format_mtime(self.newest_mtimes[node])
+        if self.table.is_dir(node):
+            file_count = self.file_counts[node]
+            return f"[{size}, {file_count} file{'s' if file_count != 1 else ''}, newest {mtime}]"
+        return f"[{size}, {mtime}]"
@@ -1,95 +1,316 @@
 """
 Module for visualizing and building directory structures.
 
-This module provides functionality to recursively display the structure of a directory, 
-as well as to build and display it in a hierarchical format. It supports sorting of 
+This module provides functionality to display the structure of a directory,
+as well as to build and display it in a hierarchical format. It supports sorting of
 files and directories alphabetically, and colorizes the output for better readability.
+Directories are traversed with `dir_scanner.walk_dir` (`os.scandir` and an explicit stack),
+entries can be filtered during the walk (see `dir_filter.ScanFilter`), listings of unchanged
+directories can be reused from a snapshot of a previous walk (see `dir_snapshot.DirSnapshot`), output is written
+with `tree_renderer.TreeRenderer` (buffered, colored only in a terminal).
+Large trees can be built into a compact node table (see `dir_tree_table.DirTreeTable`)
+instead of nested dictionaries, with sizes, file counts and modification times collected
+in the same walk (see `dir_usage.DirUsage`). A tree can be kept up to date by watching it
+(see `dir_watcher.DirTreeWatcher`), then only its changes are displayed.
 """
 
+import time
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 
-from colorama import Fore
-
-INDENT_PER_LEVEL = " " * 4
+from dir_filter import ScanFilter
+from dir_scanner import list_dir, walk_dir
+from dir_snapshot import DirSnapshot
+from dir_tree_table import DirTreeTable, NO_NODE
+from dir_usage import DirUsage
+from dir_watcher import TreeChange
+from tree_renderer import INDENT_PER_LEVEL, TreeRenderer
 
 DirectoryTree = Dict[str, Optional["DirectoryTree"]]
 
-def visualize_dir_structure(path: Path, depth: int =0):
+def visualize_dir_structure(
+        path: Path,
+        depth: int = 0,
+        errors: Optional[list] = None,
+        workers: int = 1,
+        renderer: Optional[TreeRenderer] = None,
+        scan_filter: Optional[ScanFilter] = None,
+        snapshot: Optional[DirSnapshot] = None
+    ):
     """
-    Recursively prints the structure of a directory using indentation and colorized output.
+    Prints the structure of a directory using indentation and colorized output.
 
     Files and directories are sorted alphabetically (ascending) by name.
     The function uses blue color for directories and green for files.
+    The tree is walked without recursion (see `dir_scanner.walk_dir`), so the depth is not limited,
+    and lines are written in chunks while the tree is walked (see `tree_renderer.TreeRenderer`).
 
     Args:
         path (Path): The directory path to visualize.
-        depth (int, optional): The current depth level in the directory tree. 
-                               Used internally for recursive indentation.
+        depth (int, optional): The depth level of the directory, used for indentation.
+        errors (list, optional): Container to add (path, message) errors of unreadable
+                                 directories and symbolic link loops to.
+        workers (int): Number of threads listing directories concurrently (for slow file systems).
+        renderer (TreeRenderer, optional): Renderer to write lines with (to stdout by default).
+        scan_filter (ScanFilter, optional): Exclude patterns, `.gitignore` filtering and depth limit
+                                            (excluded directories are not walked).
+        snapshot (DirSnapshot, optional): Snapshot to reuse listings of unchanged directories from
+                                          (and to record the listings to, save it afterwards).
 
     Returns:
         None
     """
+    renderer = TreeRenderer() if renderer is None else renderer
     if depth == 0:
-        print(Fore.BLUE + f"{path.name}/")
-
-    sorted_dir_files = sorted(path.iterdir(), key=lambda x: x.name.lower())
+        renderer.add_dir(0, path.name)
 
-    for entry in sorted_dir_files:
-        indentation = INDENT_PER_LEVEL * (depth + 1)
-        if entry.is_dir():
-            # Print directory and recurse into subdirectory
-            print(f"{indentation}{Fore.BLUE}{entry.name}/")
-            visualize_dir_structure(entry, depth + 1)
+    list_dir_func = list_dir if snapshot is None else snapshot.list_dir
+    for entry_depth, entry in walk_dir(path, errors, workers, scan_filter, list_dir_func):
+        if entry.is_dir:
+            # Directory, its content follows
+            renderer.add_dir(depth + entry_depth, entry.name)
         else:
-            # Print file
-            print(f"{indentation}{Fore.GREEN}{entry.name}")
+            renderer.add_file(depth + entry_depth, entry.name)
+    renderer.flush()
 
-def build_dir_tree(path: Path) -> DirectoryTree:
+def build_dir_tree(
+        path: Path,
+        errors: Optional[list] = None,
+        workers: int = 1,
+        renderer: Optional[TreeRenderer] = None,
+        scan_filter: Optional[ScanFilter] = None,
+        snapshot: Optional[DirSnapshot] = None
+    ) -> DirectoryTree:
     """
-    Recursively builds a directory tree starting from the given path,
+    Builds a directory tree starting from the given path,
     including the root element as the top-level key.
 
     Args:
         path (Path): The directory path to start building the tree from.
+        errors (list, optional): Container to add (path, message) errors of unreadable
+                                 directories and symbolic link loops to.
+        workers (int): Number of threads listing directories concurrently (for slow file systems).
+                       The tree is the same as with a single thread.
+        renderer (TreeRenderer, optional): Renderer to display the tree with while it is built
+                                           (the same output as `display_tree` gives for the built tree).
+        scan_filter (ScanFilter, optional): Exclude patterns, `.gitignore` filtering and depth limit
+                                            (excluded entries are not added to the tree).
+        snapshot (DirSnapshot, optional): Snapshot to reuse listings of unchanged directories from
+                                          (and to record the listings to, save it afterwards).
 
     Returns:
         DirectoryTree: A nested dictionary representing the directory tree.
     """
-    def _build(current_path: Path) -> DirectoryTree:
-        tree: DirectoryTree = {}
-        sorted_dir_files = sorted(current_path.iterdir(), key=lambda x: x.name.lower())
-        for entry in sorted_dir_files:
-            if entry.is_dir():
-                tree[entry.name] = _build(entry)
-            else:
-                tree[entry.name] = None
-        return tree
+    tree: DirectoryTree = {}
+    if renderer is not None:
+        renderer.add_dir(0, path.name)
+
+    # Subtrees of the directories on the way to the current entry, the root content first
+    subtrees = [tree]
+    list_dir_func = list_dir if snapshot is None else snapshot.list_dir
+    for depth, entry in walk_dir(path, errors, workers, scan_filter, list_dir_func):
+        del subtrees[depth:]
+        if entry.is_dir:
+            subtree: DirectoryTree = {}
+            subtrees[-1][entry.name] = subtree
+            subtrees.append(subtree)
+            if renderer is not None:
+                renderer.add_dir(depth, entry.name)
+        else:
+            subtrees[-1][entry.name] = None
+            if renderer is not None:
+                renderer.add_file(depth, entry.name)
+
+    if renderer is not None:
+        renderer.flush()
 
     # Wrap the result to include the root
-    return {path.name: _build(path)}
+    return {path.name: tree}
+
+def build_dir_table(
+        path: Path,
+        errors: Optional[list] = None,
+        workers: int = 1,
+        renderer: Optional[TreeRenderer] = None,
+        scan_filter: Optional[ScanFilter] = None,
+        snapshot: Optional[DirSnapshot] = None
+    ) -> DirTreeTable:
+    """
+    Builds a directory tree as a compact node table, starting from the given path
+    (the root element is the first node).
+
+    Takes the same arguments as `build_dir_tree`, and gives the same tree
+    (`DirTreeTable.to_dict()` returns the nested dictionary form).
+
+    Returns:
+        DirTreeTable: Node table of the directory tree.
+    """
+    table = DirTreeTable()
+    root = table.add_node(NO_NODE, path.name, True)
+    if renderer is not None:
+        renderer.add_dir(0, path.name)
+
+    # Nodes of the directories on the way to the current entry, the root first
+    parents = [root]
+    list_dir_func = list_dir if snapshot is None else snapshot.list_dir
+    for depth, entry in walk_dir(path, errors, workers, scan_filter, list_dir_func):
+        del parents[depth:]
+        node = table.add_node(parents[-1], entry.name, entry.is_dir)
+        if entry.is_dir:
+            parents.append(node)
+            if renderer is not None:
+                renderer.add_dir(depth, entry.name)
+        elif renderer is not None:
+            renderer.add_file(depth, entry.name)
+
+    if renderer is not None:
+        renderer.flush()
+
+    return table
+
+def build_dir_usage(
+        path: Path,
+        errors: Optional[list] = None,
+        workers: int = 1,
+        scan_filter: Optional[ScanFilter] = None,
+        snapshot: Optional[DirSnapshot] = None
+    ) -> DirUsage:
+    """
+    Builds a directory tree as a node table with size, file count and newest modification time
+    of every entry (totals of the whole subtree for directories), in a single walk.
+
+    Entries are checked right after their directory is listed (in the listing threads with
+    `workers` > 1), totals are rolled up bottom-up after the walk.
+
+    Args:
+        path (Path): The directory path to start building the tree from.
+        errors (list, optional): Container to add (path, message) errors of unreadable
+                                 directories, entries and symbolic link loops to.
+        workers (int): Number of threads listing and checking directories concurrently.
+        scan_filter (ScanFilter, optional): Exclude patterns and `.gitignore` filtering (excluded entries are not counted).
+        snapshot (DirSnapshot, optional): Snapshot to reuse listings of unchanged directories from.
+
+    Returns:
+        DirUsage: Rolled up values, with the node table as `table`.
+    """
+    table = DirTreeTable()
+    usage = DirUsage(table)
+    root = table.add_node(NO_NODE, path.name, True)
+    usage.add_node(0, False, 0)
 
-def display_tree(tree: DirectoryTree, level: int = 0):
+    # Nodes of the directories on the way to the current entry, the root first
+    parents = [root]
+    list_dir_func = list_dir if snapshot is None else snapshot.list_dir
+    for depth, entry in walk_dir(path, errors, workers, scan_filter, list_dir_func, with_stats=True):
+        del parents[depth:]
+        node = table.add_node(parents[-1], entry.name, entry.is_dir)
+        usage.add_node(entry.size, not entry.is_dir, entry.mtime_ns, entry.is_dir and entry.is_symlink)
+        if entry.is_dir:
+            parents.append(node)
+
+    usage.roll_up()
+    return usage
+
+def display_dir_usage(
+        usage: DirUsage,
+        renderer: Optional[TreeRenderer] = None,
+        max_depth: Optional[int] = None
+    ):
+    """
+    Prints a directory tree built by `build_dir_usage`, with the size, file count and newest
+    modification time after every name.
+
+    Args:
+        usage (DirUsage): Directory tree with its values.
+        renderer (TreeRenderer, optional): Renderer to write lines with (to stdout by default).
+        max_depth (int, optional): Maximal depth of displayed entries (totals still include deeper entries).
+
+    Returns:
+        None
+    """
+    renderer = TreeRenderer() if renderer is None else renderer
+    table = usage.table
+    for depth, node in table.walk(max_depth=max_depth):
+        if table.is_dir(node):
+            renderer.add_dir(depth, table.name(node), usage.details(node))
+        else:
+            renderer.add_file(depth, table.name(node), usage.details(node))
+    renderer.flush()
+
+def display_tree(
+        tree: Union[DirectoryTree, DirTreeTable],
+        level: int = 0,
+        renderer: Optional[TreeRenderer] = None
+    ):
     """
-    Recursively prints a structured directory tree from a nested dictionary.
+    Prints a structured directory tree from a nested dictionary.
 
-    This function takes a pre-built directory tree (created using `build_dir_tree`)
-    and displays its hierarchical structure using indentation and color coding.
+    This function takes a pre-built directory tree (created using `build_dir_tree`,
+    or a node table created using `build_dir_table`) and displays its hierarchical structure using indentation and color coding.
 
     - Directories are printed in blue followed by a slash.
     - Files are printed in green.
 
     Args:
-        tree (DirectoryTree): A nested dictionary representing the directory tree.
-        level (int, optional): The current depth level for indentation (used internally).
+        tree (DirectoryTree | DirTreeTable): A nested dictionary or a node table representing the directory tree.
+        level (int, optional): The depth level of the tree, used for indentation.
+        renderer (TreeRenderer, optional): Renderer to write lines with (to stdout by default).
 
     Returns:
         None
     """
-    for name, subtree in tree.items():
-        indent = INDENT_PER_LEVEL * level
+    renderer = TreeRenderer() if renderer is None else renderer
+
+    if isinstance(tree, DirTreeTable):
+        # Nodes are walked by their links
+        for depth, node in tree.walk():
+            if tree.is_dir(node):
+                renderer.add_dir(level + depth, tree.name(node))
+            else:
+                renderer.add_file(level + depth, tree.name(node))
+        renderer.flush()
+        return
+
+    # Items of the subtrees on the way to the current one, walked without recursion
+    stack = [iter(tree.items())]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+
+        name, subtree = item
         if subtree is None:
-            print(f"{indent}{Fore.GREEN}{name}")
+            renderer.add_file(level + len(stack) - 1, name)
         else:
-            print(f"{indent}{Fore.BLUE}{name}/")
-            display_tree(subtree, level + 1)
+            renderer.add_dir(level + len(stack) - 1, name)
+            stack.append(iter(subtree.items()))
+    renderer.flush()
+
+def display_tree_changes(changes: list[TreeChange], renderer: Optional[TreeRenderer] = None):
+    """
+    Prints changes of a watched directory tree: every changed directory followed by its added
+    (with their whole content) and removed entries.
+
+    Args:
+        changes (list[TreeChange]): Changes grouped by directory (see `dir_watcher.DirTreeWatcher`).
+        renderer (TreeRenderer, optional): Renderer to write lines with (to stdout by default).
+
+    Returns:
+        None
+    """
+    renderer = TreeRenderer() if renderer is None else renderer
+    dir_path = None
+    for change in changes:
+        if change.dir_path != dir_path:
+            dir_path = change.dir_path
+            renderer.add_dir(0, dir_path, f"changed at {time.strftime('%H:%M:%S')}")
+
+        details = "(added)" if change.added else "(removed)"
+        if not change.is_dir:
+            renderer.add_file(1, change.name, details)
+            continue
+        renderer.add_dir(1, change.name, details)
+        if change.subtree:
+            display_tree(change.subtree, level=2, renderer=renderer)
+    renderer.flush()
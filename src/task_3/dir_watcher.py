@@ -0,0 +1,452 @@
+"""
+Watching a directory tree for changes and patching its `DirectoryTree` in place.
+
+Every directory of the tree is watched with Linux inotify (through `ctypes`, events are read
+with `select`), or, where inotify is not available, by polling modification times of the
+directories. Changes only mark directories as changed; after a burst of events calms down
+(debouncing), every changed directory is listed again and its dictionary is patched:
+removed entries are dropped, added ones are inserted (new directories are loaded with their
+whole content), existing subtrees are kept as they are. Renames are a removal and an addition.
+
+Directories are listed with `dir_scanner.scan_dir`, so exclude patterns, `.gitignore` rules
+and the depth limit apply as in a single walk, and symbolic link loops are not followed.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import NamedTuple, Optional
+
+from dir_filter import DirScope, ScanFilter
+from dir_scanner import report_scan_error, resolve_subdir, scan_dir
+
+DEBOUNCE_INTERVAL = 0.2  # seconds without events before changes are applied
+MAX_DEBOUNCE_DELAY = 2.0  # seconds - changes are applied at least that often during a long burst
+POLL_INTERVAL = 1.0  # seconds between checks of modification times (without inotify)
+
+# inotify constants (see <sys/inotify.h>)
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+READ_SIZE = 64 * 1024
+
+class InotifyEvents:
+    """
+    Changed directories reported by Linux inotify.
+
+    Raises:
+        OSError: If inotify is not available.
+    """
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is available on Linux only")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not supported by the C library")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        # Paths per watch descriptor (one directory may be reached by many paths through symbolic links)
+        self._wd_paths: dict[int, set[str]] = {}
+        self._path_wds: dict[str, int] = {}
+
+    def add(self, path: str) -> None:
+        """
+        Starts watching a directory.
+
+        Raises:
+            OSError: If the directory can't be watched (e.g. the limit of watches is reached).
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        self._wd_paths.setdefault(wd, set()).add(path)
+        self._path_wds[path] = wd
+
+    def remove(self, path: str) -> None:
+        """
+        Stops watching a directory (the watch is removed when no other path leads to it).
+        """
+        wd = self._path_wds.pop(path, None)
+        if wd is None:
+            return
+        paths = self._wd_paths.get(wd)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del self._wd_paths[wd]
+                self._libc.inotify_rm_watch(self._fd, wd)
+
+    def wait(self, timeout: Optional[float]) -> Optional[set[str]]:
+        """
+        Waits for events.
+
+        Args:
+            timeout (float, optional): Seconds to wait (None to wait for the first event).
+
+        Returns:
+            Optional[set[str]]: Changed directories (empty if there were no events),
+                                None if events were lost and the whole tree has to be loaded again.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_size = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + name_size
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                if mask & IN_IGNORED:
+                    # The directory is gone, its parent reports the removal
+                    for path in self._wd_paths.pop(wd, ()):
+                        self._path_wds.pop(path, None)
+                    continue
+                changed.update(self._wd_paths.get(wd, ()))
+        return changed
+
+    def close(self) -> None:
+        """
+        Stops watching all directories.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+class PollingEvents:
+    """
+    Changed directories found by checking their modification times periodically.
+
+    Args:
+        interval (float): Seconds between checks.
+    """
+
+    def __init__(self, interval: float = POLL_INTERVAL):
+        self.interval = interval
+        self._next_poll = time.monotonic() + interval
+        # Modification time and inode per directory (None if it can't be checked)
+        self._states: dict[str, Optional[tuple[int, int]]] = {}
+
+    @staticmethod
+    def _state(path: str) -> Optional[tuple[int, int]]:
+        """Returns the modification time and inode of a directory."""
+        try:
+            dir_stat = os.stat(path)
+        except OSError:
+            return None
+        return dir_stat.st_mtime_ns, dir_stat.st_ino
+
+    def add(self, path: str) -> None:
+        """
+        Starts watching a directory.
+        """
+        self._states[path] = self._state(path)
+
+    def remove(self, path: str) -> None:
+        """
+        Stops watching a directory.
+        """
+        self._states.pop(path, None)
+
+    def wait(self, timeout: Optional[float]) -> Optional[set[str]]:
+        """
+        Waits for the next check (if it is due within the timeout) and checks all directories.
+
+        Args:
+            timeout (float, optional): Seconds to wait (None to wait until a change is found).
+
+        Returns:
+            Optional[set[str]]: Changed directories (empty if there were none).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if deadline is not None and deadline < self._next_poll:
+                time.sleep(max(deadline - now, 0))
+                return set()
+            time.sleep(max(self._next_poll - now, 0))
+            self._next_poll = time.monotonic() + self.interval
+
+            changed = set()
+            for path, state in self._states.items():
+                new_state = self._state(path)
+                if new_state != state:
+                    self._states[path] = new_state
+                    changed.add(path)
+            if changed or deadline is not None:
+                return changed
+
+    def close(self) -> None:
+        """
+        Stops watching all directories.
+        """
+        self._states.clear()
+
+class TreeChange(NamedTuple):
+    """
+    Single change of a watched tree.
+
+    Attributes:
+        dir_path (str): Display path of the changed directory (starting with the root name).
+        name (str): Name of the added or removed entry.
+        is_dir (bool): The entry is a directory.
+        added (bool): The entry was added (removed otherwise).
+        subtree (dict, optional): Content of an added directory (None otherwise).
+    """
+    dir_path: str
+    name: str
+    is_dir: bool
+    added: bool
+    subtree: Optional[dict]
+
+class WatchedDir(NamedTuple):
+    """
+    Loaded directory of a watched tree.
+
+    Attributes:
+        subtree (dict): Content of the directory in the tree.
+        scope (DirScope): Filtering state of the directory, before its own `.gitignore` rules are read.
+        real_path (str): Resolved path of the directory (to detect symbolic link loops).
+        open_real_paths (frozenset[str]): Resolved paths of the directory and the directories
+                                          on the way to it from the root (to detect symbolic link loops).
+        display_path (str): Path shown with changes (starting with the root name).
+    """
+    subtree: dict
+    scope: DirScope
+    real_path: str
+    open_real_paths: frozenset[str]
+    display_path: str
+
+class DirTreeWatcher:
+    """
+    Keeps a `DirectoryTree` of a directory up to date.
+
+    The tree is loaded when the watcher is created, `wait_for_changes` then patches it
+    and returns the changes.
+
+    Args:
+        path (str): Root directory path.
+        scan_filter (ScanFilter, optional): Exclude patterns, `.gitignore` filtering and depth limit.
+        errors (list, optional): Container to add (path, message) errors to.
+        use_inotify (bool): Use inotify if it is available (modification times are polled otherwise).
+    """
+
+    def __init__(
+            self,
+            path: str,
+            scan_filter: Optional[ScanFilter] = None,
+            errors: Optional[list] = None,
+            use_inotify: bool = True
+        ):
+        self.path = os.fspath(path)
+        self.scan_filter = ScanFilter() if scan_filter is None else scan_filter
+        self.errors = errors
+        self.events = None
+        if use_inotify:
+            try:
+                self.events = InotifyEvents()
+            except OSError:
+                self.events = None
+        if self.events is None:
+            self.events = PollingEvents()
+        self._dirs: dict[str, WatchedDir] = {}
+        self.tree: dict = {}
+        self.load()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Changes are reported by inotify (not found by polling)."""
+        return isinstance(self.events, InotifyEvents)
+
+    def load(self) -> None:
+        """
+        Loads the whole tree (again), watching all its directories.
+        """
+        for dir_path in self._dirs:
+            self.events.remove(dir_path)
+        self._dirs.clear()
+
+        root_name = os.path.basename(os.path.abspath(self.path))
+        root_subtree: dict = {}
+        self.tree = {root_name: root_subtree}
+        root_real_path = os.path.realpath(self.path)
+        self._load_dir(
+            self.path, root_real_path, frozenset((root_real_path,)), self.scan_filter.root_scope(), root_subtree, root_name
+        )
+
+    def _load_dir(
+            self,
+            path: str,
+            real_path: str,
+            open_real_paths: frozenset[str],
+            scope: DirScope,
+            subtree: dict,
+            display_path: str
+        ) -> None:
+        """Loads a directory with its whole content into the (empty) subtree, without recursion."""
+        stack = [(path, real_path, open_real_paths, scope, subtree, display_path)]
+        while stack:
+            dir_path, dir_real_path, dir_open_real_paths, dir_scope, dir_subtree, dir_display_path = stack.pop()
+            # Watched before it is listed, so no change after the listing is missed
+            try:
+                self.events.add(dir_path)
+            except OSError as exc:
+                report_scan_error(dir_path, f"Not watched: {exc.strerror or exc}", self.errors)
+            self._dirs[dir_path] = WatchedDir(dir_subtree, dir_scope, dir_real_path, dir_open_real_paths, dir_display_path)
+
+            entries, list_errors, entries_scope = scan_dir(dir_path, dir_scope)
+            if self.errors is not None:
+                self.errors.extend(list_errors)
+            for entry in entries:
+                if not entry.is_dir:
+                    dir_subtree[entry.name] = None
+                    continue
+                child_subtree: dict = {}
+                dir_subtree[entry.name] = child_subtree
+                child = self._child_dir(entry, dir_real_path, dir_open_real_paths, entries_scope)
+                if child is not None:
+                    child_real_path, child_scope = child
+                    stack.append((
+                        entry.path, child_real_path, dir_open_real_paths | {child_real_path}, child_scope,
+                        child_subtree, f"{dir_display_path}/{entry.name}"
+                    ))
+
+    def _child_dir(
+            self,
+            entry,
+            real_path: str,
+            open_real_paths: frozenset[str],
+            scope: DirScope
+        ) -> Optional[tuple[str, DirScope]]:
+        """Returns the resolved path and scope of a subdirectory to load (None for depth limit and loops)."""
+        if not scope.opens_subdirs:
+            return None
+        child_real_path = resolve_subdir(entry, real_path, open_real_paths)
+        if child_real_path is None:
+            report_scan_error(entry.path, "Symbolic link loop, not followed", self.errors)
+            return None
+        return child_real_path, scope.child(entry.name)
+
+    def _forget_dir(self, path: str) -> None:
+        """Stops watching a removed directory and all directories loaded inside it."""
+        stack = [path]
+        while stack:
+            dir_path = stack.pop()
+            watched = self._dirs.pop(dir_path, None)
+            if watched is None:
+                continue
+            self.events.remove(dir_path)
+            stack.extend(
+                os.path.join(dir_path, name) for name, subtree in watched.subtree.items() if subtree is not None
+            )
+
+    def _patch_dir(self, path: str) -> list[TreeChange]:
+        """Lists a changed directory again and patches its subtree."""
+        watched = self._dirs.get(path)
+        if watched is None:
+            # Removed together with a changed parent
+            return []
+
+        entries, list_errors, entries_scope = scan_dir(path, watched.scope)
+        if self.errors is not None:
+            self.errors.extend(list_errors)
+        if not entries and list_errors and not os.path.isdir(path):
+            # The directory itself is gone, its parent reports the removal
+            return []
+
+        old_items = watched.subtree
+        new_items: dict = {}
+        changes = []
+        for entry in entries:
+            old_subtree = old_items.get(entry.name, ...)
+            if entry.is_dir and isinstance(old_subtree, dict):
+                # Existing directory, kept as it is
+                new_items[entry.name] = old_subtree
+            elif not entry.is_dir and old_subtree is None:
+                new_items[entry.name] = None
+            elif entry.is_dir:
+                subtree: dict = {}
+                child = self._child_dir(entry, watched.real_path, watched.open_real_paths, entries_scope)
+                if child is not None:
+                    child_real_path, child_scope = child
+                    self._load_dir(
+                        entry.path, child_real_path, watched.open_real_paths | {child_real_path}, child_scope,
+                        subtree, f"{watched.display_path}/{entry.name}"
+                    )
+                new_items[entry.name] = subtree
+                changes.append(TreeChange(watched.display_path, entry.name, True, True, subtree))
+            else:
+                new_items[entry.name] = None
+                changes.append(TreeChange(watched.display_path, entry.name, False, True, None))
+
+        for name, old_subtree in old_items.items():
+            new_subtree = new_items.get(name, ...)
+            if new_subtree is ... or (new_subtree is None) != (old_subtree is None):
+                # Removed, or replaced with an entry of another type
+                if old_subtree is not None:
+                    self._forget_dir(os.path.join(path, name))
+                changes.append(TreeChange(watched.display_path, name, old_subtree is not None, False, None))
+
+        old_items.clear()
+        old_items.update(new_items)
+        return changes
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> Optional[list[TreeChange]]:
+        """
+        Waits for changes, waits until a burst of them calms down and patches the tree.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the first change (None to wait until there is one).
+
+        Returns:
+            Optional[list[TreeChange]]: Changes grouped by directory (empty if there were none),
+                                        None if the whole tree was loaded again (events were lost).
+        """
+        changed = self.events.wait(timeout)
+        deadline = time.monotonic() + MAX_DEBOUNCE_DELAY
+        while changed and time.monotonic() < deadline:
+            more_changed = self.events.wait(DEBOUNCE_INTERVAL)
+            if more_changed is None:
+                changed = None
+            elif not more_changed:
+                break
+            else:
+                changed |= more_changed
+
+        if changed is None:
+            self.load()
+            return None
+
+        changes = []
+        # Parents first, so directories removed with their parents are skipped
+        for path in sorted(changed, key=lambda dir_path: (dir_path.count(os.sep), dir_path)):
+            changes.extend(self._patch_dir(path))
+        return changes
+
+    def close(self) -> None:
+        """
+        Stops watching the tree.
+        """
+        self.events.close()
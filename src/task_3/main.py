@@ -6,13 +6,133 @@ and then recursively prints all subdirectories and files with color distinction
 (using the colorama library).
 
 Use the --tree flag to switch between simple and structured output.
+Use the --workers N option to list directories concurrently on slow (network or FUSE) file systems.
+Use --max-depth N, --exclude GLOB and --gitignore to skip parts of the tree (they are not walked at all).
+Use --snapshot FILE to list only directories changed since the previous run with the same snapshot file.
+Use --sizes to show sizes, file counts and newest modification times (with --sort size and --top N
+to find where the space goes), collected in the same walk.
+Use --watch to keep watching the directory and print its changes (until interrupted with Ctrl+C).
+Use --export ndjson|json to write the structure as NDJSON records or nested JSON instead
+(streamed while the directory is walked, warnings go to stderr).
+Use --duplicates to find files with the same content and print them with the reclaimable space.
 """
 
+import argparse
 import sys
 from pathlib import Path
 from colorama import init, Fore
 
-from dir_visualizer import visualize_dir_structure, build_dir_tree, display_tree
+from dir_duplicates import DuplicateGroup, find_duplicates
+from dir_filter import ScanFilter
+from dir_scanner import list_dir
+from dir_snapshot import DirSnapshot
+from dir_usage import format_size
+from dir_visualizer import (
+    visualize_dir_structure,
+    build_dir_tree,
+    build_dir_usage,
+    display_dir_usage,
+    display_tree,
+    display_tree_changes,
+)
+from dir_watcher import DirTreeWatcher
+from tree_export import export_json, export_ndjson
+from tree_renderer import is_terminal, paint, TreeRenderer
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments of the script.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Visualize the structure of a directory.")
+    parser.add_argument("path", nargs="?", help="path to the directory to visualize (current directory by default)")
+    parser.add_argument("--tree", action="store_true", help="display the structure using a structured tree view")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        default=1,
+        help="number of threads listing directories concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        metavar="N",
+        help="maximal depth of displayed entries (1 for the content of the directory only)"
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="exclude entries matching the pattern (names, or relative paths for patterns with a slash); repeatable"
+    )
+    parser.add_argument(
+        "--gitignore",
+        action="store_true",
+        help="exclude entries ignored by .gitignore files of the directory (and .git directories)"
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="FILE",
+        help="snapshot file of directory listings - only directories changed since the previous run are listed"
+    )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="list every directory and rebuild the snapshot file (with --snapshot)"
+    )
+    parser.add_argument(
+        "--sizes",
+        action="store_true",
+        help="show size, file count and newest modification time of every entry (totals for directories)"
+    )
+    parser.add_argument(
+        "--sort",
+        choices=("name", "size"),
+        default="name",
+        help="order of entries in a directory (default: name, size implies --sizes)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        metavar="N",
+        help="also print N largest subdirectories (implies --sizes)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="display the structure, then keep watching it and display its changes (until Ctrl+C)"
+    )
+    parser.add_argument(
+        "--export",
+        choices=("ndjson", "json"),
+        help="write the structure with sizes as NDJSON records or nested JSON, streamed during the walk"
+    )
+    parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="find files with the same content (by size, partial hash and full hash) and print them"
+    )
+    args = parser.parse_args()
+    if args.export and (args.tree or args.watch or args.sizes or args.sort == "size" or args.top is not None):
+        parser.error("--export can't be used with --tree, --watch, --sizes, --sort size or --top")
+    if args.duplicates and (
+        args.tree or args.watch or args.export or args.sizes or args.sort == "size" or args.top is not None
+    ):
+        parser.error("--duplicates can't be used with --tree, --watch, --export, --sizes, --sort size or --top")
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    args.sizes = args.sizes or args.sort == "size" or args.top is not None
+    if args.watch and (args.sizes or args.snapshot):
+        parser.error("--watch can't be used with --sizes, --sort size, --top or --snapshot")
+    if args.rescan and not args.snapshot:
+        parser.error("--rescan requires --snapshot")
+    if args.max_depth is not None and args.max_depth < 1:
+        parser.error("--max-depth must be at least 1")
+    return args
 
 def main():
     """
@@ -28,43 +148,197 @@ def main():
     Command-line arguments:
         path (str): Required. Path to the directory to visualize.
         --tree (flag): Optional. Displays the structure using a structured tree view.
+        --workers N (option): Optional. Number of threads listing directories concurrently,
+                              the output is the same (default: 1).
+        --max-depth N (option): Optional. Maximal depth of displayed entries.
+        --exclude GLOB (option): Optional, repeatable. Pattern of entries to exclude.
+        --gitignore (flag): Optional. Excludes entries ignored by .gitignore files.
+        --snapshot FILE (option): Optional. Snapshot file of directory listings, reused for unchanged
+                                  directories and updated after the run.
+        --rescan (flag): Optional. Lists every directory and rebuilds the snapshot file.
+        --sizes (flag): Optional. Shows size, file count and newest modification time of every entry.
+        --sort name|size (option): Optional. Order of entries in a directory (default: name).
+        --top N (option): Optional. Also prints N largest subdirectories.
+        --watch (flag): Optional. Keeps watching the directory (inotify on Linux, polling elsewhere)
+                        and displays its changes.
+        --export ndjson|json (option): Optional. Writes the structure as NDJSON records (path, depth,
+                                       type, symlink, size) or nested JSON, streamed during the walk.
+        --duplicates (flag): Optional. Prints groups of files with the same content and the space
+                             freed by keeping one file of each group.
 
     Returns:
         None
     """
 
-    # Initialize colorama for Windows compatibility
-    init(autoreset=True)
+    args = parse_args()
 
-    # Determine the base path
-    args = []
-    for arg in sys.argv[1:]:
-        if not arg.startswith('--'):
-            args.append(arg)
+    # Colors are used only in a terminal, piped output is plain text written without colorama
+    # (exported JSON goes to stdout, messages to stderr)
+    message_stream = sys.stderr if args.export else sys.stdout
+    use_color = is_terminal(message_stream)
+    if use_color:
+        # Initialize colorama for Windows compatibility
+        init(autoreset=True)
 
-    if args:
-        path = (Path(__file__).parent / args[0]).resolve()
+    # Determine the base path
+    if args.path:
+        path = (Path(__file__).parent / args.path).resolve()
     else:
         path = Path.cwd()
 
     # Validate path
     if not path.exists():
-        print(Fore.RED + f"Error: The path '{path}' does not exist.")
+        print(paint(f"Error: The path '{path}' does not exist.", Fore.RED, use_color), file=message_stream)
         sys.exit(1)
 
     if not path.is_dir():
-        print(Fore.RED + f"Error: The path '{path}' is not a directory.")
+        print(paint(f"Error: The path '{path}' is not a directory.", Fore.RED, use_color), file=message_stream)
         sys.exit(1)
 
+    # Unreadable directories and symbolic link loops are skipped and reported after the structure
+    scan_errors = []
+    renderer = TreeRenderer(sys.stdout, color=use_color)
+    # Excluded directories and directories below the depth limit are not walked
+    # (with sizes the whole tree is walked for the totals, only the display is limited)
+    scan_filter = ScanFilter(args.exclude, args.gitignore, None if args.sizes else args.max_depth)
+    # Listings of directories not changed since the previous run are taken from the snapshot
+    snapshot = DirSnapshot(args.snapshot, rescan=args.rescan) if args.snapshot else None
+
      # Visualize
-    if "--tree" in sys.argv:
+    if args.export:
+        # Option - Machine-readable output, written while the directory is walked
+        export = export_ndjson if args.export == "ndjson" else export_json
+        export(
+            path,
+            sys.stdout,
+            scan_errors,
+            args.workers,
+            scan_filter=scan_filter,
+            list_dir_func=list_dir if snapshot is None else snapshot.list_dir
+        )
+    elif args.duplicates:
+        # Option - Files with the same content, only files sharing a size are read
+        duplicates = find_duplicates(
+            path,
+            scan_errors,
+            args.workers,
+            scan_filter=scan_filter,
+            list_dir_func=list_dir if snapshot is None else snapshot.list_dir
+        )
+        print_duplicates(duplicates)
+    elif args.watch:
+        # Option - The tree is kept up to date, only changed directories are displayed
+        watch_dir_tree(path, renderer, scan_filter, scan_errors, use_color)
+    elif args.sizes:
+        # Option - Disk usage: the tree is built as a node table with totals, then displayed
+        usage = build_dir_usage(path, scan_errors, args.workers, scan_filter=scan_filter, snapshot=snapshot)
+        if args.sort == "size":
+            usage.sort_by_size()
+        display_dir_usage(usage, renderer, max_depth=args.max_depth)
+        if args.top:
+            print(f"Largest {args.top} subdirector{'ies' if args.top != 1 else 'y'}:")
+            for node in usage.largest_subtrees(args.top):
+                print(f"  {format_size(usage.sizes[node]).rjust(10)}  {usage.table.path(node)}/")
+    elif args.tree:
         # Option - More complex architecture-wise solution using
         #          data structure-based tree representation
-        dir_tree = build_dir_tree(path)
-        display_tree(dir_tree)
+        #          (displayed while it is built)
+        build_dir_tree(
+            path,
+            scan_errors,
+            args.workers,
+            renderer=renderer,
+            scan_filter=scan_filter,
+            snapshot=snapshot
+        )
     else:
         # Option - More straight-forward approach
-        visualize_dir_structure(path)
+        visualize_dir_structure(
+            path,
+            errors=scan_errors,
+            workers=args.workers,
+            renderer=renderer,
+            scan_filter=scan_filter,
+            snapshot=snapshot
+        )
+
+    if snapshot is not None:
+        try:
+            snapshot.save()
+        except OSError as exc:
+            scan_errors.append((args.snapshot, f"Snapshot not saved: {exc.strerror or exc}"))
+
+    print_scan_errors(scan_errors, use_color, message_stream)
+
+def print_scan_errors(scan_errors: list[tuple[str, str]], use_color: bool, stream=None) -> None:
+    """
+    Prints traversal errors as warnings and clears them.
+
+    Args:
+        scan_errors (list): (path, message) errors.
+        use_color (bool): Color the warnings.
+        stream (TextIO, optional): Output stream (stdout by default).
+    """
+    for error_path, message in scan_errors:
+        print(paint(f"Warning: '{error_path}': {message}", Fore.YELLOW, use_color), file=stream)
+    scan_errors.clear()
+
+def print_duplicates(duplicates: list[DuplicateGroup]) -> None:
+    """
+    Prints groups of duplicate files with their reclaimable space, and the totals.
+
+    Args:
+        duplicates (list[DuplicateGroup]): Groups of duplicates.
+    """
+    lines = []
+    for group in duplicates:
+        lines.append(
+            f"{len(group.paths)} files of {format_size(group.size)} "
+            f"({format_size(group.reclaimable)} reclaimable):"
+        )
+        lines.extend(f"  {file_path}" for file_path in group.paths)
+    reclaimable = sum(group.reclaimable for group in duplicates)
+    lines.append(
+        f"Duplicate groups: {len(duplicates)}, reclaimable: {format_size(reclaimable)} ({reclaimable} bytes)"
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def watch_dir_tree(
+        path: Path,
+        renderer: TreeRenderer,
+        scan_filter: ScanFilter,
+        scan_errors: list[tuple[str, str]],
+        use_color: bool
+    ) -> None:
+    """
+    Displays the structure of a directory, then displays its changes until interrupted (Ctrl+C).
+
+    Args:
+        path (Path): The directory path to watch.
+        renderer (TreeRenderer): Renderer to write lines with.
+        scan_filter (ScanFilter): Exclude patterns, `.gitignore` filtering and depth limit.
+        scan_errors (list): Container of (path, message) errors, printed after every update.
+        use_color (bool): Color the warnings.
+    """
+    watcher = DirTreeWatcher(path, scan_filter, scan_errors)
+    try:
+        display_tree(watcher.tree, renderer=renderer)
+        if not watcher.uses_inotify:
+            scan_errors.append((str(path), "inotify is not available, directories are polled for changes"))
+        print_scan_errors(scan_errors, use_color)
+
+        while True:
+            changes = watcher.wait_for_changes()
+            if changes is None:
+                # Events were lost, the whole tree was loaded again
+                display_tree(watcher.tree, renderer=renderer)
+            elif changes:
+                display_tree_changes(changes, renderer)
+            print_scan_errors(scan_errors, use_color)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,164 @@
+"""
+Streaming machine-readable export of a directory tree (NDJSON and nested JSON).
+
+Entries are written while the tree is walked, nothing but the directories on the way to
+the current entry is kept in memory, so trees of any size can be exported.
+
+- NDJSON: one JSON object per line with "path" (starting with the root name, "/"-separated),
+  "depth" (0 for the root), "type" ("dir" or "file"), "symlink" and "size". Files are written
+  as they are found. A directory is written after its content, with the total size of the content.
+- JSON: one nested object {"name", "type", "symlink", "children": [...], "size"} per directory
+  ({"name", "type", "symlink", "size"} per file), serialized piece by piece. The total size of
+  a directory follows its children.
+
+Sizes are apparent sizes in bytes (see `dir_usage`), content of followed symbolic links to directories
+is not counted in the totals of their parents.
+"""
+
+import json
+import os
+from typing import Optional, TextIO
+
+from dir_filter import ScanFilter
+from dir_scanner import ListDirFunc, list_dir, walk_dir
+from tree_renderer import LINES_PER_WRITE
+
+class ExportWriter:
+    """
+    Collects pieces of the output and writes them to the stream in large chunks.
+
+    Args:
+        stream (TextIO): Output stream.
+        pieces_per_write (int): Number of pieces collected before they are written.
+    """
+
+    def __init__(self, stream: TextIO, pieces_per_write: int = LINES_PER_WRITE):
+        self.stream = stream
+        self.pieces_per_write = pieces_per_write
+        self._pieces: list[str] = []
+
+    def write(self, piece: str) -> None:
+        """Collects a piece of the output."""
+        self._pieces.append(piece)
+        if len(self._pieces) >= self.pieces_per_write:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes collected pieces to the stream at once."""
+        if self._pieces:
+            self.stream.write("".join(self._pieces))
+            self._pieces.clear()
+        self.stream.flush()
+
+def export_ndjson(
+        path,
+        stream: TextIO,
+        errors: Optional[list] = None,
+        workers: int = 1,
+        scan_filter: Optional[ScanFilter] = None,
+        list_dir_func: ListDirFunc = list_dir
+    ) -> None:
+    """
+    Writes entries of a directory tree as NDJSON records while the tree is walked.
+
+    Args:
+        path: Root directory path.
+        stream (TextIO): Output stream.
+        errors (list, optional): Container to add (path, message) errors to.
+        workers (int): Number of threads listing and checking directories concurrently.
+        scan_filter (ScanFilter, optional): Exclude patterns, `.gitignore` filtering and depth limit.
+        list_dir_func (ListDirFunc): Function listing a directory (see `dir_scanner.walk_dir`).
+    """
+    writer = ExportWriter(stream)
+    root_name = os.path.basename(os.path.abspath(path))
+
+    def write_dir(dir_path: str, depth: int, is_symlink: bool, size: int) -> None:
+        writer.write(
+            f'{{"path": {json.dumps(dir_path)}, "depth": {depth}, "type": "dir", '
+            f'"symlink": {json.dumps(is_symlink)}, "size": {size}}}\n'
+        )
+
+    # Directories on the way to the current entry: path, whether it is a symbolic link and total size
+    open_dirs = [[root_name, False, 0]]
+    for depth, entry in walk_dir(path, errors, workers, scan_filter, list_dir_func, with_stats=True):
+        while len(open_dirs) > depth:
+            dir_path, is_symlink, size = open_dirs.pop()
+            write_dir(dir_path, len(open_dirs), is_symlink, size)
+            if not is_symlink:
+                open_dirs[-1][2] += size
+
+        entry_path = f"{open_dirs[-1][0]}/{entry.name}"
+        if entry.is_dir:
+            open_dirs.append([entry_path, entry.is_symlink, 0])
+        else:
+            open_dirs[-1][2] += entry.size
+            writer.write(
+                f'{{"path": {json.dumps(entry_path)}, "depth": {depth}, "type": "file", '
+                f'"symlink": {json.dumps(entry.is_symlink)}, "size": {entry.size}}}\n'
+            )
+
+    while open_dirs:
+        dir_path, is_symlink, size = open_dirs.pop()
+        write_dir(dir_path, len(open_dirs), is_symlink, size)
+        if open_dirs and not is_symlink:
+            open_dirs[-1][2] += size
+    writer.flush()
+
+def export_json(
+        path,
+        stream: TextIO,
+        errors: Optional[list] = None,
+        workers: int = 1,
+        scan_filter: Optional[ScanFilter] = None,
+        list_dir_func: ListDirFunc = list_dir
+    ) -> None:
+    """
+    Writes a directory tree as a single nested JSON object, serialized while the tree is walked.
+
+    Args:
+        path: Root directory path.
+        stream (TextIO): Output stream.
+        errors (list, optional): Container to add (path, message) errors to.
+        workers (int): Number of threads listing and checking directories concurrently.
+        scan_filter (ScanFilter, optional): Exclude patterns, `.gitignore` filtering and depth limit.
+        list_dir_func (ListDirFunc): Function listing a directory (see `dir_scanner.walk_dir`).
+    """
+    writer = ExportWriter(stream)
+    root_name = os.path.basename(os.path.abspath(path))
+    writer.write(f'{{"name": {json.dumps(root_name)}, "type": "dir", "symlink": false, "children": [')
+
+    # Directories on the way to the current entry: whether it is a symbolic link, total size
+    # and whether it has children written already
+    open_dirs = [[False, 0, False]]
+    for depth, entry in walk_dir(path, errors, workers, scan_filter, list_dir_func, with_stats=True):
+        while len(open_dirs) > depth:
+            is_symlink, size, _ = open_dirs.pop()
+            writer.write(f'], "size": {size}}}')
+            if not is_symlink:
+                open_dirs[-1][1] += size
+
+        parent = open_dirs[-1]
+        if parent[2]:
+            writer.write(", ")
+        parent[2] = True
+
+        if entry.is_dir:
+            writer.write(
+                f'{{"name": {json.dumps(entry.name)}, "type": "dir", '
+                f'"symlink": {json.dumps(entry.is_symlink)}, "children": ['
+            )
+            open_dirs.append([entry.is_symlink, 0, False])
+        else:
+            parent[1] += entry.size
+            writer.write(
+                f'{{"name": {json.dumps(entry.name)}, "type": "file", '
+                f'"symlink": {json.dumps(entry.is_symlink)}, "size": {entry.size}}}'
+            )
+
+    while open_dirs:
+        is_symlink, size, _ = open_dirs.pop()
+        writer.write(f'], "size": {size}}}')
+        if open_dirs and not is_symlink:
+            open_dirs[-1][1] += size
+    writer.write("\n")
+    writer.flush()
@@ -0,0 +1,130 @@
+"""
+Buffered rendering of directory structures.
+
+Lines are collected and written to the output stream in large chunks (a few system calls
+for the whole tree instead of one `print()` per entry). Indentation and color prefixes are
+built once per depth level. Colors are used only when the output is a terminal, so piped
+output is plain text written without colorama in the way.
+
+Chunks are also written when some time passed since the last write, so a structure
+is displayed while it is still being walked.
+"""
+
+import sys
+import time
+from typing import Optional, TextIO
+
+from colorama import Fore, Style
+
+INDENT_PER_LEVEL = " " * 4
+LINES_PER_WRITE = 8192  # lines collected before they are written
+FLUSH_INTERVAL = 0.1  # seconds - pending lines are written at least that often
+FLUSH_CHECK_LINES = 256  # lines between checks of the flush interval
+
+def is_terminal(stream: TextIO) -> bool:
+    """
+    Checks if a stream is an interactive terminal (colors are used only there).
+    """
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+def paint(text: str, color: str, enabled: bool) -> str:
+    """
+    Colors the text with a colorama color, if colors are enabled.
+    """
+    return f"{color}{text}{Style.RESET_ALL}" if enabled else text
+
+class TreeRenderer:
+    """
+    Writes lines of a directory structure to a stream in large chunks.
+
+    Directories are written in blue followed by a slash, files in green (with colors enabled).
+    Use as a context manager or call `flush()` to write the remaining lines.
+
+    Args:
+        stream (TextIO, optional): Output stream (`sys.stdout` by default).
+        color (bool, optional): Use colors (by default only if the stream is a terminal).
+        lines_per_write (int): Number of lines collected before they are written.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, color: Optional[bool] = None, lines_per_write: int = LINES_PER_WRITE):
+        self.stream = sys.stdout if stream is None else stream
+        self.color = is_terminal(self.stream) if color is None else color
+        self.lines_per_write = lines_per_write
+        self._lines: list[str] = []
+        self._last_write = time.monotonic()
+
+        if self.color:
+            self._dir_color, self._file_color = Fore.BLUE, Fore.GREEN
+            self._dir_end, self._file_end = f"/{Style.RESET_ALL}", Style.RESET_ALL
+        else:
+            self._dir_color = self._file_color = ""
+            self._dir_end, self._file_end = "/", ""
+        # Indentation with the color of directory and file names per depth level
+        self._dir_prefixes: list[str] = []
+        self._file_prefixes: list[str] = []
+
+    def __enter__(self) -> "TreeRenderer":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.flush()
+
+    def _add_prefixes(self, depth: int) -> None:
+        """Builds prefixes of depth levels up to the given one."""
+        for level in range(len(self._dir_prefixes), depth + 1):
+            self._dir_prefixes.append(INDENT_PER_LEVEL * level + self._dir_color)
+            self._file_prefixes.append(INDENT_PER_LEVEL * level + self._file_color)
+
+    def _add_line(self, line: str) -> None:
+        """Collects a line and writes collected lines when there are enough of them or it's time."""
+        lines = self._lines
+        lines.append(line)
+        if len(lines) >= self.lines_per_write or (
+                len(lines) % FLUSH_CHECK_LINES == 0 and time.monotonic() - self._last_write >= FLUSH_INTERVAL
+        ):
+            self.flush()
+
+    def add_dir(self, depth: int, name: str, details: str = "") -> None:
+        """
+        Adds a directory line.
+
+        Args:
+            depth (int): Depth level (0 for the root).
+            name (str): Directory name.
+            details (str): Text shown after the name (not colored).
+        """
+        if depth >= len(self._dir_prefixes):
+            self._add_prefixes(depth)
+        if details:
+            self._add_line(f"{self._dir_prefixes[depth]}{name}{self._dir_end}  {details}\n")
+        else:
+            self._add_line(f"{self._dir_prefixes[depth]}{name}{self._dir_end}\n")
+
+    def add_file(self, depth: int, name: str, details: str = "") -> None:
+        """
+        Adds a file line.
+
+        Args:
+            depth (int): Depth level (0 for the root).
+            name (str): File name.
+            details (str): Text shown after the name (not colored).
+        """
+        if depth >= len(self._file_prefixes):
+            self._add_prefixes(depth)
+        if details:
+            self._add_line(f"{self._file_prefixes[depth]}{name}{self._file_end}  {details}\n")
+        else:
+            self._add_line(f"{self._file_prefixes[depth]}{name}{self._file_end}\n")
+
+    def flush(self) -> None:
+        """
+        Writes collected lines to the stream at once.
+        """
+        if self._lines:
+            self.stream.write("".join(self._lines))
+            self._lines.clear()
+        self.stream.flush()
+        self._last_write = time.monotonic()
@@ -0,0 +1,56 @@
+"""
+Contact storage with case-insensitive username lookups.
+
+Contacts are kept in a dictionary of username -> phone, together with an index of
+casefolded username -> username as it was added. Both are updated together, so checking
+whether a username exists in any letter case takes a single dictionary lookup
+instead of a pass over all contacts.
+"""
+from typing import Iterator, Optional
+
+class ContactStore:
+    """
+    Contacts (username -> phone) with a case-insensitive username index.
+
+    Supports `len()`, `in` (exact username), iteration over usernames, `store[username]`
+    and `items()`, as the contacts dictionary does. Usernames are unique case-insensitively.
+    """
+
+    def __init__(self):
+        self.contacts: dict[str, str] = {}
+        # Casefolded username -> username as it was added
+        self._usernames: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.contacts)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self.contacts
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.contacts)
+
+    def __getitem__(self, username: str) -> str:
+        return self.contacts[username]
+
+    def items(self):
+        """Return (username, phone) pairs of all contacts, in the order they were added."""
+        return self.contacts.items()
+
+    def find_username(self, username: str) -> Optional[str]:
+        """Return the stored username matching the given one case-insensitively, or None."""
+        return self._usernames.get(username.casefold())
+
+    def add(self, username: str, phone: str) -> None:
+        """Add a new contact (the username must not exist in any letter case)."""
+        key = username.casefold()
+        if key in self._usernames:
+            raise KeyError(username)
+        self.contacts[username] = phone
+        self._usernames[key] = username
+
+    def update(self, username: str, phone: str) -> None:
+        """Update the phone number of an existing contact (exact username)."""
+        if username not in self.contacts:
+            raise KeyError(username)
+        self.contacts[username] = phone
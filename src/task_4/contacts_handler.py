@@ -9,27 +9,30 @@ Functions:
 - change_contact(args, contacts): Changes an existing contact's phone number.
 - show_phone(args, contacts): Shows the phone number of a contact.
 - show_all(_, contacts): Shows all saved contacts.
+
+Contacts are kept in a `ContactStore`, which keeps its case-insensitive username index up to date.
 """
+from contact_store import ContactStore
 
-def add_contact(args: list[str], contacts: dict[str, str]) -> str:
+def add_contact(args: list[str], contacts: ContactStore) -> str:
     """Add a new contact with username and phone number.
 
     args: [username, phone]
     """
     username, phone = args
-    contacts[username] = phone
+    contacts.add(username, phone)
     return "Contact added."
 
-def change_contact(args: list[str], contacts: dict[str, str]) -> str:
+def change_contact(args: list[str], contacts: ContactStore) -> str:
     """Update the phone number of an existing contact.
 
     args: [username, new_phone]
     """
     username, phone = args
-    contacts[username] = phone
+    contacts.update(username, phone)
     return "Contact updated."
 
-def show_phone(args: list[str], contacts: dict[str, str]) -> str:
+def show_phone(args: list[str], contacts: ContactStore) -> str:
     """Display the phone number(s) for the specified contact (case-insensitive, partial match allowed).
 
     args: [search_term]
@@ -53,7 +56,7 @@ def show_phone(args: list[str], contacts: dict[str, str]) -> str:
     return f"Found {len(matches)} match{'es' if len(matches) != 1 else ''}:\n" + "\n".join(output_lines)
 
 
-def show_all(_: list[str], contacts: dict[str, str]) -> str:
+def show_all(_: list[str], contacts: ContactStore) -> str:
     """Return all saved contacts with their phone numbers."""
     # Find length of the longest username for alignment
     max_len = max(len(username) for username in contacts)
@@ -7,6 +7,7 @@ Validators raise ValueError with descriptive messages if validation fails.
 import re
 
 from constants import PHONE_FORMAT_DESC_STR
+from contact_store import ContactStore
 
 def validate_are_two_arguments(args: list[str], _) -> None:
     """Ensure two non-empty arguments are provided: username and phone number."""
@@ -18,31 +19,27 @@ def validate_is_one_argument_username(args: list[str], _) -> None:
     if len(args) != 1 or len(args[0].strip()) == 0:
         raise ValueError("You must provide username as a single argument.")
 
-def validate_contact_not_in_contacts(args: list[str], contacts: dict) -> None:
+def validate_contact_not_in_contacts(args: list[str], contacts: ContactStore) -> None:
     """Ensure the contact with the given username does not already exist (case-insensitive)."""
     username = args[0]
 
-    # Check for exact match (avoid unnecessary iteration if an exact match is found early)
-    if username in contacts:
-        raise ValueError(f"Contact with username '{username}' already exists.")
+    # Single lookup in the case-insensitive index of the stored usernames
+    existing_username = contacts.find_username(username)
+    if existing_username is None:
+        return
 
-    # Check for case-insensitive match
-    for existing_username in contacts:
-        if existing_username.lower() == username.lower():
-            raise ValueError(
-                f"Contact with username '{username}' already exists, "
-                f"but under a different name: '{existing_username}'.")
+    if existing_username == username:
+        raise ValueError(f"Contact with username '{username}' already exists.")
+    raise ValueError(
+        f"Contact with username '{username}' already exists, "
+        f"but under a different name: '{existing_username}'.")
 
-def validate_contact_name_exists(args: list[str], contacts: dict) -> None:
+def validate_contact_name_exists(args: list[str], contacts: ContactStore) -> None:
     """Ensure a contact with the provided username exists, case-insensitively."""
     username = args[0]
 
-    # Check case-insensitive match by converting both stored and input names to lowercase
-    match = None
-    for contact in contacts:
-        if contact.lower() == username.lower():
-            match = contact
-            break
+    # Single lookup in the case-insensitive index of the stored usernames
+    match = contacts.find_username(username)
 
     if not match:
         raise ValueError(f"Contact '{username}' not found.")
@@ -53,14 +50,14 @@ def validate_contact_name_exists(args: list[str], contacts: dict) -> None:
                          f"but a contact exists under '{match}'. "
                          f"Did you mean '{match}'?")
 
-def validate_not_phone_duplicate(args: list[str], contacts: dict) -> None:
+def validate_not_phone_duplicate(args: list[str], contacts: ContactStore) -> None:
     """Ensure the new phone number is different from the existing one."""
     username = args[0]
     phone = args[1]
     if contacts[username] == phone:
         raise ValueError(f"Contact '{username}' has this phone number already.")
 
-def validate_contacts_not_empty(_, contacts: dict) -> None:
+def validate_contacts_not_empty(_, contacts: ContactStore) -> None:
     """Ensure there is at least one contact in the list."""
     if not contacts:
         raise ValueError("You don't have any contacts yet, "
@@ -24,6 +24,7 @@ from contacts_validator import (
     validate_not_phone_duplicate,
     validate_contacts_not_empty
 )
+from contact_store import ContactStore
 from contacts_handler import add_contact, change_contact, show_phone, show_all
 
 # Initialize colorama for Windows compatibility
@@ -45,7 +46,7 @@ def main():
     validation, and help generation for a contact book CLI assistant.
     """
 
-    contacts = {}
+    contacts = ContactStore()
 
     # Initial greeting and help menu
     print(Style.BRIGHT + f"\n{WELCOME_MESSAGE_TITLE}".upper())
@@ -123,7 +124,7 @@ def main_alternative():
     Main function to run the assistant bot. It handles user input, command dispatching,
     validation, and help generation for a contact book CLI assistant.
     """
-    contacts = {}
+    contacts = ContactStore()
 
     def show_help():
         """
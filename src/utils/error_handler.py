@@ -1,28 +1,95 @@
+from collections import Counter
+
 from utils.logging_handler import print_and_log
 
-def report_content_errors(errors: list[tuple[int, str, str]], log_file_path: str = "log"):
+CONTENT_ERRORS_MESSAGE = (
+    "There are potentially corrupted data in your dataset file "
+    "that may lead to wrong results and should be or may require fix:"
+)
+LINE_TEXT_WIDTH = 30  # line text is padded to this width in streamed log records
+
+class ContentErrorSink:
     """
-    Logs and prints potential file content issues.
+    Streaming collector of potential file content issues.
+
+    Can be used instead of a list of content errors: every error added with `append`/`extend`
+    is written to the log right away and then dropped. Only counters per cause and, optionally,
+    the first few examples per cause are kept, so memory use doesn't grow with the number of errors.
+    Call `report_summary` at the end to print and log a summary table.
 
     Args:
-        errors (list of tuples): Each tuple contains (line index, line text, cause).
         log_file_path (str): Path to the log file for reference.
+        samples_per_cause (int): Number of first examples to keep for every cause.
+        line_width (int): Width the line text is padded to in log records (longer lines aren't cut).
     """
-    if not errors:
-        return
-
-    max_line_length = max((len(line) for _, line, _ in errors), default=0)
-
-    message = (
-        "There are potentially corrupted data in your dataset file "
-        "that may lead to wrong results and should be or may require fix:"
-    )
-    print_and_log(message, level="WARNING")
-    print_and_log(f"Please check '{log_file_path}' file for more details.", level="INFO", log=False)
-
-    for line_idx, line_str, cause in errors:
-        log_message = (
-            f"Line {(str(line_idx) + ':').ljust(4)} "
-            f"{line_str.ljust(max_line_length)} - Cause: {cause if cause else 'Unknown'}"
-        )
+
+    def __init__(self, log_file_path: str = "log", samples_per_cause: int = 0, line_width: int = LINE_TEXT_WIDTH):
+        self.log_file_path = log_file_path
+        self.samples_per_cause = samples_per_cause
+        self.line_width = line_width
+        self.cause_counts = Counter()
+        self.samples: dict[str, list[tuple]] = {}
+
+    def __len__(self) -> int:
+        return sum(self.cause_counts.values())
+
+    def append(self, error: tuple) -> None:
+        """
+        Logs a content error and counts it.
+
+        Args:
+            error (tuple): (line index, line text, cause), optionally followed by the file the line comes from.
+        """
+        line_idx, line_str, cause, *source = error
+        cause = cause if cause else "Unknown"
+
+        if not self.cause_counts:
+            print_and_log(CONTENT_ERRORS_MESSAGE, level="WARNING")
+            print_and_log(f"Please check '{self.log_file_path}' file for more details.", level="INFO", log=False)
+
+        location = f"{source[0]}:{line_idx}" if source else line_idx
+        log_message = f"Line {(f'{location}:').ljust(4)} {line_str.ljust(self.line_width)} - Cause: {cause}"
         print_and_log(log_message, level="INFO", print_to_console=False)
+
+        self.cause_counts[cause] += 1
+        if self.cause_counts[cause] <= self.samples_per_cause:
+            self.samples.setdefault(cause, []).append(error)
+
+    def extend(self, errors) -> None:
+        """
+        Logs and counts many content errors.
+
+        Args:
+            errors (Iterable[tuple]): Content errors, see `append`.
+        """
+        for error in errors:
+            self.append(error)
+
+    def add_cause_counts(self, cause_counts: dict[str, int]) -> None:
+        """
+        Counts content errors known only by their number per cause (e.g. from a cache), without logging them.
+
+        Args:
+            cause_counts (dict[str, int]): Number of errors per cause.
+        """
+        for cause, count in cause_counts.items():
+            if not self.cause_counts:
+                print_and_log(CONTENT_ERRORS_MESSAGE, level="WARNING")
+                print_and_log(f"Please check '{self.log_file_path}' file for more details.", level="INFO", log=False)
+            self.cause_counts[cause if cause else "Unknown"] += count
+
+    def report_summary(self) -> None:
+        """
+        Prints and logs the number of content errors per cause, with kept examples, most frequent first.
+        """
+        if not self.cause_counts:
+            return
+
+        count_width = max(len("Count"), len(str(max(self.cause_counts.values()))))
+        print_and_log(f"Content issues summary ({len(self)} line{'s' if len(self) != 1 else ''}):", level="WARNING")
+        print_and_log(f"  {'Count'.rjust(count_width)} | Cause", level="INFO")
+        for cause, count in self.cause_counts.most_common():
+            print_and_log(f"  {str(count).rjust(count_width)} | {cause}", level="INFO")
+            for line_idx, line_str, _, *source in self.samples.get(cause, []):
+                location = f"{source[0]}:{line_idx}" if source else line_idx
+                print_and_log(f"  {' ' * count_width} |   e.g. line {location}: {line_str}", level="INFO")
@@ -15,4 +15,30 @@ def retrieve_line_data(line: str, separator: str = SEPARATOR) -> list[str]:
         >>> retrieve_line_data("1000,2000,3000")
         ['1000', '2000', '3000']
     """
-    return line.strip().split(separator)
\ No newline at end of file
+    return line.strip().split(separator)
+
+def find_shard_bounds(file, start: int, end: int, shards_count: int) -> list[tuple[int, int]]:
+    """
+    Splits a byte range of a file into ranges of roughly equal size, aligned to line boundaries.
+
+    Args:
+        file: File object opened in binary mode.
+        start (int): Byte offset of the range start (start of a line).
+        end (int): Byte offset of the range end (after a line end or end of file).
+        shards_count (int): Desired number of shards.
+
+    Returns:
+        list[tuple[int, int]]: Non-empty (start, end) byte ranges covering the whole range.
+    """
+    offsets = [start]
+    for shard_idx in range(1, shards_count):
+        position = max(start + (end - start) * shard_idx // shards_count, offsets[-1])
+        if position >= end:
+            break
+        # Move to the start of the next line
+        file.seek(position)
+        file.readline()
+        offsets.append(min(file.tell(), end))
+    offsets.append(end)
+
+    return [(shard_start, shard_end) for shard_start, shard_end in zip(offsets, offsets[1:]) if shard_start < shard_end]
@@ -1,3 +1,8 @@
+import math
+from collections import Counter
+from operator import mul
+from typing import Optional
+
 def calculate_total(salaries: list[int]) -> int:
     """
     Calculates the total of the provided salaries.
@@ -28,10 +33,343 @@ def calculate_average(salaries: list[int]) -> int:
         >>> calculate_average([1000, 2000, 3000])
         2000
     """
-    if not salaries:
+    return calculate_average_from_total(calculate_total(salaries), len(salaries))
+
+def calculate_average_from_total(total: int, count: int) -> int:
+    """
+    Calculates the average salary from an already known total and number of salaries.
+
+    Args:
+        total (int): The total sum of the salaries.
+        count (int): The number of salaries.
+
+    Returns:
+        int: The average salary, rounded to the nearest integer (0 if there are no salaries).
+
+    Example:
+        >>> calculate_average_from_total(6000, 3)
+        2000
+    """
+    if not count:
         return 0
-    
-    return int(round(calculate_total(salaries) / len(salaries), 0))
+
+    return int(round(total / count, 0))
+
+
+class QuantileSketch:
+    """
+    Bounded-size sketch for approximate quantiles of a stream of numbers.
+
+    Values are counted in logarithmically sized buckets (the DDSketch approach), so every
+    estimated quantile is within the given relative accuracy of the exact one. The number of
+    buckets only depends on the range of values, not on their count, and is capped by
+    `max_buckets` (the lowest buckets are collapsed when the cap is reached).
+    Sketches built over parts of a stream can be merged.
+
+    Incoming values are first counted per distinct value (up to `max_pending_values` of them),
+    so bucket keys are computed once per distinct value rather than once per value.
+
+    Example:
+        >>> sketch = QuantileSketch()
+        >>> sketch.add_batch([1000, 2000, 3000])
+        >>> round(sketch.quantile(0.5))
+        2000
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048, max_pending_values: int = 16384):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.max_pending_values = max_pending_values
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inverse_log_gamma = 1 / math.log(self.gamma)
+        self.positive_buckets: dict[int, int] = {}
+        self.negative_buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self._pending_values = Counter()
+
+    def _bucket_key(self, value: float) -> int:
+        """Returns the bucket key for a positive value."""
+        return math.ceil(math.log(value) * self._inverse_log_gamma)
+
+    def _bucket_value(self, key: int) -> float:
+        """Returns the representative value of a bucket."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """
+        Adds a value to the sketch.
+
+        Args:
+            value (float): The value to add.
+            weight (int): How many times the value occurred.
+        """
+        self._pending_values[value] += weight
+        self.count += weight
+        if len(self._pending_values) > self.max_pending_values:
+            self._flush()
+
+    def add_batch(self, values: list[float]) -> None:
+        """
+        Adds many values to the sketch.
+
+        Args:
+            values (list[float]): The values to add.
+        """
+        self._pending_values.update(values)
+        self.count += len(values)
+        if len(self._pending_values) > self.max_pending_values:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Moves pending values into the buckets."""
+        for value, weight in self._pending_values.items():
+            if value > 0:
+                buckets = self.positive_buckets
+                key = self._bucket_key(value)
+            elif value < 0:
+                buckets = self.negative_buckets
+                key = self._bucket_key(-value)
+            else:
+                self.zero_count += weight
+                continue
+            buckets[key] = buckets.get(key, 0) + weight
+        self._pending_values.clear()
+
+        for buckets in (self.positive_buckets, self.negative_buckets):
+            if len(buckets) > self.max_buckets:
+                self._collapse(buckets)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Merges another sketch (with the same relative accuracy) into this one.
+
+        Args:
+            other (QuantileSketch): The sketch to merge.
+        """
+        self._flush()
+        other._flush()
+        for buckets, other_buckets in (
+                (self.positive_buckets, other.positive_buckets),
+                (self.negative_buckets, other.negative_buckets)
+            ):
+            for key, weight in other_buckets.items():
+                buckets[key] = buckets.get(key, 0) + weight
+            if len(buckets) > self.max_buckets:
+                self._collapse(buckets)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _collapse(self, buckets: dict[int, int]) -> None:
+        """Merges the lowest buckets together until the buckets count fits the limit."""
+        keys = sorted(buckets)
+        excess_keys = keys[:len(keys) - self.max_buckets + 1]
+        buckets[excess_keys[-1]] += sum(buckets.pop(key) for key in excess_keys[:-1])
+
+    def to_dict(self) -> dict:
+        """
+        Converts the sketch into a JSON-serializable dictionary.
+
+        Returns:
+            dict: Sketch parameters and bucket counts.
+        """
+        self._flush()
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "positive_buckets": {str(key): weight for key, weight in self.positive_buckets.items()},
+            "negative_buckets": {str(key): weight for key, weight in self.negative_buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        """
+        Restores a sketch from a dictionary created by `to_dict`.
+
+        Args:
+            data (dict): Sketch parameters and bucket counts.
+
+        Returns:
+            QuantileSketch: The restored sketch.
+        """
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch.positive_buckets = {int(key): weight for key, weight in data["positive_buckets"].items()}
+        sketch.negative_buckets = {int(key): weight for key, weight in data["negative_buckets"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        return sketch
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates the value at the given quantile.
+
+        Args:
+            q (float): Quantile, from 0 to 1 (e.g., 0.5 for median).
+
+        Returns:
+            Optional[float]: The estimated value, or None if the sketch is empty.
+        """
+        if not self.count:
+            return None
+
+        self._flush()
+        # Nearest-rank method: index of the value in the sorted stream
+        rank = max(math.ceil(q * self.count) - 1, 0)
+        seen = 0
+        # Negative values, from the lowest (the biggest absolute value) up
+        for key in sorted(self.negative_buckets, reverse=True):
+            seen += self.negative_buckets[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive_buckets):
+            seen += self.positive_buckets[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self.positive_buckets))
+
+class StreamingStatistics:
+    """
+    One-pass accumulator of count, sum, min, max, mean, variance and approximate quantiles.
+
+    Memory use does not depend on the number of values: only running sums, extremes and a
+    bounded-size `QuantileSketch` are kept. For integer values the sum and the sum of squares
+    are exact, so mean and variance don't accumulate floating point errors.
+    Accumulators built over parts of a stream can be merged.
+
+    Example:
+        >>> stats = StreamingStatistics()
+        >>> stats.add_batch([1000, 2000, 3000])
+        >>> stats.total, stats.minimum, stats.maximum, stats.mean
+        (6000, 1000, 3000, 2000.0)
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.count = 0
+        self.total = 0
+        self.sum_of_squares = 0
+        self.minimum = None
+        self.maximum = None
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value: int) -> None:
+        """
+        Adds a single value.
+
+        Args:
+            value (int): The value to add.
+        """
+        self.count += 1
+        self.total += value
+        self.sum_of_squares += value * value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        self.sketch.add(value)
+
+    def add_batch(self, values: list[int]) -> None:
+        """
+        Adds many values at once (faster than adding them one by one).
+
+        Args:
+            values (list[int]): The values to add.
+        """
+        if not values:
+            return
+        self.count += len(values)
+        self.total += sum(values)
+        self.sum_of_squares += sum(map(mul, values, values))
+        batch_min, batch_max = min(values), max(values)
+        if self.minimum is None or batch_min < self.minimum:
+            self.minimum = batch_min
+        if self.maximum is None or batch_max > self.maximum:
+            self.maximum = batch_max
+        self.sketch.add_batch(values)
+
+    def merge(self, other: "StreamingStatistics") -> None:
+        """
+        Merges another accumulator into this one.
+
+        Args:
+            other (StreamingStatistics): The accumulator to merge.
+        """
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.sum_of_squares += other.sum_of_squares
+        if self.minimum is None or other.minimum < self.minimum:
+            self.minimum = other.minimum
+        if self.maximum is None or other.maximum > self.maximum:
+            self.maximum = other.maximum
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self) -> dict:
+        """
+        Converts the accumulator into a JSON-serializable dictionary.
+
+        Returns:
+            dict: Running sums, extremes and the quantile sketch.
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "sum_of_squares": self.sum_of_squares,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StreamingStatistics":
+        """
+        Restores an accumulator from a dictionary created by `to_dict`.
+
+        Args:
+            data (dict): Running sums, extremes and the quantile sketch.
+
+        Returns:
+            StreamingStatistics: The restored accumulator.
+        """
+        stats = cls()
+        stats.count = data["count"]
+        stats.total = data["total"]
+        stats.sum_of_squares = data["sum_of_squares"]
+        stats.minimum = data["minimum"]
+        stats.maximum = data["maximum"]
+        stats.sketch = QuantileSketch.from_dict(data["sketch"])
+        return stats
+
+    @property
+    def mean(self) -> float:
+        """Arithmetic mean of the values (0 if there are no values)."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the values (0 if there are no values)."""
+        if not self.count:
+            return 0.0
+        return (self.count * self.sum_of_squares - self.total * self.total) / (self.count * self.count)
+
+    @property
+    def standard_deviation(self) -> float:
+        """Population standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at the given quantile (0 to 1), or None if there are no values."""
+        return self.sketch.quantile(q)
+
+    @property
+    def median(self) -> Optional[float]:
+        """Approximate median of the values."""
+        return self.quantile(0.5)
 
 
 # Test for calculate_total
@@ -41,4 +379,26 @@ assert calculate_total([]) == 0, "Test Failed (calculate_total): Empty List"
 # Test for calculate_average
 assert calculate_average([1000, 2000, 3000]) == 2000, "Test Failed (calculate_average): Basic Test"
 assert calculate_average([]) == 0, "Test Failed (calculate_average): Empty List"
-assert calculate_average([2000]) == 2000, "Test Failed (calculate_average): Single Element"
\ No newline at end of file
+assert calculate_average([2000]) == 2000, "Test Failed (calculate_average): Single Element"
+
+# Test for calculate_average_from_total
+assert calculate_average_from_total(6000, 3) == 2000, "Test Failed (calculate_average_from_total): Basic Test"
+assert calculate_average_from_total(0, 0) == 0, "Test Failed (calculate_average_from_total): No Salaries"
+
+# Test for StreamingStatistics
+_stats = StreamingStatistics()
+_stats.add_batch([1000, 2000])
+_stats.add(3000)
+assert (_stats.count, _stats.total, _stats.minimum, _stats.maximum) == (3, 6000, 1000, 3000), \
+    "Test Failed (StreamingStatistics): Basic Test"
+assert _stats.mean == 2000 and round(_stats.variance) == 666667, "Test Failed (StreamingStatistics): Mean and Variance"
+assert abs(_stats.median - 2000) <= 2000 * 0.01, "Test Failed (StreamingStatistics): Median"
+assert StreamingStatistics().median is None, "Test Failed (StreamingStatistics): Empty"
+assert StreamingStatistics.from_dict(_stats.to_dict()).to_dict() == _stats.to_dict(), \
+    "Test Failed (StreamingStatistics): Serialization"
+
+# Test for QuantileSketch
+_sketch = QuantileSketch()
+_sketch.add_batch(range(-100, 1001))
+assert abs(_sketch.quantile(0.99) - 989) <= 989 * 0.01, "Test Failed (QuantileSketch): p99"
+assert abs(_sketch.quantile(0) + 100) <= 100 * 0.01, "Test Failed (QuantileSketch): Negative Values"